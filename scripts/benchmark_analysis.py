@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark sequential vs. parallel AST analysis on a synthetic project.
+
+Usage: python scripts/benchmark_analysis.py [--files 5000] [--workers N]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from iterative.service.project_management.service import analysis_utils
+
+MODULE_TEMPLATE = '''
+from typing import List, Optional
+from pydantic import BaseModel
+from fastapi import APIRouter
+
+router = APIRouter()
+
+
+class Item{i}(BaseModel):
+    id: str
+    name: Optional[str] = None
+    tags: List[str] = []
+
+
+def get_item_{i}(item_id: str, verbose: bool = False) -> Item{i}:
+    """Fetch item {i}."""
+    return Item{i}(id=item_id)
+
+
+def list_items_{i}(page: int = 1, page_size: int = 10) -> List[Item{i}]:
+    """List items."""
+    items = [Item{i}(id=str(n)) for n in range(page_size)]
+    return [item for item in items if item.name is None]
+'''
+
+
+def create_project(root, files):
+    paths = []
+    for i in range(files):
+        folder = os.path.join(root, "service", f"service_{i // 100}")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"module_{i}.py")
+        with open(path, "w") as f:
+            # Pad with functions so each file is a realistic size
+            f.write(MODULE_TEMPLATE.format(i=i) * 4)
+        paths.append(path)
+    return paths
+
+
+def run(paths, workers):
+    analysis_utils._summaries.clear()
+    start = time.perf_counter()
+    summaries = analysis_utils.analyze_files(paths, workers=workers)
+    return time.perf_counter() - start, summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        paths = create_project(root, args.files)
+        sequential_seconds, sequential = run(paths, workers=1)
+        parallel_seconds, parallel = run(paths, workers=args.workers)
+        assert sequential == parallel, "parallel analysis returned different summaries"
+
+    print(f"{args.files} files")
+    print(f"sequential:          {sequential_seconds:.3f}s")
+    print(f"parallel ({args.workers} workers): {parallel_seconds:.3f}s")
+    print(f"speedup:             {sequential_seconds / parallel_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
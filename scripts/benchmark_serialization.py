@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark the dispatch serializer against the previous CustomEncoder on lists of models.
+
+Usage: python scripts/benchmark_serialization.py [--models 10000] [--repeat 5]
+"""
+import argparse
+import json
+import time
+import warnings
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from iterative.service.service_management.service import serializer
+from iterative.service.service_management.service.json_encoder import CustomEncoder
+
+
+class Status(Enum):
+    ACTIVE = "active"
+    ARCHIVED = "archived"
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+    country: Optional[str] = None
+
+
+class Order(BaseModel):
+    id: int
+    status: Status
+    created_at: datetime
+    due: date
+    tags: List[str] = []
+    address: Address
+    note: Optional[str] = None
+
+
+class LegacyEncoder(json.JSONEncoder):
+    """The isinstance chain CustomEncoder used before the dispatch table."""
+
+    def default(self, obj):
+        if isinstance(obj, Enum):
+            return obj.value
+        elif isinstance(obj, BaseModel):
+            return obj.dict(by_alias=True, exclude_none=True)
+        elif isinstance(obj, datetime):
+            return obj.replace(tzinfo=timezone.utc).isoformat() if obj.tzinfo is None else obj.isoformat()
+        elif isinstance(obj, date):
+            return obj.isoformat()
+        elif isinstance(obj, (list, set)):
+            return [self.default(item) for item in obj]
+        elif isinstance(obj, dict):
+            return {k: self.default(v) for k, v in obj.items()}
+        return json.JSONEncoder.default(self, obj)
+
+
+def create_models(count):
+    return [
+        Order(
+            id=i,
+            status=Status.ACTIVE if i % 2 else Status.ARCHIVED,
+            created_at=datetime(2024, 1, 1, 12, i % 60, tzinfo=timezone.utc),
+            due=date(2024, 2, 1 + i % 28),
+            tags=["a", "b"],
+            address=Address(street=f"{i} Main St", city="Springfield"),
+        )
+        for i in range(count)
+    ]
+
+
+def best_of(repeat, function):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    # The legacy encoder calls `.dict()`, deprecated on Pydantic 2
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    models = create_models(args.models)
+    cases = {
+        "legacy encoder": lambda: json.dumps(models, cls=LegacyEncoder).encode(),
+        "CustomEncoder": lambda: json.dumps(models, cls=CustomEncoder).encode(),
+        f"dumps ({serializer.get_backend_name()})": lambda: serializer.dumps(models),
+        "iter_json (streamed)": lambda: b"".join(serializer.iter_json(models)),
+    }
+
+    baseline = None
+    print(f"{args.models} models, best of {args.repeat}")
+    for name, function in cases.items():
+        seconds, body = best_of(args.repeat, function)
+        baseline = baseline or seconds
+        print(f"{name:<24} {seconds * 1000:8.1f}ms  {baseline / seconds:5.2f}x  {len(body) / 1e6:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,158 @@
-import subprocess
+import importlib
 import sys
-
-from iterative.service.project_management.service.project_utils import get_project_root
-from iterative.web import iterative_user_web_app as web_app
-from iterative.cli import iterative_cli_app as cli_app
-from iterative.cli_app_integration import integrate_actions_into_cli_app
-from iterative.web_app_integration import add_routers_to_web_app, integrate_actions_into_web_app
-from iterative.server_management import run_web_server, run_ngrok_subprocess
-from iterative.config import Config, set_config, get_config
-
-from iterative.service.model_management.models.iterative import IterativeModel, IterativeAppConfig
-from iterative.service.action_management.service.action_utils import get_all_actions, get_configured_actions
-from iterative.service.api_management.service import api_utils
+import time
 
 from logging import getLogger
 import logging
 
 logger = getLogger(__name__)
 
-def prep_app():
+LOGGING_LEVELS = {
+    'CRITICAL': logging.CRITICAL,
+    'ERROR': logging.ERROR,
+    'WARNING': logging.WARNING,
+    'INFO': logging.INFO,
+    'DEBUG': logging.DEBUG,
+}
+
+# Public names resolved on first access, so `import iterative` doesn't pull in FastAPI, Typer or the service tree
+_LAZY_ATTRIBUTES = {
+    "web_app": ("iterative.web", "iterative_user_web_app"),
+    "cli_app": ("iterative.cli", "iterative_cli_app"),
+    "integrate_actions_into_cli_app": ("iterative.cli_app_integration", "integrate_actions_into_cli_app"),
+    "add_routers_to_web_app": ("iterative.web_app_integration", "add_routers_to_web_app"),
+    "integrate_actions_into_web_app": ("iterative.web_app_integration", "integrate_actions_into_web_app"),
+    "run_web_server": ("iterative.server_management", "run_web_server"),
+    "run_ngrok_subprocess": ("iterative.server_management", "run_ngrok_subprocess"),
+    "Config": ("iterative.config", "Config"),
+    "set_config": ("iterative.config", "set_config"),
+    "get_config": ("iterative.config", "get_config"),
+    "IterativeModel": ("iterative.service.model_management.models.iterative", "IterativeModel"),
+    "IterativeAppConfig": ("iterative.service.model_management.models.iterative", "IterativeAppConfig"),
+    "get_project_root": ("iterative.service.project_management.service.project_utils", "get_project_root"),
+    "get_all_actions": ("iterative.service.action_management.service.action_utils", "get_all_actions"),
+    "get_cli_actions": ("iterative.service.action_management.service.action_utils", "get_cli_actions"),
+    "get_configured_actions": ("iterative.service.action_management.service.action_utils", "get_configured_actions"),
+    "api_utils": ("iterative.service.api_management.service.api_utils", None),
+    "cached_action": ("iterative.service.action_management.service.cache_utils", "cached_action"),
+    "coalesce_calls": ("iterative.service.action_management.service.coalesce_utils", "coalesce_calls"),
+    "invalidate_action_cache": ("iterative.service.action_management.service.cache_utils", "invalidate_action_cache"),
+    "run_in_process": ("iterative.service.action_management.service.invoke_utils", "run_in_process"),
+    "save_discovery_index": ("iterative.service.project_management.service.index_utils", "save_discovery_index"),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    module = importlib.import_module(module_name)
+    value = module if attribute is None else getattr(module, attribute)
+    # Cache it so the next access is a plain module attribute lookup
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+def _prep_config():
+    from iterative.config import Config, set_config, get_config
+
     config = Config()
     set_config(config)
 
-    LOGGING_LEVELS = {
-        'CRITICAL': logging.CRITICAL,
-        'ERROR': logging.ERROR,
-        'WARNING': logging.WARNING,
-        'INFO': logging.INFO,
-        'DEBUG': logging.DEBUG,
-    }
-
     logging_level = get_config().get("logging_level", "INFO")
     logging_level = LOGGING_LEVELS.get(logging_level.upper(), logging.INFO)
     logging.basicConfig(level=logging_level)
 
-    web_actions, cli_actions = get_configured_actions()
-    integrate_actions_into_web_app(web_actions.values(), web_app)
-    integrate_actions_into_cli_app(cli_actions.values(), cli_app)
 
-    logger.info(f"Adding routers to web app")
-    add_routers_to_web_app(web_app)
+_app_prepared = False
 
 
+def prep_app():
+    """
+    Discover the actions and routers and add them to the web app and the CLI. Only the first call does anything.
+    """
+    global _app_prepared
+    if _app_prepared:
+        return
+    _app_prepared = True
+
+    from iterative.service.telemetry_management.service.profile_utils import startup_phase
+    from iterative.service.telemetry_management.service.trace_utils import add_span, trace_span
+
+    started = time.time_ns()
+    with startup_phase("import web and cli apps"):
+        from iterative.web import iterative_user_web_app as web_app
+        from iterative.cli import iterative_cli_app as cli_app
+        from iterative.cli_app_integration import integrate_actions_into_cli_app
+        from iterative.web_app_integration import add_routers_to_web_app, integrate_actions_into_web_app
+        from iterative.service.action_management.service.action_utils import get_configured_actions
+        from iterative.service.project_management.service.index_utils import save_discovery_index
+    imported = time.time_ns()
+
+    with startup_phase("config"):
+        _prep_config()
+
+    # Whether to trace is only known once the config is loaded, the phases before are added to the trace afterwards
+    with trace_span("prep_app", root=True, start_ns=started):
+        add_span("import web and cli apps", started, imported)
+        add_span("config", imported, time.time_ns())
+
+        with startup_phase("get_configured_actions"):
+            web_actions, cli_actions = get_configured_actions()
+        with startup_phase("integrate_actions_into_web_app"):
+            integrate_actions_into_web_app(web_actions.values(), web_app)
+        with startup_phase("integrate_actions_into_cli_app"):
+            integrate_actions_into_cli_app(cli_actions.values(), cli_app)
+
+        logger.info(f"Adding routers to web app")
+        with startup_phase("add_routers_to_web_app"):
+            add_routers_to_web_app(web_app)
+
+        with startup_phase("save_discovery_index"):
+            save_discovery_index()
+
+        with startup_phase("start_config_watcher"):
+            from iterative.config_watcher import start_config_watcher
+            start_config_watcher(web_app)
+
+        with startup_phase("start_hot_reload"):
+            from iterative.hot_reload import start_hot_reload
+            start_hot_reload(web_app, cli_app)
+
+
+def prep_cli_app():
+    """
+    Prepare only the CLI. Commands are registered from statically extracted action signatures,
+    so user modules are imported when their command runs rather than up front.
+    """
+    from iterative.cli import iterative_cli_app as cli_app
+    from iterative.cli_app_integration import integrate_actions_into_cli_app
+    from iterative.service.action_management.service.action_utils import get_cli_actions
+    from iterative.service.project_management.service.index_utils import save_discovery_index
+
+    _prep_config()
+
+    integrate_actions_into_cli_app(get_cli_actions().values(), cli_app)
+
+    save_discovery_index()
+
 
 def start_app():
-    prep_app()
+    from iterative.cli import iterative_cli_app as cli_app
+
+    prep_cli_app()
     cli_app()
 
 
 def main():
-    prep_app()
+    import subprocess
+    from iterative.cli import iterative_cli_app as cli_app
+
+    prep_cli_app()
     if len(sys.argv) == 1:
         # No arguments provided, show help by running the script with '--help'
         subprocess.run(['iterative', '--help'])
@@ -63,6 +166,7 @@ __all__ = [
     "web_app",
     "cli_app",
     "prep_app",
+    "prep_cli_app",
     "start_util_server",
     "start_app",
     "run_web_server",
@@ -81,4 +185,4 @@ __all__ = [
 ]
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
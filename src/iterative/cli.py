@@ -3,6 +3,7 @@ import subprocess
 from iterative.server_management import run_web_server
 import typer
 from iterative.service.doc_management.service import doc_utils
+from iterative.service.project_management.service.index_utils import get_discovery_index
 from iterative.service.project_management.service.project_utils import get_project_root
 
 iterative_cli_app = typer.Typer(
@@ -12,9 +13,19 @@ iterative_cli_app = typer.Typer(
     add_help_option=True,
 )
 
+index_cli_app = typer.Typer(
+    name="index",
+    help="Manage the persistent discovery index stored in .iterative/cache.",
+    add_help_option=True,
+)
+iterative_cli_app.add_typer(index_cli_app, name="index")
+
 @iterative_cli_app.command()
-def start_server():
-    run_web_server()
+def start_server(
+    workers: int = typer.Option(None, help="Worker processes, 0 for one per core. Defaults to server_workers"),
+    reload: bool = typer.Option(None, "--reload/--no-reload", help="Hot reload changed modules, for development. Defaults to reload"),
+):
+    run_web_server(workers, reload)
 
 
 @iterative_cli_app.command()
@@ -54,4 +65,79 @@ def serve_docs(port: str = typer.Option("4500", help="The port to serve the docs
         raise typer.Exit(code=1)
 
     # Run the mkdocs serve command with the project's configuration
-    subprocess.run(["mkdocs", "serve", "-f", mkdocs_config_path, "--dev-addr", f"0.0.0.0:{port}"])
\ No newline at end of file
+    subprocess.run(["mkdocs", "serve", "-f", mkdocs_config_path, "--dev-addr", f"0.0.0.0:{port}"])
+
+
+@iterative_cli_app.command("profile-startup")
+def profile_startup(
+    trace: str = typer.Option("none", help="Also write a trace to logs_path: 'json', 'speedscope' or 'none'"),
+    budget: float = typer.Option(None, help="Exit with code 1 if startup takes longer than this many seconds"),
+    limit: int = typer.Option(20, help="Number of imports to list"),
+):
+    """
+    Profile a cold start of the app in a fresh interpreter and print the time spent in each phase and import.
+    """
+    from iterative.config import get_config
+    from iterative.service.project_management.service.project_utils import resolve_project_folder_path
+    from iterative.service.telemetry_management.service import profile_utils
+
+    try:
+        profile = profile_utils.profile_startup_in_subprocess(cwd=os.getcwd())
+    except RuntimeError as e:
+        typer.echo(f"Error: {e}")
+        raise typer.Exit(code=1)
+
+    typer.echo(profile.format_table(limit))
+    if trace != "none":
+        logs_path = resolve_project_folder_path(get_config().get("logs_path"))
+        typer.echo(f"Wrote trace to {profile_utils.write_profile(profile, logs_path, trace)}")
+
+    if budget is not None and profile.exceeds(budget):
+        typer.echo(f"Startup took {profile.wall:.3f}s, over the budget of {budget:.3f}s")
+        raise typer.Exit(code=1)
+
+
+def _get_discovery_index_or_exit():
+    index = get_discovery_index()
+    if index is None:
+        typer.echo("Error: No iterative project found or the discovery index is disabled.")
+        raise typer.Exit(code=1)
+    return index
+
+
+@index_cli_app.command("rebuild")
+def rebuild_index():
+    """
+    Drop the discovery index and rebuild it by running a full discovery of actions, routers and models.
+    """
+    from iterative.service.action_management.service.action_registry import get_action_registry
+    from iterative.service.action_management.service.action_utils import get_all_actions
+    from iterative.service.api_management.service.api_utils import find_api_routers_in_parent_project
+    from iterative.service.project_management.service.project_utils import find_pydantic_models_in_models_folders
+
+    index = _get_discovery_index_or_exit()
+    index.clear()
+
+    # Discover the actions again rather than reading them from the registry
+    get_action_registry().invalidate()
+    get_all_actions()
+    find_api_routers_in_parent_project()
+    find_pydantic_models_in_models_folders(index.project_root)
+
+    index.save()
+    typer.echo(f"Rebuilt discovery index at {index.path}")
+    typer.echo(index.format_report())
+
+
+@index_cli_app.command("status")
+def index_status():
+    """
+    Show how many files the discovery index holds, how many are stale and the hit/miss report of this run.
+    """
+    index = _get_discovery_index_or_exit()
+    typer.echo(f"Discovery index: {index.path}")
+    if os.path.exists(index.path):
+        typer.echo(f"Size on disk: {os.path.getsize(index.path)} bytes")
+    for kind, counts in index.status().items():
+        typer.echo(f"  {kind}: {counts['entries']} files, {counts['fresh']} fresh, {counts['stale']} stale")
+    typer.echo(index.format_report())
@@ -1,5 +1,7 @@
 from typing import List
 from iterative.service.action_management.models.action import Action
+from iterative.service.action_management.service.cache_utils import create_cached_function, get_cache_policy
+from iterative.service.action_management.service.stream_utils import create_streaming_command, is_streaming_action
 from iterative.service.project_management.service.project_utils import snake_case
 from typer import Typer
 
@@ -8,4 +10,18 @@ def integrate_actions_into_cli_app(actions: List[Action], cli_app: Typer):
         name = action.get_name()
         function = action.get_function()
         snake_name = snake_case(name)
-        cli_app.command(name=snake_name)(function)
\ No newline at end of file
+        if is_streaming_action(function):
+            function = create_streaming_command(function)
+        elif get_cache_policy(function) is not None:
+            function = create_cached_function(snake_name, function)
+        cli_app.command(name=snake_name)(function)
+
+def replace_actions_in_cli_app(actions: List[Action], names, cli_app: Typer):
+    """
+    Replace the commands of the named actions with commands for their current functions. Typer builds the
+    click app on every call, so the next invocation sees them.
+    """
+    names = set(names)
+    replaced_names = {snake_case(name) for name in names}
+    cli_app.registered_commands = [command for command in cli_app.registered_commands if command.name not in replaced_names]
+    integrate_actions_into_cli_app([action for action in actions if action.get_name() in names], cli_app)
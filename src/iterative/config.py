@@ -1,5 +1,10 @@
 import os
+import threading
+from contextlib import contextmanager
+from types import MappingProxyType
 from iterative.service.model_management.models.iterative import IterativeAppConfig
+from iterative.service.project_management.service.root_utils import CONFIG_FILE, get_project_root_resolver
+from iterative.service.telemetry_management.service.profile_utils import startup_phase
 from omegaconf import OmegaConf
 from pydantic import ValidationError
 from logging import getLogger
@@ -7,44 +12,196 @@ from logging import getLogger
 logger = getLogger(__name__)
 
 
+# `model_fields` on Pydantic 2, `__fields__` on Pydantic 1
+CONFIG_FIELDS = tuple(getattr(IterativeAppConfig, "model_fields", None) or IterativeAppConfig.__fields__)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, (dict, MappingProxyType)):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _deep_merge(base: dict, other: dict) -> dict:
+    merged = dict(base)
+    for key, value in other.items():
+        if isinstance(merged.get(key), dict) and isinstance(value, dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class ConfigSnapshot:
+    """
+    A frozen, validated copy of the configuration with one slot per IterativeAppConfig field.
+
+    Lists are exposed as tuples and dicts as read only mappings. A snapshot never changes, updates
+    publish a new one through `Config.transaction()`.
+    """
+
+    # Config fields can't start with an underscore, so the private slots never collide with them
+    __slots__ = CONFIG_FIELDS + ("_values", "_version")
+
+    def __init__(self, values: dict, version: int = 0):
+        frozen = {key: _freeze(values[key]) for key in CONFIG_FIELDS}
+        for key, value in frozen.items():
+            object.__setattr__(self, key, value)
+        object.__setattr__(self, "_values", MappingProxyType(frozen))
+        object.__setattr__(self, "_version", version)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("ConfigSnapshot is immutable, update the config with Config.transaction()")
+
+    def __delattr__(self, key):
+        raise AttributeError("ConfigSnapshot is immutable, update the config with Config.transaction()")
+
+    def __contains__(self, key) -> bool:
+        return key in self._values
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def to_dict(self) -> dict:
+        """
+        Returns a mutable deep copy of the values.
+        """
+        return _thaw(self._values)
+
+
+class ConfigTransaction:
+    """
+    Changes staged against a snapshot. They are validated together and published at once when the
+    `Config.transaction()` block exits without an error.
+    """
+
+    def __init__(self, snapshot: ConfigSnapshot):
+        self.snapshot = snapshot
+        self.changes = {}
+
+    def get(self, key, default=None):
+        if key in self.changes:
+            return self.changes[key]
+        return self.snapshot.get(key, default)
+
+    def set(self, key, value):
+        if key not in self.snapshot:
+            raise KeyError(f"Config key {key} does not exist")
+        self.changes[key] = value
+
+    def update(self, values: dict):
+        for key, value in values.items():
+            self.set(key, value)
+
+    def build(self) -> ConfigSnapshot:
+        validated_config = IterativeAppConfig(**{**self.snapshot.to_dict(), **self.changes})
+        return ConfigSnapshot(validated_config.dict(), self.snapshot._version + 1)
+
+
 class Config:
     def __init__(self,  merge_config=True):
         self.user_config_path = self.find_iterative_config()
         self.default_config = OmegaConf.create(IterativeAppConfig().dict())
 
+        try:
+            self.file_values = self.read_file_values()
+        except ValidationError as e:
+            logger.error(f"Validation error in the user configuration: {e}")
+            raise
+        self._snapshot = ConfigSnapshot(self.file_values)
+        # Serializes writers, readers never take it
+        self._transaction_lock = threading.RLock()
+
+    def read_file_values(self) -> dict:
+        """
+        Read the user configuration file merged over the defaults and validate it.
+
+        Returns:
+            dict: The validated values.
+
+        Raises:
+            ValidationError: If the merged configuration is invalid.
+        """
         # Load and validate the user configuration if provided
         if self.user_config_path and os.path.exists(self.user_config_path):
             user_config = OmegaConf.merge(self.default_config,  OmegaConf.load(self.user_config_path))
-
-
         else:
             user_config = OmegaConf.merge(self.default_config)
 
-        try:
-            self.config = OmegaConf.create(IterativeAppConfig(**OmegaConf.to_object(user_config)).dict())
-        except ValidationError as e:
-            logger.error(f"Validation error in the user configuration: {e}")
-            raise
+        return IterativeAppConfig(**OmegaConf.to_object(user_config)).dict()
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """
+        The current configuration. Read values as attributes, e.g. `get_config().snapshot.fastapi_port`.
+        """
+        return self._snapshot
+
+    @property
+    def config(self) -> ConfigSnapshot:
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """
+        Incremented every time a transaction publishes a new snapshot.
+        """
+        return self._snapshot._version
 
-        
     def find_iterative_config(self):
-        current_dir = os.getcwd()
-        while True:
-            possible_config_path = os.path.join(current_dir, ".iterative", 'config.yaml')
-            if os.path.exists(possible_config_path):
-                logger.info(f"Found iterative project")
-                return possible_config_path
-            new_dir = os.path.dirname(current_dir)
-            if new_dir == current_dir:
-                # Root directory reached without finding the config file
-                return None
-            current_dir = new_dir
+        project_dir = get_project_root_resolver().nearest(os.getcwd(), marker=CONFIG_FILE, include_root=True)
+        if project_dir is None:
+            # Root directory reached without finding the config file
+            return None
+        logger.info(f"Found iterative project")
+        return os.path.join(project_dir, CONFIG_FILE)
 
     def get(self, key, default=None):
         if not key:
             return default
-        value = self.config.get(key, default)
-        return value
+        return self._snapshot._values.get(key, default)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Stage configuration changes and publish them atomically.
+
+        The changes are validated once when the block exits, then the new snapshot replaces the current one
+        in a single assignment. Readers see either the old or the new configuration, never a mix. If the
+        block raises or validation fails, nothing is applied.
+
+        Example:
+            with get_config().transaction() as transaction:
+                transaction.set("fastapi_port", 8080)
+                transaction.set("fastapi_host", "127.0.0.1")
+        """
+        with self._transaction_lock:
+            transaction = ConfigTransaction(self._snapshot)
+            yield transaction
+            if not transaction.changes:
+                return
+            try:
+                snapshot = transaction.build()
+            except ValidationError as e:
+                logger.error(f"Validation error after updating the configuration: {e}")
+                raise
+            self._snapshot = snapshot
 
     def merge_config(self, other_config):
         """
@@ -55,9 +212,10 @@ class Config:
         """
         if not isinstance(other_config, Config):
             raise ValueError("other_config must be an instance of Config")
-        self.config = OmegaConf.merge(self.config, other_config.config)
+        with self.transaction() as transaction:
+            transaction.update(_deep_merge(self._snapshot.to_dict(), other_config.snapshot.to_dict()))
         return self
-    
+
     def set(self, key, value):
         """
         Set a configuration value.
@@ -66,25 +224,13 @@ class Config:
             key (str): The configuration key to set.
             value: The value to set for the key.
         """
-        if key not in self.config:
-            raise KeyError(f"Config key {key} does not exist")
-
-        # Update the configuration
-        OmegaConf.update(self.config, key, value, merge=False)
-
-        # If there are any additional actions needed after updating the config,
-        # such as revalidating the configuration or updating external systems,
-        # include them here.
-        try:
-            validated_config = IterativeAppConfig(**OmegaConf.to_object(self.config))
-            self.config = OmegaConf.create(validated_config.dict())
-        except ValidationError as e:
-            logger.error(f"Validation error after updating the configuration: {e}")
-            raise
+        with self.transaction() as transaction:
+            transaction.set(key, value)
 
 
-# Global shared configuration instance
-_shared_config = Config()
+# Global shared configuration instance, created on the first get_config()
+_shared_config = None
+_shared_config_lock = threading.Lock()
 
 def set_config(config):
     global _shared_config
@@ -92,4 +238,9 @@ def set_config(config):
 
 def get_config():
     global _shared_config
+    if _shared_config is None:
+        with _shared_config_lock:
+            if _shared_config is None:
+                with startup_phase("config at first get_config()"):
+                    _shared_config = Config()
     return _shared_config
@@ -0,0 +1,276 @@
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+from logging import getLogger
+
+from iterative.config import Config, get_config
+
+logger = getLogger(__name__)
+
+ConfigDiff = Dict[str, Tuple[Any, Any]]
+
+# Keys read from the config every time they are used, publishing the new snapshot is all they need
+LIVE_KEYS = frozenset({
+    "actions_cap",
+    "default_ai_model",
+    "assistant_id",
+    "assistant_conversation_thread_id",
+    "metadata",
+    "swagger_ui_nested_path",
+    "use_discovery_index",
+    "scan_ignore",
+    "scan_cache_ttl",
+    "analysis_workers",
+    "watch_config",
+    "config_watch_interval",
+    "batch_max_calls",
+    "batch_max_concurrency",
+    "action_cache_max_bytes",
+    "trace_enabled",
+    "trace_sample_rate",
+})
+
+
+class ConfigRefresher(NamedTuple):
+    name: str
+    keys: FrozenSet[str]
+    refresh: Callable[[ConfigDiff], None]
+
+
+class ConfigChangeResult(NamedTuple):
+    diff: ConfigDiff
+    applied: bool
+    refreshed: Tuple[str, ...] = ()
+    message: str = ""
+
+
+_refreshers: List[ConfigRefresher] = []
+
+
+def register_config_refresher(name: str, keys: Iterable[str], refresh: Callable[[ConfigDiff], None]):
+    """
+    Register the function that brings a subsystem up to date when any of the given config keys change.
+    A refresher registered again under the same name replaces the previous one.
+    """
+    unregister_config_refresher(name)
+    _refreshers.append(ConfigRefresher(name, frozenset(keys), refresh))
+
+
+def unregister_config_refresher(name: str):
+    _refreshers[:] = [refresher for refresher in _refreshers if refresher.name != name]
+
+
+def diff_config_values(old_values: Dict[str, Any], new_values: Dict[str, Any]) -> ConfigDiff:
+    """
+    Returns the keys whose value differs, mapped to their (old, new) values.
+    """
+    return {
+        key: (old_values.get(key), new_values.get(key))
+        for key in sorted(set(old_values) | set(new_values))
+        if old_values.get(key) != new_values.get(key)
+    }
+
+
+def _plan_refresh(diff: ConfigDiff) -> Tuple[List[ConfigRefresher], List[str]]:
+    refreshers = [refresher for refresher in _refreshers if refresher.keys & diff.keys()]
+    refreshable = set(LIVE_KEYS).union(*(refresher.keys for refresher in _refreshers))
+    restart_keys = [key for key in diff if key not in refreshable]
+    return refreshers, restart_keys
+
+
+def _run_refreshers(refreshers: List[ConfigRefresher], diff: ConfigDiff) -> List[str]:
+    refreshed = []
+    for refresher in refreshers:
+        refresher.refresh(diff)
+        refreshed.append(refresher.name)
+    return refreshed
+
+
+def apply_config_values(config: Config, new_values: Dict[str, Any]) -> ConfigChangeResult:
+    """
+    Apply the changed values of a reloaded config file to the running app.
+
+    Only the values that differ from the last file contents are applied, then the subsystems they
+    affect are refreshed. A change to a key that can't be applied live rejects the whole change.
+    If a refresh fails, the previous values are restored and refreshed again.
+    """
+    diff = diff_config_values(config.file_values, new_values)
+    if not diff:
+        return ConfigChangeResult(diff, applied=False, message="No changes")
+
+    refreshers, restart_keys = _plan_refresh(diff)
+    if restart_keys:
+        message = (
+            f"Not applying the config change, {', '.join(restart_keys)} can't be changed while the app runs. "
+            f"Restart the app to apply it."
+        )
+        logger.error(message)
+        return ConfigChangeResult(diff, applied=False, message=message)
+
+    previous_values = {key: old for key, (old, _) in diff.items()}
+    with config.transaction() as transaction:
+        transaction.update({key: new for key, (_, new) in diff.items()})
+
+    try:
+        refreshed = _run_refreshers(refreshers, diff)
+    except Exception as e:
+        message = f"Not applying the config change, refreshing failed: {e}"
+        logger.exception(message)
+        with config.transaction() as transaction:
+            transaction.update(previous_values)
+        reverse_diff = {key: (new, old) for key, (old, new) in diff.items()}
+        for refresher in refreshers:
+            try:
+                refresher.refresh(reverse_diff)
+            except Exception:
+                logger.exception(f"Could not restore {refresher.name} after the failed config change")
+        return ConfigChangeResult(diff, applied=False, message=message)
+
+    config.file_values = new_values
+    message = f"Applied config change to {', '.join(diff)}"
+    logger.info(message + (f", refreshed {', '.join(refreshed)}" if refreshed else ""))
+    return ConfigChangeResult(diff, applied=True, refreshed=tuple(refreshed), message=message)
+
+
+def reload_config_file(config: Config = None) -> ConfigChangeResult:
+    """
+    Re-read and validate the config file, then apply what changed. An invalid file changes nothing.
+    """
+    config = config or get_config()
+    try:
+        new_values = config.read_file_values()
+    except Exception as e:
+        message = f"Not applying the config change, {config.user_config_path} is invalid: {e}"
+        logger.error(message)
+        return ConfigChangeResult({}, applied=False, message=message)
+    return apply_config_values(config, new_values)
+
+
+class ConfigWatcher:
+    """
+    Polls the config file and applies its changes through `reload_config_file`.
+    """
+
+    def __init__(self, config: Config = None, interval: float = None):
+        self.config = config or get_config()
+        self.interval = interval or self.config.get("config_watch_interval", 1.0)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._fingerprint = self._stat()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.config.user_config_path)
+        except (OSError, TypeError):
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self) -> Optional[ConfigChangeResult]:
+        """
+        Reload the config if the file changed since the last check.
+        """
+        fingerprint = self._stat()
+        if fingerprint == self._fingerprint:
+            return None
+        self._fingerprint = fingerprint
+        return reload_config_file(self.config)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Config watcher failed to reload the config")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="iterative-config-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def refresh_logging_level(diff: ConfigDiff):
+    from iterative import LOGGING_LEVELS
+
+    _, logging_level = diff["logging_level"]
+    logging.getLogger().setLevel(LOGGING_LEVELS.get(str(logging_level).upper(), logging.INFO))
+
+
+ACTION_EXPOSURE_KEYS = frozenset({
+    "expose_project_actions",
+    "expose_package_default_actions",
+    "expose_default_actions_to_ai",
+    "expose_project_actions_to_ai",
+    "expose_api_actions_to_ai",
+    "expose_default_actions_to_cli",
+    "expose_project_actions_to_cli",
+})
+
+
+def create_web_actions_refresher(web_app) -> Callable[[ConfigDiff], None]:
+    """
+    Returns a refresher that swaps the web app's action routes for the actions the new config exposes.
+    The CLI is built per invocation, so it picks up the `*_to_cli` flags on its next run.
+    """
+    def refresh_web_actions(diff: ConfigDiff):
+        from iterative.service.action_management.service.action_utils import get_configured_actions
+        from iterative.web_app_integration import replace_actions_in_web_app
+
+        web_actions, _ = get_configured_actions()
+        replace_actions_in_web_app(web_actions.values(), web_app)
+
+    return refresh_web_actions
+
+
+def refresh_tracing(diff: ConfigDiff):
+    from iterative.service.telemetry_management.service.trace_utils import get_tracer
+
+    # Traces already queued are written in the old format, the next ones get an exporter for the new config
+    get_tracer().shutdown()
+
+
+def refresh_action_pools(diff: ConfigDiff):
+    from iterative.service.action_management.service.invoke_utils import get_action_invoker
+
+    # Running invocations finish on the old pools, new ones get pools of the new size
+    get_action_invoker().shutdown(wait=False)
+
+
+_watcher: Optional[ConfigWatcher] = None
+
+
+def start_config_watcher(web_app) -> Optional[ConfigWatcher]:
+    """
+    Start watching the config file if `watch_config` is enabled and the project has one.
+    """
+    global _watcher
+    config = get_config()
+    if not config.get("watch_config") or not config.user_config_path:
+        return None
+
+    register_config_refresher("logging", {"logging_level"}, refresh_logging_level)
+    register_config_refresher("web actions", ACTION_EXPOSURE_KEYS, create_web_actions_refresher(web_app))
+    register_config_refresher("action pools", {"action_threads", "action_processes"}, refresh_action_pools)
+    register_config_refresher("tracing", {"trace_format"}, refresh_tracing)
+    if _watcher is None:
+        _watcher = ConfigWatcher(config)
+        _watcher.start()
+        logger.info(f"Watching {config.user_config_path} for changes")
+    return _watcher
+
+
+def get_config_watcher() -> Optional[ConfigWatcher]:
+    return _watcher
+
+
+def stop_config_watcher():
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
@@ -0,0 +1,224 @@
+import os
+import threading
+import time
+from typing import Iterable, List, NamedTuple, Optional, Set, Tuple
+from logging import getLogger
+
+from iterative.config import get_config
+
+logger = getLogger(__name__)
+
+
+class ReloadResult(NamedTuple):
+    changed: Tuple[str, ...]
+    reloaded: Tuple[str, ...] = ()  # Module files executed again
+    actions: Tuple[str, ...] = ()  # Actions whose route or command was replaced, added or removed
+    routers: Tuple[str, ...] = ()  # API files whose routers were included again
+    seconds: float = 0.0
+    applied: bool = True
+    message: str = ""
+
+
+def get_reload_roots(config=None) -> List[str]:
+    """
+    Returns the folders to watch, `reload_dirs` resolved against the project root.
+    """
+    from iterative.service.project_management.service.project_utils import get_project_root
+
+    config = config or get_config()
+    base = get_project_root() or os.getcwd()
+    return [os.path.abspath(os.path.join(base, folder)) for folder in (config.get("reload_dirs") or ["."])]
+
+
+def _functions_by_name(actions) -> dict:
+    return {name: action.get_function() for name, action in actions.items()}
+
+
+def _changed_names(old: dict, new: dict) -> Set[str]:
+    return {name for name in old.keys() | new.keys() if old.get(name) is not new.get(name)}
+
+
+class HotReloader:
+    """
+    Watches the project's Python files and brings a running app up to date when they change.
+
+    Only the changed modules and the project modules importing them are executed again. Actions are then
+    discovered from the module registry, where every other module is still loaded, and only the routes and
+    CLI commands of actions whose function changed are replaced, along with the routes of changed API files.
+
+    Args:
+        web_app: The FastAPI app whose routes are patched.
+        cli_app (optional): The Typer app whose commands are patched.
+        roots (List[str], optional): Folders to watch. Defaults to `reload_dirs`.
+    """
+
+    def __init__(self, web_app, cli_app=None, roots: List[str] = None, config=None):
+        self.web_app = web_app
+        self.cli_app = cli_app
+        self.config = config or get_config()
+        self.roots = roots or get_reload_roots(self.config)
+        self.ignore = self.config.get("scan_ignore") or []
+        self.debounce = self.config.get("reload_debounce", 0.05) or 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._watcher = None
+        # Files of a batch that failed to reload, retried with the next change until they load
+        self._failed: Set[str] = set()
+        # Functions of the exposed actions as of the last reload, by action name
+        self._web_functions: Optional[dict] = None
+        self._cli_functions: Optional[dict] = None
+
+    def reload(self, paths: Iterable[str]) -> ReloadResult:
+        """
+        Apply the changes of the given files to the app.
+        """
+        from iterative.service.action_management.service.action_registry import get_action_registry
+        from iterative.service.action_management.service.action_utils import get_configured_actions
+        from iterative.service.action_management.service.cache_utils import invalidate_action_cache
+        from iterative.service.project_management.service.project_utils import snake_case
+        from iterative.service.project_management.service.reload_utils import reload_user_modules
+        from iterative.service.project_management.service.scan_utils import get_project_index, invalidate_project_index
+        from iterative.service.project_management.service.watch_utils import is_watched_file
+        from iterative.web_app_integration import replace_routers_in_web_app, update_actions_in_web_app
+
+        start = time.perf_counter()
+        changed = {os.path.abspath(path) for path in paths if is_watched_file(path)}
+        if not changed:
+            return ReloadResult((), applied=False, message="No changes")
+
+        with self._lock:
+            changed = tuple(sorted(changed | self._failed))
+            if self._web_functions is None:
+                self._web_functions, self._cli_functions = (_functions_by_name(actions) for actions in get_configured_actions())
+            indexed_files = set(get_project_index(self.roots[0]).python_files)
+            added_or_removed = [path for path in changed if (path in indexed_files) != os.path.exists(path)]
+
+            try:
+                module_reload = reload_user_modules(changed, self.roots, self.ignore)
+                touched = set(module_reload.reloaded) | set(module_reload.removed) | set(added_or_removed)
+                if touched:
+                    for path in added_or_removed:
+                        invalidate_project_index(path)
+                    get_action_registry().invalidate()
+                    web_actions, cli_actions = get_configured_actions()
+            except Exception as e:
+                # The app keeps serving what it served before, the files are tried again with the next change
+                self._failed = set(changed)
+                message = f"Not reloading, {e.__class__.__name__}: {e}"
+                logger.error(message)
+                return ReloadResult(changed, applied=False, message=message)
+            self._failed = set()
+
+            if not touched:
+                # Nothing discovery loaded, the changed modules are imported again when next needed
+                return ReloadResult(changed, seconds=time.perf_counter() - start,
+                                    message=f"Unloaded {', '.join(module_reload.unloaded) or 'nothing'}")
+
+            web_functions, cli_functions = _functions_by_name(web_actions), _functions_by_name(cli_actions)
+            changed_web_actions = _changed_names(self._web_functions, web_functions)
+            if changed_web_actions:
+                update_actions_in_web_app(web_actions.values(), changed_web_actions, self.web_app)
+            api_files = self._api_files(touched)
+            if api_files:
+                replace_routers_in_web_app(api_files, self.web_app)
+            self.web_app.openapi_schema = None
+
+            changed_cli_actions = _changed_names(self._cli_functions, cli_functions)
+            if self.cli_app is not None and changed_cli_actions:
+                from iterative.cli_app_integration import replace_actions_in_cli_app
+
+                replace_actions_in_cli_app(cli_actions.values(), changed_cli_actions, self.cli_app)
+
+            for name in changed_web_actions | changed_cli_actions:
+                invalidate_action_cache(snake_case(name))
+            self._web_functions, self._cli_functions = web_functions, cli_functions
+
+        seconds = time.perf_counter() - start
+        actions = tuple(sorted(changed_web_actions | changed_cli_actions))
+        message = (
+            f"Reloaded {len(module_reload.reloaded)} modules in {seconds * 1000:.1f}ms, "
+            f"replaced {len(actions)} actions and the routers of {len(api_files)} API files"
+        )
+        logger.info(message)
+        return ReloadResult(changed, module_reload.reloaded, actions, tuple(sorted(api_files)), seconds, message=message)
+
+    def _api_files(self, paths: Set[str]) -> Set[str]:
+        from iterative.service.project_management.service.scan_utils import get_project_index
+
+        api_files = {path for files in get_project_index(self.roots[0]).api_files.values() for path in files}
+        # Deleted files are no longer in the index, the routes included from them are removed all the same
+        api_files.update(getattr(route, "__iterative_router_file__", None) for route in self.web_app.router.routes)
+        return {path for path in paths if path in api_files}
+
+    def _collect_changes(self) -> Set[str]:
+        changed = self._watcher.wait(0.5)
+        # Editors write a file in several steps, wait until they are done
+        while changed and not self._stop.is_set():
+            more = self._watcher.wait(self.debounce) if self.debounce else set()
+            if not more:
+                break
+            changed |= more
+        return changed
+
+    def _run(self):
+        from iterative.service.project_management.service.watch_utils import create_file_watcher
+
+        # Registering the folders walks the project, done here so it doesn't hold up startup
+        self._watcher = create_file_watcher(
+            self.roots,
+            backend=self.config.get("reload_backend") or "auto",
+            ignore=self.ignore,
+            poll_interval=self.config.get("reload_poll_interval") or 0.5,
+        )
+        logger.info(f"Watching {', '.join(self.roots)} for changes ({self._watcher.backend})")
+        while not self._stop.is_set():
+            try:
+                changed = self._collect_changes()
+                if changed and not self._stop.is_set():
+                    self.reload(changed)
+            except Exception:
+                logger.exception("Hot reload failed")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="iterative-hot-reload", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+
+
+_reloader: Optional[HotReloader] = None
+
+
+def start_hot_reload(web_app, cli_app=None, enabled: bool = None) -> Optional[HotReloader]:
+    """
+    Start reloading changed project modules into the running app if `enabled`, by default if `reload` is on.
+    """
+    global _reloader
+    if not (get_config().get("reload") if enabled is None else enabled):
+        return None
+    if _reloader is None:
+        _reloader = HotReloader(web_app, cli_app)
+        _reloader.start()
+    return _reloader
+
+
+def get_hot_reloader() -> Optional[HotReloader]:
+    return _reloader
+
+
+def stop_hot_reload():
+    global _reloader
+    if _reloader is not None:
+        _reloader.stop()
+        _reloader = None
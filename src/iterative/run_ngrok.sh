@@ -72,26 +72,37 @@ printf " ${C_GRN}Executing ngrok...${C_RST}\n\n"
 $NGROK_CMD >> /dev/null &
 NGROK_PID=$!
 
-sleep 5s
+fetch_tunnels() {
+    if ! [ -x "$(command -v curl)" ]; then
+        wget -qO - $tnl 2>/dev/null
+    else
+        curl -s $tnl 2>/dev/null
+    fi
+}
+
+# Poll the ngrok API until the tunnel is up, backing off from 0.1s to 1s, instead of a fixed sleep
+START_TIMEOUT=${NGROK_START_TIMEOUT:-30}
+DEADLINE=$(( $(date +%s) + ${START_TIMEOUT%.*} ))
+DELAY=0.1
+TUNNELS=$(fetch_tunnels)
+while [[ $TUNNELS != *$lnpref* ]] && (( $(date +%s) < DEADLINE )); do
+    if ! kill -0 $NGROK_PID 2>/dev/null; then
+        printf " ${C_RED}ngrok exited before the tunnel was up${C_RST}\n"
+        exit 1
+    fi
+    sleep $DELAY
+    DELAY=$(awk -v d=$DELAY 'BEGIN { d *= 2; if (d > 1) d = 1; print d }')
+    TUNNELS=$(fetch_tunnels)
+done
 
 # Fetch ngrok tunnel URL
-if ! [ -x "$(command -v curl)" ]; then
-    unset API
-    API=$(wget -qO - $tnl | awk -F"," -v k=$lnpref '{
-        gsub(/{|}/,"")
-        for(i=1;i<=NF;i++){
-            if ( $i ~ k ){ printf "${i}" }
-        }
-    }')
-else
-    unset API
-    API=$(curl -s $tnl | awk -F"," -v k=$lnpref '{
-        gsub(/{|}/,"")
-        for(i=1;i<=NF;i++){
-            if ( $i ~ k ){ print $i }
-        }
-    }')
-fi
+unset API
+API=$(echo "$TUNNELS" | awk -F"," -v k=$lnpref '{
+    gsub(/{|}/,"")
+    for(i=1;i<=NF;i++){
+        if ( $i ~ k ){ print $i }
+    }
+}')
 API=${API//$sq}
 API=${API//$prefix}
 IFS=$'\n' read -rd '' -a FST <<<"$API"
@@ -115,8 +126,10 @@ export WEBHOOK_DEV_LINK=$LINK_HTTPS
 export CLOUD_RUN_SERVICE_URL=$LINK_HTTPS
 export HOST=$LINK_HTTPS
 
-# Write environment variables to a temp file
-echo "NGROK_EXECUTABLE=$NG" > /tmp/env_vars.txt
-echo "WEBHOOK_DEV_LINK=$LINK_HTTPS" >> /tmp/env_vars.txt
-echo "CLOUD_RUN_SERVICE_URL=$LINK_HTTPS" >> /tmp/env_vars.txt
-echo "HOST=$LINK_HTTPS" >> /tmp/env_vars.txt
\ No newline at end of file
+# Write environment variables to a temp file, renamed into place so readers never see it half written
+echo "NGROK_EXECUTABLE=$NG" > /tmp/env_vars.txt.tmp
+echo "WEBHOOK_DEV_LINK=$LINK_HTTPS" >> /tmp/env_vars.txt.tmp
+echo "CLOUD_RUN_SERVICE_URL=$LINK_HTTPS" >> /tmp/env_vars.txt.tmp
+echo "HOST=$LINK_HTTPS" >> /tmp/env_vars.txt.tmp
+echo "NGROK_PID=$NGROK_PID" >> /tmp/env_vars.txt.tmp
+mv /tmp/env_vars.txt.tmp /tmp/env_vars.txt
\ No newline at end of file
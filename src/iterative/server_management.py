@@ -1,19 +1,49 @@
 # util_server.py in admin_code subdirectory
 import subprocess
-import time
-import os
-import subprocess
 import os
+from typing import Tuple
 from logging import getLogger
 from iterative.config import get_config
 
 logger = getLogger(__name__)
 
 
+NGROK_ENV_FILE = "/tmp/env_vars.txt"
+
+
+def _get_start_timeout() -> float:
+    from iterative.service.server_management.service.supervisor_utils import DEFAULT_START_TIMEOUT
+
+    return float(get_config().get("process_start_timeout") or DEFAULT_START_TIMEOUT)
+
+
 def start_uvicorn(host, port, app_module):
-    subprocess.run(["pkill", "-f", f"uvicorn.*{port}"])
-    time.sleep(1)  # Allow time for the port to become free
-    return subprocess.Popen(["uvicorn", app_module, "--host", host, "--port", str(port)])
+    """
+    Start uvicorn serving `app_module` and return its process once it answers HTTP requests.
+
+    The uvicorn a previous call started on the same port is stopped first, found through its pid file.
+
+    Raises:
+        RuntimeError: If another process holds the port, or uvicorn exits before it is ready.
+        TimeoutError: If uvicorn isn't ready within `process_start_timeout` seconds.
+    """
+    from iterative.service.server_management.service.supervisor_utils import (
+        get_process_supervisor,
+        http_responds,
+        is_port_free,
+    )
+
+    supervisor = get_process_supervisor()
+    name = f"uvicorn-{port}"
+    supervisor.stop(name)
+    if not is_port_free(host, int(port)):
+        raise RuntimeError(f"Port {port} is in use by a process iterative didn't start")
+    return supervisor.start(
+        name,
+        ["uvicorn", app_module, "--host", host, "--port", str(port)],
+        ready=lambda: http_responds(host, int(port)),
+        timeout=_get_start_timeout(),
+    )
 
 def run_ngrok_subprocess():
     # Set up ngrok (assuming you have this function implemented)
@@ -21,44 +51,153 @@ def run_ngrok_subprocess():
     bash_script_path = os.path.join(script_directory, "run_ngrok.sh")
     run_ngrok_setup_script(bash_script_path)
 
-def run_web_server():
+def run_web_server(workers: int = None, reload: bool = None):
     """
     Run the fastapi web server over uvicorn.  Settings are taken from .iterative/config.yaml
+
+    With more than one worker (`server_workers`, 0 for one per core), the app is prepared once in this
+    process and served by workers forked from it, see `PreforkServer`.
+
+    Hot reload is meant for development with one worker. With more, it is turned off unless
+    `reload_in_workers` is set, as every worker would watch and re-import the project on its own.
+
+    Args:
+        workers (int, optional): Overrides `server_workers`.
+        reload (bool, optional): Overrides `reload`.
     """
     import uvicorn
-    from iterative import prep_app, web_app
+    from iterative import cli_app, prep_app, web_app
+    from iterative.service.server_management.service.prefork_utils import (
+        PreforkServer,
+        create_uvicorn_config,
+        get_server_settings,
+    )
 
-    host = get_config().get("fastapi_host", "0.0.0.0")
-    port = get_config().get("fastapi_port", 5279)
+    from iterative.hot_reload import start_hot_reload, stop_hot_reload
 
-    # Prepare the app with routers
+    # Prepare the app with routers, a no-op if it already was
     prep_app()
+    settings = get_server_settings(workers)
+    if should_hot_reload(reload, settings.workers):
+        start_hot_reload(web_app, cli_app, enabled=True)
+    else:
+        stop_hot_reload()
 
     try:
-        logger.info(f"Starting server on {host}:{port}")
-        uvicorn.run(web_app, host=host, port=port)
+        if settings.workers > 1 and hasattr(os, "fork"):
+            watching_config, reloading = _before_fork()
+            after_fork = [_start_metrics_flushing]
+            if watching_config:
+                after_fork.append(lambda: _start_config_watcher(web_app))
+            if reloading:
+                after_fork.append(lambda: _start_hot_reload(web_app))
+            PreforkServer(web_app, settings, after_fork=after_fork).run()
+        else:
+            if settings.workers > 1:
+                logger.warning("This platform can't fork workers, serving from a single process")
+            logger.info(f"Starting server on {settings.host}:{settings.port}")
+            uvicorn.Server(create_uvicorn_config(web_app, settings)).run()
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
         logger.error(f"Error running server: {e}")
 
+
+def should_hot_reload(reload: bool, workers: int) -> bool:
+    """
+    Returns whether the server hot reloads, `reload` overriding the config. More than one worker turns it
+    off unless `reload_in_workers` is set.
+    """
+    if reload is None:
+        reload = bool(get_config().get("reload"))
+    if reload and workers > 1 and not get_config().get("reload_in_workers"):
+        logger.warning(
+            f"Not hot reloading, it is meant for a single worker and {workers} are starting. "
+            f"Set reload_in_workers to reload in every worker."
+        )
+        return False
+    return reload
+
+
+def _before_fork() -> Tuple[bool, bool]:
+    """
+    Stop the threads of this process and point the metrics at a directory all workers write to.
+
+    Returns:
+        Tuple[bool, bool]: Whether the config watcher and the hot reloader were running, so the workers
+        start their own.
+    """
+    import tempfile
+    from iterative.config_watcher import get_config_watcher, stop_config_watcher
+    from iterative.hot_reload import get_hot_reloader, stop_hot_reload
+    from iterative.service.action_management.service.invoke_utils import get_action_invoker
+    from iterative.service.telemetry_management.service.metrics_utils import get_metrics_registry, reset_multiprocess_dir
+    from iterative.service.telemetry_management.service.trace_utils import get_tracer
+
+    watching_config = get_config_watcher() is not None
+    reloading = get_hot_reloader() is not None
+    stop_config_watcher()
+    stop_hot_reload()
+    get_tracer().shutdown()
+    get_action_invoker().shutdown()
+
+    registry = get_metrics_registry()
+    if not registry.multiprocess_dir:
+        registry.multiprocess_dir = os.path.join(tempfile.gettempdir(), f"iterative-metrics-{os.getpid()}")
+    reset_multiprocess_dir(registry.multiprocess_dir)
+    return watching_config, reloading
+
+
+def _start_metrics_flushing():
+    from iterative.service.telemetry_management.service.metrics_utils import get_metrics_registry
+
+    get_metrics_registry().start_flushing()
+
+
+def _start_config_watcher(web_app):
+    from iterative.config_watcher import start_config_watcher
+
+    start_config_watcher(web_app)
+
+
+def _start_hot_reload(web_app):
+    from iterative import cli_app
+    from iterative.hot_reload import start_hot_reload
+
+    start_hot_reload(web_app, cli_app, enabled=True)
+
 def run_ngrok_setup_script(script_path):
+    from iterative.service.server_management.service.supervisor_utils import PidFile, get_process_supervisor, wait_for
+
+    supervisor = get_process_supervisor()
     try:
-        subprocess.run(["bash", script_path], check=True)
+        # The ngrok of a previous run, and its env file, which would otherwise pass for this run's
+        supervisor.stop("ngrok")
+        if os.path.exists(NGROK_ENV_FILE):
+            os.remove(NGROK_ENV_FILE)
+
+        # The script returns once the tunnel is up, or its own deadline passed
+        subprocess.run(["bash", script_path], check=True, env={**os.environ, "NGROK_START_TIMEOUT": str(_get_start_timeout())})
 
-        # Wait for ngrok to set up completely (30 seconds)
         logger.info("Waiting for ngrok to set up...")
-        time.sleep(8)
+        wait_for(lambda: os.path.exists(NGROK_ENV_FILE), _get_start_timeout(), "the ngrok env file")
 
         # Read environment variables from the temp file
-        with open('/tmp/env_vars.txt', 'r') as file:
+        with open(NGROK_ENV_FILE, 'r') as file:
             for line in file:
+                if "=" not in line:
+                    continue
                 key, value = line.strip().split('=', 1)
+                if key == "NGROK_PID":
+                    PidFile(supervisor.pid_file("ngrok").path).write(int(value), ["ngrok"])
+                    continue
                 os.environ[key] = value
 
         logger.info(f"HOST variable set to: {os.environ.get('HOST')}")
         logger.info("ngrok and environment variables set up successfully.")
     except subprocess.CalledProcessError as e:
         logger.error(f"An error occurred while running the ngrok setup script: {e}")
+    except TimeoutError as e:
+        logger.error(f"ngrok didn't come up: {e}")
     except IOError as e:
         logger.error(f"Error reading environment variables from temp file: {e}")
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from iterative.config import get_config
+from iterative.service.action_management.models.batch import BatchRequest
+from iterative.service.action_management.service.batch_utils import get_action_routes, iter_batch, run_batch
+from iterative.service.service_management.service.serializer import IterativeJSONResponse, dumps
+
+router = APIRouter()
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@router.post("/_iterative/batch")
+async def run_actions_batch(batch: BatchRequest, request: Request):
+    """
+    Runs many action calls in one request. Each call is validated against its action's signature and the
+    calls run concurrently, up to the `batch_max_concurrency` config value at a time.
+
+    Returns the results in the order of the calls, or with `stream` set, one NDJSON line per call as it
+    completes, each carrying the index of its call.
+    """
+    config = get_config()
+    max_calls = config.get("batch_max_calls")
+    if max_calls and len(batch.calls) > max_calls:
+        raise HTTPException(status_code=413, detail=f"A batch can have at most {max_calls} calls, got {len(batch.calls)}")
+
+    action_routes = get_action_routes(request.app)
+    max_concurrency = config.get("batch_max_concurrency")
+    if batch.stream:
+        async def lines():
+            async for result in iter_batch(batch.calls, action_routes, max_concurrency):
+                yield dumps(result) + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    results = await run_batch(batch.calls, action_routes, max_concurrency)
+    return IterativeJSONResponse({"results": results})
@@ -0,0 +1,36 @@
+from fastapi import APIRouter
+from typing import Optional
+from iterative.service.action_management.service.cache_utils import get_action_cache
+from iterative.service.action_management.service.coalesce_utils import get_single_flight
+
+router = APIRouter()
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@router.get("/_iterative/cache")
+def get_action_cache_stats():
+    """
+    Returns the hit, miss, eviction and expiration counters of the action result cache, overall and per action.
+    """
+    return get_action_cache().stats()
+
+
+@router.delete("/_iterative/cache")
+def invalidate_action_cache(action: Optional[str] = None, prefix: Optional[str] = None):
+    """
+    Drops cached action results, those of `action` and/or whose key starts with `prefix`, all of them if neither is given.
+    """
+    invalidated = get_action_cache().invalidate(action, prefix)
+    logger.info(f"Invalidated {invalidated} cached action results")
+    return {"invalidated": invalidated}
+
+
+@router.get("/_iterative/coalescing")
+def get_coalescing_stats():
+    """
+    Returns, per coalesced action, how many executions ran and how many callers they served.
+    """
+    return {"in_flight": get_single_flight().in_flight(), "actions": get_single_flight().stats()}
@@ -1,6 +1,5 @@
-import inspect
 import uuid
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, List, Optional
 from iterative.service.model_management.models.iterative import IterativeModel
 from pydantic import Field
 
@@ -53,37 +52,41 @@ class Action(IterativeModel):
             }
         }
     
+
+class ActionParameter(IterativeModel):
+    name: str
+    annotation: Optional[str] = None  # Source text of the annotation, e.g. "Optional[str]"
+    default: Any = None
+    has_default: bool = False
+
+
+class ActionSpec(IterativeModel):
+    """
+    An action described from the source of its file, without importing it.
+    The module is only imported when the function is actually called.
+    """
+    name: str
+    file_path: str
+    category: str
+    docstring: Optional[str] = None
+    is_async: bool = False
+    parameters: List[ActionParameter] = []
+
+    def get_name(self):
+        return self.name
+
+    def get_file(self):
+        return self.file_path
+
+    def get_category(self):
+        return self.category
+
+    def get_function(self):
+        from iterative.service.action_management.service.action_spec_utils import create_lazy_function
+        return create_lazy_function(self)
+
+
 # Helper function to create a JSON representation from a function callback
 def create_function_tool_from_callback(name: str, callback: Callable) -> Dict[str, Any]:
-    params = inspect.signature(callback).parameters
-    parameters = {
-        "type": "object",
-        "properties": {},
-        "required": []
-    }
-
-    for param_name, param in params.items():
-        # Determine the type of the parameter
-        param_type = "string"  # default type if no annotation is provided
-        if param.annotation != inspect.Parameter.empty:
-            param_type = param.annotation.__name__ if hasattr(param.annotation, '__name__') else str(param.annotation)
-        
-        # Determine the description of the parameter
-        param_description = param_name  # default description is the name of the parameter
-        # If the function has a docstring, you could potentially parse it for a description
-
-        parameters["properties"][param_name] = {
-            "type": param_type,
-            "description": param_description
-        }
-        if param.default is param.empty:
-            parameters["required"].append(param_name)
-
-    return {
-        "type": "function",
-        "function": {
-            "name": name,
-            "description": callback.__doc__ or "No description provided",
-            "parameters": parameters
-        }
-    }
\ No newline at end of file
+    from iterative.service.action_management.service.tool_schema_utils import get_tool_schema_compiler
+    return get_tool_schema_compiler().compile(name, callback)
@@ -0,0 +1,21 @@
+from typing import Any, Dict, List, Optional
+from iterative.service.model_management.models.iterative import IterativeModel
+
+
+class BatchCall(IterativeModel):
+    action: str  # Name of the action route, e.g. "get_user" for /get_user
+    arguments: Dict[str, Any] = {}
+
+
+class BatchRequest(IterativeModel):
+    calls: List[BatchCall]
+    stream: bool = False  # Stream the results as NDJSON as each call completes
+
+
+class BatchResult(IterativeModel):
+    index: int  # Position of the call in the request
+    action: str
+    ok: bool
+    status_code: int = 200
+    result: Any = None
+    error: Optional[Any] = None
@@ -0,0 +1,239 @@
+import threading
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from iterative.service.project_management.service.project_utils import snake_case
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+# Where actions come from, in the order they win name collisions
+PROJECT = "project"
+DEFAULT = "default"
+API = "api"
+SOURCES = (PROJECT, DEFAULT, API)
+
+
+class ActionEntry:
+    """
+    One discovered action. Has the getters of `Action`, so it can be passed wherever an Action is.
+    """
+
+    __slots__ = ("name", "snake_name", "function", "file_path", "category", "source", "position")
+
+    def __init__(self, name: str, function: Callable, file_path: str, category: str, source: str, position: int):
+        self.name = name
+        self.snake_name = snake_case(name)
+        self.function = function
+        self.file_path = file_path
+        self.category = category
+        self.source = source
+        self.position = position
+
+    def get_name(self) -> str:
+        return self.name
+
+    def get_function(self) -> Callable:
+        return self.function
+
+    def get_file(self) -> str:
+        return self.file_path
+
+    def get_category(self) -> str:
+        return self.category
+
+    def to_action(self):
+        """
+        Returns the entry as an `Action` model.
+        """
+        from iterative.service.action_management.models.action import Action
+
+        return Action(name=self.name, function=self.function, file_path=self.file_path, category=self.category)
+
+    def to_json(self):
+        return self.to_action().to_json()
+
+    def __repr__(self) -> str:
+        return f"ActionEntry({self.name!r}, source={self.source!r}, file_path={self.file_path!r})"
+
+
+class ActionCollision(NamedTuple):
+    key: str  # The action name, or the snake name two different names share
+    kind: str  # "name" or "snake_name"
+    kept: ActionEntry
+    dropped: ActionEntry
+
+    def describe(self) -> str:
+        label = "Action" if self.kind == "name" else "Route name"
+        return (
+            f"{label} {self.key!r} from {self.dropped.file_path} ({self.dropped.source}) is shadowed by "
+            f"{self.kept.name!r} from {self.kept.file_path} ({self.kept.source})"
+        )
+
+
+class ActionRegistry:
+    """
+    Every discovered action, indexed by name, snake name, category and file.
+
+    Each source is discovered once, on first use, and kept until `invalidate`. Entries live in one list
+    in discovery order, the indexes hold positions into it. Views of the actions exposed to the web app,
+    the AI or the CLI are filtered from it and cached per generation, which `invalidate` increments so
+    caches built from the registry know to rebuild.
+
+    Args:
+        loaders (Dict[str, Callable], optional): Returns the (name, function, file, category) tuples of a
+            source. Defaults to discovering project actions, package default actions and API routes.
+    """
+
+    def __init__(self, loaders: Dict[str, Callable[[], Iterable[Tuple[str, Callable, str, str]]]] = None):
+        self._loaders = loaders or {PROJECT: load_project_actions, DEFAULT: load_default_actions, API: load_api_actions}
+        self._lock = threading.RLock()
+        self.generation = 0
+        self._reset()
+
+    def _reset(self):
+        self._entries: List[ActionEntry] = []
+        self._loaded_sources = set()
+        self._by_name: Dict[str, List[int]] = {}
+        self._by_snake_name: Dict[str, List[int]] = {}
+        self._by_category: Dict[str, List[int]] = {}
+        self._by_file: Dict[str, List[int]] = {}
+        self._views: Dict[Tuple[str, ...], Dict[str, ActionEntry]] = {}
+        self._logged_collisions = None
+
+    def _ensure_loaded(self, sources: Iterable[str]):
+        missing = [source for source in sources if source not in self._loaded_sources]
+        if not missing:
+            return
+        with self._lock:
+            for source in missing:
+                if source in self._loaded_sources:
+                    continue
+                # Discover the whole source before adding any of it, so a failing import leaves no partial source
+                discovered = list(self._loaders[source]())
+                for name, function, file_path, category in discovered:
+                    self._add(ActionEntry(name, function, file_path, category, source, len(self._entries)))
+                self._loaded_sources.add(source)
+
+    def _add(self, entry: ActionEntry):
+        self._entries.append(entry)
+        for index, key in (
+            (self._by_name, entry.name),
+            (self._by_snake_name, entry.snake_name),
+            (self._by_category, entry.category),
+            (self._by_file, entry.file_path),
+        ):
+            index.setdefault(key, []).append(entry.position)
+
+    def _first(self, index: Dict[str, List[int]], key: str) -> Optional[ActionEntry]:
+        self._ensure_loaded(SOURCES)
+        positions = index.get(key)
+        if not positions:
+            return None
+        # Sources are discovered on demand, so precedence, not position alone, decides like in the views
+        return min((self._entries[position] for position in positions), key=_precedence)
+
+    def get(self, name: str) -> Optional[ActionEntry]:
+        return self._first(self._by_name, name)
+
+    def get_by_snake_name(self, snake_name: str) -> Optional[ActionEntry]:
+        return self._first(self._by_snake_name, snake_name)
+
+    def in_category(self, category: str) -> List[ActionEntry]:
+        self._ensure_loaded(SOURCES)
+        return [self._entries[position] for position in self._by_category.get(category, ())]
+
+    def in_file(self, file_path: str) -> List[ActionEntry]:
+        self._ensure_loaded(SOURCES)
+        return [self._entries[position] for position in self._by_file.get(file_path, ())]
+
+    def view(self, sources: Iterable[str]) -> Dict[str, ActionEntry]:
+        """
+        Returns the actions of the given sources by name. On a name collision the action of the earlier
+        source, or the earlier file, wins. Don't mutate the view, it is shared.
+        """
+        sources = set(sources)
+        key = tuple(source for source in SOURCES if source in sources)
+        view = self._views.get(key)
+        if view is not None:
+            return view
+        self._ensure_loaded(key)
+        with self._lock:
+            view = {}
+            for entry in sorted((entry for entry in self._entries if entry.source in key), key=_precedence):
+                view.setdefault(entry.name, entry)
+            self._views[key] = view
+        return view
+
+    def collisions(self) -> List[ActionCollision]:
+        """
+        Returns the actions hidden by another with the same name, and those whose route name, the snake
+        case of their name, is taken by an action with a different name. Only sources discovered so far
+        are compared.
+        """
+        collisions = []
+        for kind, index in (("name", self._by_name), ("snake_name", self._by_snake_name)):
+            for key, positions in index.items():
+                entries = sorted((self._entries[position] for position in positions), key=_precedence)
+                kept = entries[0]
+                for dropped in entries[1:]:
+                    if kind == "snake_name" and dropped.name == kept.name:
+                        # Already reported as a name collision
+                        continue
+                    collisions.append(ActionCollision(key, kind, kept, dropped))
+        return collisions
+
+    def log_collisions(self):
+        """
+        Log the collisions once per generation and set of discovered sources.
+        """
+        key = (self.generation, frozenset(self._loaded_sources))
+        if key == self._logged_collisions:
+            return
+        self._logged_collisions = key
+        for collision in self.collisions():
+            logger.warning(collision.describe())
+
+    def invalidate(self):
+        """
+        Forget every discovered action, the next lookup discovers them again.
+        """
+        with self._lock:
+            self._reset()
+            self.generation += 1
+
+    def __len__(self) -> int:
+        self._ensure_loaded(SOURCES)
+        return len(self._entries)
+
+
+def _precedence(entry: ActionEntry) -> Tuple[int, int]:
+    return SOURCES.index(entry.source), entry.position
+
+
+def load_project_actions():
+    from iterative.service.action_management.service.action_utils import find_functions_in_directory
+    from iterative.service.project_management.models.project_models import ProjectFolder
+    from iterative.service.project_management.service.project_utils import resolve_project_folder_path
+
+    return find_functions_in_directory(resolve_project_folder_path(ProjectFolder.ACTIONS.value), "Project Actions")
+
+
+def load_default_actions():
+    from iterative.service.action_management.service.action_utils import find_functions_in_directory, get_default_actions_directory
+
+    return find_functions_in_directory(get_default_actions_directory(), "Iterative Defaults")
+
+
+def load_api_actions():
+    from iterative.service.action_management.service.action_utils import turn_project_routers_into_actions
+
+    return [
+        (action.name, action.function, action.file_path, action.category)
+        for action in turn_project_routers_into_actions()
+    ]
+
+
+_action_registry = ActionRegistry()
+
+
+def get_action_registry() -> ActionRegistry:
+    return _action_registry
@@ -0,0 +1,182 @@
+import ast
+import asyncio
+import builtins
+import inspect
+import time
+import typing
+from functools import lru_cache
+from typing import Callable, List, Optional
+from iterative.service.action_management.models.action import ActionParameter, ActionSpec
+from iterative.service.action_management.service.cache_utils import get_action_cache, get_cache_policy
+from iterative.service.action_management.service.stream_utils import is_stream, is_streaming_action, print_stream
+from iterative.service.project_management.service.index_utils import fingerprint_file, get_discovery_index
+from iterative.service.project_management.service.project_utils import load_module_from_path, snake_case
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+# Names an annotation may use without importing the action's module
+_ANNOTATION_NAMESPACE = {
+    **{name: getattr(typing, name) for name in typing.__all__},
+    "typing": typing,
+}
+
+
+class StaticSpecUnavailable(Exception):
+    """
+    Raised when an action file can't be described from its source alone.
+    """
+
+
+def _literal_default(node: ast.expr):
+    try:
+        value = ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        raise StaticSpecUnavailable(f"default value at line {node.lineno} is not a literal")
+    # Specs are stored as JSON in the discovery index, so only keep defaults that round trip
+    if value is not None and not isinstance(value, (str, int, float, bool)):
+        raise StaticSpecUnavailable(f"default value at line {node.lineno} is not a scalar")
+    return value
+
+
+@lru_cache(maxsize=None)
+def evaluate_annotation(annotation: Optional[str]):
+    """
+    Evaluates the source text of an annotation against the builtins and the `typing` module.
+    """
+    if annotation is None:
+        return inspect.Parameter.empty
+    try:
+        return eval(annotation, {"__builtins__": builtins}, _ANNOTATION_NAMESPACE)
+    except Exception:
+        raise StaticSpecUnavailable(f"annotation '{annotation}' needs the module to be imported")
+
+
+def _function_parameters(source: str, node) -> List[ActionParameter]:
+    args = node.args
+    if args.vararg or args.kwarg or getattr(args, "posonlyargs", None):
+        raise StaticSpecUnavailable(f"{node.name} uses *args, **kwargs or positional only parameters")
+
+    parameters = []
+    positional_defaults = [None] * (len(args.args) - len(args.defaults)) + list(args.defaults)
+    for arg, default in list(zip(args.args, positional_defaults)) + list(zip(args.kwonlyargs, args.kw_defaults)):
+        annotation = ast.get_source_segment(source, arg.annotation) if arg.annotation else None
+        evaluate_annotation(annotation)
+        parameters.append(ActionParameter(
+            name=arg.arg,
+            annotation=annotation,
+            default=_literal_default(default) if default is not None else None,
+            has_default=default is not None,
+        ))
+    return parameters
+
+
+def extract_action_specs_from_source(source: str, file_path: str, script_source: str) -> List[ActionSpec]:
+    """
+    Describes the public functions defined at the top level of an action file from its source.
+
+    Raises:
+        StaticSpecUnavailable: If any action can't be described without importing the file, for example
+            when it is decorated, uses non literal defaults or annotations defined in the project, or when the
+            file imports public names that would also be exposed as actions.
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as e:
+        raise StaticSpecUnavailable(f"syntax error: {e}")
+
+    specs = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                name = alias.asname or alias.name
+                # Imported functions are exposed as actions too, only the module can tell which names are functions
+                if not name.startswith("_") and name[:1].islower():
+                    raise StaticSpecUnavailable(f"imports public name '{name}'")
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not node.name.startswith("_"):
+            if node.decorator_list:
+                raise StaticSpecUnavailable(f"{node.name} is decorated")
+            specs.append(ActionSpec(
+                name=node.name,
+                file_path=file_path,
+                category=script_source,
+                docstring=ast.get_docstring(node, clean=False),
+                is_async=isinstance(node, ast.AsyncFunctionDef),
+                parameters=_function_parameters(source, node),
+            ))
+    # Keep the order inspect.getmembers gives the imported actions
+    return sorted(specs, key=lambda spec: spec.name)
+
+
+def get_action_specs(full_path: str, script_source: str) -> Optional[List[ActionSpec]]:
+    """
+    Returns the statically extracted actions of a file, served from the discovery index when the file
+    is unchanged, or None if the file has to be imported to know its actions.
+    """
+    index = get_discovery_index()
+    indexed = index.lookup("action_specs", full_path) if index else None
+    if indexed is not None:
+        index.skipped("action_specs", full_path)
+        if indexed["specs"] is None:
+            return None
+        return [ActionSpec(**spec, file_path=full_path, category=script_source) for spec in indexed["specs"]]
+
+    fingerprint = fingerprint_file(full_path)
+    start = time.perf_counter()
+    with open(full_path, "r", encoding="utf-8") as f:
+        source = f.read()
+    try:
+        specs = extract_action_specs_from_source(source, full_path, script_source)
+    except StaticSpecUnavailable as e:
+        logger.debug(f"Importing {full_path} to discover its actions: {e}")
+        specs = None
+
+    if index:
+        stored = None if specs is None else [spec.dict(exclude={"file_path", "category"}) for spec in specs]
+        index.store("action_specs", full_path, {"specs": stored}, time.perf_counter() - start, fingerprint)
+    return specs
+
+
+def build_signature(spec: ActionSpec) -> inspect.Signature:
+    parameters = []
+    for parameter in spec.parameters:
+        parameters.append(inspect.Parameter(
+            parameter.name,
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            default=parameter.default if parameter.has_default else inspect.Parameter.empty,
+            annotation=evaluate_annotation(parameter.annotation),
+        ))
+    return inspect.Signature(parameters)
+
+
+def create_lazy_function(spec: ActionSpec) -> Callable:
+    """
+    Creates a function with the signature and docstring of the action that imports the action's module
+    only when it is called. Typer builds commands and help from it without importing any user code.
+    A `cached_action` goes through the action cache once its module is loaded.
+    """
+    def lazy_action(**kwargs):
+        module = load_module_from_path(spec.file_path)
+        function = getattr(module, spec.name)
+        if get_cache_policy(function) is not None and not is_streaming_action(function):
+            return get_action_cache().call(snake_case(spec.name), function, kwargs)
+        result = function(**kwargs)
+        if inspect.iscoroutine(result):
+            result = asyncio.run(result)
+        if is_stream(result):
+            # Generator actions print their items as they come instead of returning them all at once
+            print_stream(result)
+            return None
+        return result
+
+    signature = build_signature(spec)
+    lazy_action.__name__ = spec.name
+    lazy_action.__qualname__ = spec.name
+    lazy_action.__doc__ = spec.docstring
+    lazy_action.__signature__ = signature
+    lazy_action.__annotations__ = {
+        name: parameter.annotation
+        for name, parameter in signature.parameters.items()
+        if parameter.annotation is not inspect.Parameter.empty
+    }
+    return lazy_action
@@ -1,26 +1,33 @@
 import os
 import inspect
-from typing import Callable, Dict, List
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from fastapi import APIRouter
 from fastapi.routing import APIRoute
 from iterative import get_config
 from iterative.service.project_management.models.project_models import ProjectFolder
 from iterative.service.project_management.service.project_utils import (
-    is_action_file,
     is_private_folder,
     is_template_folder,
     resolve_project_folder_path,
     get_project_root,
     load_module_from_path,
-    is_iterative_project
+    is_iterative_project,
+    snake_case,
 )
+from iterative.service.project_management.service.module_registry import get_module_registry
+from iterative.service.project_management.service.index_utils import fingerprint_file, get_discovery_index
+from iterative.service.project_management.service.scan_utils import files_within, get_project_index
 from iterative.service.api_management.service.api_utils import (
     find_api_routers_in_iterative_project,
     find_api_routers_in_parent_project,
 )
-from iterative.service.action_management.models.action import Action
+from iterative.service.action_management.models.action import Action, ActionSpec
+from iterative.service.action_management.service.action_registry import API, DEFAULT, PROJECT, ActionEntry, get_action_registry
+from iterative.service.action_management.service.action_spec_utils import get_action_specs
+from iterative.service.action_management.service.tool_schema_utils import get_tool_schema_compiler
 from logging import getLogger
-from iterative.web_app_integration import integrate_actions_into_web_app
 
 
 logger = getLogger(__name__)
@@ -50,42 +57,98 @@ def turn_function_into_action(name: str, func: Callable, file: str, script_sourc
     return Action(name=name, function=func, file_path=file, category=script_source)
 
 
-def turn_python_file_into_actions(full_path: str, script_source: str):
+def find_python_file_functions(full_path: str) -> List[Tuple[str, Callable]]:
     """
-    This function processes a Python file and returns a list of Actions created from the functions in the file.
+    This function returns the public functions of a Python file by name, without importing files the
+    discovery index knows declare none.
     """
-    actions = []
+    functions = []
+    index = get_discovery_index()
+    indexed_names = index.lookup("actions", full_path) if index else None
+    if indexed_names == []:
+        # The file was indexed and declares no actions, no need to import it
+        index.skipped("actions", full_path)
+        return functions
+
+    fingerprint = fingerprint_file(full_path)
+    start = time.perf_counter()
     module = load_module_from_path(full_path)
     for name, func in inspect.getmembers(module, inspect.isfunction):
         if is_public_function(name):
-            action = turn_function_into_action(name, func, full_path, script_source)
-            actions.append(action)
-    return actions
+            functions.append((name, func))
 
+    if index and indexed_names is None:
+        index.store("actions", full_path, [name for name, _ in functions], time.perf_counter() - start, fingerprint)
+    return functions
 
-def turn_dir_into_actions(directory: str, script_source: str):
+
+def turn_python_file_into_actions(full_path: str, script_source: str):
     """
-    This function processes the Python action files in a directory and returns a list of Actions created from the functions in the files.
+    This function processes a Python file and returns a list of Actions created from the functions in the file.
     """
-    actions = []
-    if not os.path.exists(directory):
-        return actions
+    return [
+        turn_function_into_action(name, func, full_path, script_source)
+        for name, func in find_python_file_functions(full_path)
+    ]
+
+
+def find_functions_in_directory(directory: str, script_source: str) -> List[Tuple[str, Callable, str, str]]:
+    """
+    This function returns the (name, function, file, category) of every action in a directory's action files.
+    """
+    return [
+        (name, func, full_path, script_source)
+        for full_path in find_action_files(directory)
+        for name, func in find_python_file_functions(full_path)
+    ]
+
+
+def find_action_files(directory: str) -> List[str]:
+    """
+    This function returns the paths of the Python action files in a directory, skipping private and template folders.
+    """
+    action_files = []
+    if not os.path.isdir(directory):
+        return action_files
 
     if is_private_folder(directory):
-        return actions
+        return action_files
 
     if is_template_folder(directory):
-        return actions
+        return action_files
+
 
+    directory = os.path.abspath(directory)
+    for full_path in files_within(get_project_index(directory).action_files, directory):
+        folders = os.path.relpath(os.path.dirname(full_path), directory).split(os.sep)
+        if any(is_private_folder(d) or is_template_folder(d) for d in folders if d != "."):
+            continue
+        action_files.append(full_path)
+    return action_files
 
-    for root, dirs, files in os.walk(directory):
-        dirs[:] = [
-            d for d in dirs if not is_private_folder(d) and not is_template_folder(d)
-        ]
-        for file in files:
-            if is_valid_python_file(file) and is_action_file(file):
-                full_path = os.path.join(root, file)
-                actions.extend(turn_python_file_into_actions(full_path, script_source))
+
+def turn_dir_into_actions(directory: str, script_source: str):
+    """
+    This function processes the Python action files in a directory and returns a list of Actions created from the functions in the files.
+    """
+    actions = []
+    for full_path in find_action_files(directory):
+        actions.extend(turn_python_file_into_actions(full_path, script_source))
+    return actions
+
+
+def turn_dir_into_action_specs(directory: str, script_source: str) -> List[Union[Action, ActionSpec]]:
+    """
+    This function describes the actions of a directory from the source of its action files, without importing them.
+    Files whose actions can't be described statically are imported and turned into Actions as usual.
+    """
+    actions = []
+    for full_path in find_action_files(directory):
+        specs = get_action_specs(full_path, script_source)
+        if specs is None:
+            actions.extend(turn_python_file_into_actions(full_path, script_source))
+        else:
+            actions.extend(specs)
     return actions
 
 
@@ -100,48 +163,43 @@ def turn_py_files_into_actions(file_list: List[str], script_source: str):
     return actions
 
 
-def find_default_actions():
-    default_actions_directory = os.path.join(
+def get_default_actions_directory():
+    return os.path.join(
         get_project_root(os.path.dirname(os.path.abspath(__file__))),
         ProjectFolder.ACTIONS.value,
     )
 
-    return turn_dir_into_actions(default_actions_directory, "Iterative Defaults")
+
+def find_default_actions():
+    return turn_dir_into_actions(get_default_actions_directory(), "Iterative Defaults")
 
 
 def get_all_actions(
     include_project_actions=True,
     include_package_default_actions=True,
     include_api_actions=True,
-) -> Dict[str, Action]:
+) -> Dict[str, ActionEntry]:
     """
     Get all actions, with options to include or exclude project actions and package default actions.
+    Actions are discovered once by the action registry, later calls are filtered views of it.
+    On a name collision project actions win over default actions, which win over API actions.
 
     Args:
     include_project_actions (bool): Flag to include project actions. Defaults to True.
     include_package_default_actions (bool): Flag to include package default actions. Defaults to True.
+    include_api_actions (bool): Flag to include the routes of the project's API routers. Defaults to True.
 
     Returns:
-    Dict[str, Action]: Dictionary of actions keyed by action name.
+    Dict[str, ActionEntry]: Dictionary of actions keyed by action name. Don't mutate it, it is shared.
     """
-    actions = []
-
+    sources = []
     if include_project_actions:
-        actions.extend(find_project_actions())
-
+        sources.append(PROJECT)
     if include_package_default_actions:
-        actions.extend(find_default_actions())
-
+        sources.append(DEFAULT)
     if include_api_actions:
-        actions.extend(turn_project_routers_into_actions())
-
-    all_actions_dict = {}
-    for action in actions:
-        if action.name in all_actions_dict:
-            continue
-        all_actions_dict[action.name] = action
-
-    return all_actions_dict
+        sources.append(API)
+    return get_action_registry().view(sources)
 
 
 def turn_route_into_action(route: APIRoute):
@@ -235,61 +293,98 @@ def get_configured_actions():
         include_api_actions=False 
     )
 
+    get_action_registry().log_collisions()
     return ai_actions, cli_actions
 
 
-def get_actions():
-    from fastapi import FastAPI
-    dummy_app = FastAPI()
-    exposed_ai_actions, cli_actions = get_configured_actions()
+def get_cli_actions() -> Dict[str, Union[Action, ActionSpec]]:
+    """
+    Get the actions exposed to the CLI, described statically wherever possible so that building the CLI
+    does not import user code. The modules are imported when a command is invoked.
+
+    Returns:
+    Dict[str, Union[Action, ActionSpec]]: Dictionary of actions keyed by action name.
+    """
+    config = get_config()
+    include_project_actions = False
+    include_package_default_actions = True
+    if is_iterative_project(os.getcwd()):
+        include_project_actions = config.get("expose_project_actions_to_cli")
+        include_package_default_actions = config.get("expose_default_actions_to_cli")
+    else:
+        logger.info("Not an iterative project")
+
+    actions = []
+    if include_project_actions:
+        actions.extend(turn_dir_into_action_specs(resolve_project_folder_path(ProjectFolder.ACTIONS.value), "Project Actions"))
+
+    if include_package_default_actions:
+        actions.extend(turn_dir_into_action_specs(get_default_actions_directory(), "Iterative Defaults"))
 
-    integrate_actions_into_web_app(exposed_ai_actions.values(), dummy_app)
+    cli_actions = {}
+    for action in actions:
+        if action.name in cli_actions:
+            continue
+        cli_actions[action.name] = action
+    return cli_actions
 
-    if get_config().get("let_ai_use_apis"):
-        # Add routers to the web app
-        routers = find_api_routers_in_parent_project()
-        for router in routers:
-            dummy_app.include_router(router)
 
-    openapi_schema = dummy_app.openapi()
+def get_api_tool_name(route: APIRoute) -> str:
+    """
+    Returns the tool name of an API route, its path without slashes, e.g. `users{user_id}` for
+    `/users/{user_id}`. Tools calling the API are mapped back to their URL by this name.
+    """
+    return route.path.replace("/", "")
 
-    functions = []
-    paths = openapi_schema.get('paths', {})
 
-    for path, methods in paths.items():
-        for method, details in methods.items():
-            if path == "/":
+_tool_list: Tuple[Optional[tuple], List[Dict]] = (None, [])
+_tool_list_lock = threading.Lock()
+
+
+def get_actions() -> List[Dict]:
+    """
+    Get the function tools of the actions exposed to the AI, plus the project's API routes if
+    `let_ai_use_apis` is set.
+
+    The list is built once and reused until the config changes, the action registry is invalidated or a
+    user module is reloaded.
+    Don't mutate it, it is shared.
+
+    Returns:
+    List[Dict]: The function tools, their parameters as JSON Schema.
+    """
+    global _tool_list
+    config = get_config()
+    key = (config.version, get_action_registry().generation, get_module_registry().generation)
+    cached_key, tools = _tool_list
+    if cached_key == key:
+        return tools
+
+    with _tool_list_lock:
+        cached_key, tools = _tool_list
+        if cached_key == key:
+            return tools
+
+        exposed_ai_actions, _ = get_configured_actions()
+        functions = [(snake_case(action.get_name()), action.get_function()) for action in exposed_ai_actions.values()]
+        if config.get("let_ai_use_apis"):
+            functions.extend(
+                (get_api_tool_name(route), route.endpoint)
+                for router_list in find_api_routers_in_parent_project().values()
+                for router_dict in router_list
+                for route in router_dict["router"].routes
+                if isinstance(route, APIRoute) and route.path != "/"
+            )
+
+        compiler = get_tool_schema_compiler()
+        tools = []
+        names = set()
+        for name, function in functions:
+            if name in names:
                 continue
-            # Create a function name based on path and method
-            function_name = f"{path.replace('/', '')}"
-
-            # Extract and format parameters
-            parameters = details.get('parameters', [])
-            formatted_parameters = {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-            for param in parameters:
-                param_name = param.get('name')
-                param_type = param.get('schema', {}).get('type', 'string')
-                param_description = param.get('description', '')
-                formatted_parameters['properties'][param_name] = {
-                    "type": param_type,
-                    "description": param_description
-                }
-                if param.get('required', False):
-                    formatted_parameters['required'].append(param_name)
-
-            # Add function to the list
-            function = {
-                "type": "function",
-                "function": {
-                    "name": function_name,
-                    "description": details.get('summary', 'No description available'),
-                    "parameters": formatted_parameters
-                }
-            }
-            functions.append(function)
-            
-    return functions
\ No newline at end of file
+            names.add(name)
+            tools.append(compiler.compile(name, function))
+
+        # Discovery may have loaded modules, key the list on the generation it saw them at
+        _tool_list = ((config.version, get_action_registry().generation, get_module_registry().generation), tools)
+        return tools
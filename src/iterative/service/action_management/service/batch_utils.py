@@ -0,0 +1,156 @@
+import asyncio
+import inspect
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Type
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import ResponseValidationError
+from pydantic import BaseModel, ValidationError, create_model
+from iterative.service.action_management.models.batch import BatchCall, BatchResult
+from iterative.service.action_management.service.cache_utils import get_action_cache, get_cache_policy
+from iterative.service.action_management.service.coalesce_utils import invoke_action
+from iterative.service.action_management.service.invoke_utils import ActionInvoker, get_action_invoker
+from iterative.service.action_management.service.stream_utils import is_streaming_action
+from iterative.service.telemetry_management.service.trace_utils import trace_span
+from iterative.web_app_integration import is_action_route, serialize_action_result
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+DEFAULT_BATCH_MAX_CONCURRENCY = 8
+
+
+class ActionRoute(NamedTuple):
+    name: str
+    function: Callable
+    arguments_model: Type[BaseModel]
+    response_field: Any = None  # The route's response model, cached results are stored validated against it
+
+
+def create_arguments_model(name: str, endpoint: Callable) -> Type[BaseModel]:
+    """
+    Returns a model validating the arguments of an action route, built from the signature FastAPI reads
+    for the route itself.
+    """
+    fields: Dict[str, Any] = {}
+    for parameter in inspect.signature(endpoint).parameters.values():
+        if parameter.annotation is Request:
+            # Filled in by FastAPI, not an argument of the action
+            continue
+        annotation = Any if parameter.annotation is inspect.Parameter.empty else parameter.annotation
+        default = ... if parameter.default is inspect.Parameter.empty else parameter.default
+        fields[parameter.name] = (annotation, default)
+    return create_model(f"{name}_arguments", **fields)
+
+
+def get_action_routes(web_app: FastAPI) -> Dict[str, ActionRoute]:
+    """
+    Returns the actions the web app currently serves by name. The table is rebuilt only when the app's
+    routes change, e.g. after `replace_actions_in_web_app`.
+    """
+    routes = web_app.router.routes
+    cached = getattr(web_app.state, "iterative_action_routes", None)
+    # The cache holds on to the list it was built from, so a swapped in list can't pass for it by reusing its id.
+    # Routers included in place make the list longer.
+    if cached is not None and cached[0] is routes and cached[1] == len(routes):
+        return cached[2]
+
+    action_routes = {}
+    for route in routes:
+        if not is_action_route(route):
+            continue
+        name = route.endpoint.__iterative_action_name__
+        if name not in action_routes:
+            action_routes[name] = ActionRoute(
+                name=name,
+                function=route.endpoint.__iterative_action_function__,
+                arguments_model=create_arguments_model(name, route.endpoint),
+                response_field=getattr(route.endpoint, "__iterative_response_field__", None),
+            )
+    web_app.state.iterative_action_routes = (routes, len(routes), action_routes)
+    return action_routes
+
+
+def validate_arguments(action_route: ActionRoute, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validates and converts the arguments of a call like the action's route would.
+
+    Raises:
+        ValidationError: If the arguments don't match the action's signature.
+    """
+    with trace_span("validate arguments", **{"iterative.action": action_route.name}):
+        validated = action_route.arguments_model(**arguments)
+    # Like FastAPI, pass every parameter, converted values stay as they are so nested models remain models
+    fields = getattr(action_route.arguments_model, "model_fields", None) or action_route.arguments_model.__fields__
+    return {name: getattr(validated, name) for name in fields}
+
+
+async def run_call(
+    index: int,
+    call: BatchCall,
+    action_routes: Dict[str, ActionRoute],
+    semaphore: asyncio.Semaphore,
+    invoker: ActionInvoker = None,
+) -> BatchResult:
+    """
+    Runs one call of a batch. Failures are reported in the result instead of raised.
+    """
+    action_route = action_routes.get(call.action)
+    if action_route is None:
+        return BatchResult(index=index, action=call.action, ok=False, status_code=404, error=f"Action {call.action} not found")
+    if is_streaming_action(action_route.function):
+        return BatchResult(index=index, action=call.action, ok=False, status_code=400, error=f"Action {call.action} streams its results, call it directly")
+    try:
+        kwargs = validate_arguments(action_route, call.arguments)
+    except ValidationError as e:
+        return BatchResult(index=index, action=call.action, ok=False, status_code=422, error=json.loads(e.json()))
+
+    invoker = invoker or get_action_invoker()
+
+    def serialize(value):
+        # Validated and filtered like the action's route does, a cached entry may be served by the route next
+        return serialize_action_result(value, action_route.response_field)
+
+    try:
+        async with semaphore:
+            if get_cache_policy(action_route.function) is not None:
+                entry, _ = await get_action_cache().invoke(action_route.name, action_route.function, kwargs, invoker, serialize=serialize)
+                result = entry.value
+            else:
+                result = serialize(await invoke_action(action_route.name, action_route.function, kwargs, invoker))
+    except HTTPException as e:
+        return BatchResult(index=index, action=call.action, ok=False, status_code=e.status_code, error=e.detail)
+    except ResponseValidationError as e:
+        # The route answers a result not matching its response model with a 500
+        errors = [{"loc": list(error.get("loc", ())), "msg": error.get("msg"), "type": error.get("type")} for error in e.errors()]
+        logger.debug(f"Batch call {index} to {call.action} returned an invalid result: {errors}")
+        return BatchResult(index=index, action=call.action, ok=False, status_code=500, error=errors)
+    except Exception as e:
+        logger.debug(f"Batch call {index} to {call.action} failed: {e}")
+        return BatchResult(index=index, action=call.action, ok=False, status_code=500, error=str(e))
+    return BatchResult(index=index, action=call.action, ok=True, result=result)
+
+
+def _create_tasks(calls: List[BatchCall], action_routes: Dict[str, ActionRoute], max_concurrency: Optional[int]):
+    semaphore = asyncio.Semaphore(max(int(max_concurrency or DEFAULT_BATCH_MAX_CONCURRENCY), 1))
+    return [asyncio.ensure_future(run_call(index, call, action_routes, semaphore)) for index, call in enumerate(calls)]
+
+
+async def run_batch(calls: List[BatchCall], action_routes: Dict[str, ActionRoute], max_concurrency: int = None) -> List[BatchResult]:
+    """
+    Runs the calls concurrently, at most `max_concurrency` at a time, and returns their results in order.
+    """
+    return list(await asyncio.gather(*_create_tasks(calls, action_routes, max_concurrency)))
+
+
+async def iter_batch(calls: List[BatchCall], action_routes: Dict[str, ActionRoute], max_concurrency: int = None) -> AsyncIterator[BatchResult]:
+    """
+    Runs the calls like `run_batch` and yields each result as soon as its call completes.
+    """
+    tasks = _create_tasks(calls, action_routes, max_concurrency)
+    try:
+        for completed in asyncio.as_completed(tasks):
+            yield await completed
+    finally:
+        # The client went away, don't leave calls running for nobody
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,278 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+from iterative.service.action_management.service.coalesce_utils import get_coalesce_policy, get_single_flight
+from iterative.service.action_management.service.invoke_utils import get_action_invoker, make_call_key
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+CACHE_ATTRIBUTE = "__iterative_cache__"
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class CachePolicy(NamedTuple):
+    ttl: Optional[float]  # Seconds a result is reused, forever until invalidated if None
+    maxsize: Optional[int]  # Results kept for the action, unbounded if None
+    key: Optional[Callable[..., str]]  # Builds the cache key from the arguments, canonical JSON of them if None
+
+
+def cached_action(func: Callable = None, *, ttl: float = None, maxsize: int = 128, key: Callable[..., str] = None):
+    """
+    Marks an action whose results can be reused for identical arguments. The web app, the batch endpoint
+    and the CLI return the cached result instead of calling the action again.
+
+    Results are shared between callers, don't mutate them.
+
+    Args:
+        ttl (float, optional): Seconds a result stays valid. Defaults to until it is evicted or invalidated.
+        maxsize (int, optional): Most results kept for this action. Defaults to 128.
+        key (Callable, optional): Called with the action's arguments, returns the string results are cached
+            under. Defaults to the arguments serialized as canonical JSON.
+
+    Example:
+        @cached_action(ttl=60, key=lambda user_id, **_: user_id)
+        def get_user(user_id: str, verbose: bool = False) -> User:
+            ...
+
+        @cached_action
+        def list_countries() -> List[Country]:
+            ...
+    """
+    def decorator(func: Callable) -> Callable:
+        setattr(func, CACHE_ATTRIBUTE, CachePolicy(ttl, maxsize, key))
+        return func
+
+    return decorator(func) if func is not None else decorator
+
+
+def get_cache_policy(func: Callable) -> Optional[CachePolicy]:
+    for candidate in (func, getattr(func, "__wrapped__", None)):
+        policy = getattr(candidate, CACHE_ATTRIBUTE, None)
+        if policy is not None:
+            return policy
+    return None
+
+
+class CacheEntry:
+    __slots__ = ("key", "action", "value", "body", "etag", "size", "expires_at")
+
+    def __init__(self, key: str, action: str, value: Any, body: bytes, expires_at: Optional[float]):
+        self.key = key
+        self.action = action
+        self.value = value
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self.size = len(body)
+        self.expires_at = expires_at
+
+    def remaining_ttl(self, now: float = None) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - (now or time.monotonic()), 0.0)
+
+
+class ActionCacheStats:
+    __slots__ = ("hits", "misses", "evictions", "expirations", "invalidations")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        stats = {name: getattr(self, name) for name in self.__slots__}
+        stats["hit_rate"] = self.hits / lookups if lookups else 0.0
+        return stats
+
+
+class ActionResultCache:
+    """
+    Results of cached actions, keyed by action name and normalized arguments.
+
+    Entries are evicted least recently used first when an action holds more than its `maxsize` results
+    or all entries together take more than `max_bytes` once serialized.
+    """
+
+    def __init__(self, max_bytes: int = None):
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._action_keys: Dict[str, "OrderedDict[str, None]"] = {}
+        self._stats: Dict[str, ActionCacheStats] = {}
+        self.total_bytes = 0
+
+    def get_max_bytes(self) -> int:
+        if self.max_bytes is not None:
+            return self.max_bytes
+        from iterative.config import get_config
+
+        return get_config().get("action_cache_max_bytes") or DEFAULT_CACHE_MAX_BYTES
+
+    def make_key(self, action: str, policy: CachePolicy, kwargs: Dict[str, Any]) -> str:
+        return make_call_key(action, kwargs, policy.key)
+
+    def _action_stats(self, action: str) -> ActionCacheStats:
+        stats = self._stats.get(action)
+        if stats is None:
+            stats = self._stats[action] = ActionCacheStats()
+        return stats
+
+    def _remove(self, entry: CacheEntry):
+        del self._entries[entry.key]
+        self._action_keys[entry.action].pop(entry.key, None)
+        self.total_bytes -= entry.size
+
+    def get(self, key: str, action: str) -> Optional[CacheEntry]:
+        with self._lock:
+            stats = self._action_stats(action)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                self._remove(entry)
+                stats.expirations += 1
+                entry = None
+            if entry is None:
+                stats.misses += 1
+                return None
+            stats.hits += 1
+            self._entries.move_to_end(key)
+            self._action_keys[action].move_to_end(key)
+            return entry
+
+    def put(self, key: str, action: str, value: Any, policy: CachePolicy) -> CacheEntry:
+        from iterative.service.service_management.service.serializer import dumps
+
+        entry = CacheEntry(key, action, value, dumps(value), time.monotonic() + policy.ttl if policy.ttl else None)
+        max_bytes = self.get_max_bytes()
+        if entry.size > max_bytes:
+            # Too large to ever fit, serve it without keeping it
+            return entry
+
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                self._remove(previous)
+            self._entries[key] = entry
+            action_keys = self._action_keys.setdefault(action, OrderedDict())
+            action_keys[key] = None
+            self.total_bytes += entry.size
+
+            stats = self._action_stats(action)
+            while policy.maxsize is not None and len(action_keys) > policy.maxsize:
+                self._remove(self._entries[next(iter(action_keys))])
+                stats.evictions += 1
+            while self.total_bytes > max_bytes:
+                oldest = next(iter(self._entries.values()))
+                self._remove(oldest)
+                self._action_stats(oldest.action).evictions += 1
+        return entry
+
+    async def invoke(self, action: str, func: Callable, kwargs: Dict[str, Any], invoker=None,
+                     serialize: Callable[[Any], Any] = None) -> Tuple[CacheEntry, bool]:
+        """
+        Returns the cached entry for the call, calling the action through the invoker on a miss.
+
+        Args:
+            serialize (Callable, optional): Applied to the action's result before it is stored, e.g. to validate
+                it against a route's response model. Raising keeps the result out of the cache.
+
+        Returns:
+            Tuple[CacheEntry, bool]: The entry and whether it came from the cache.
+        """
+        policy = get_cache_policy(func)
+        key = self.make_key(action, policy, kwargs)
+        entry = self.get(key, action)
+        if entry is not None:
+            return entry, True
+        invoker = invoker or get_action_invoker()
+
+        async def compute() -> CacheEntry:
+            value = await invoker.invoke(func, **kwargs)
+            return self.put(key, action, serialize(value) if serialize is not None else value, policy)
+
+        if get_coalesce_policy(func) is not None:
+            # Concurrent misses for the same key share one execution and one entry
+            return await get_single_flight().do(action, key, compute), False
+        return await compute(), False
+
+    def call(self, action: str, func: Callable, kwargs: Dict[str, Any]) -> Any:
+        """
+        Synchronous counterpart of `invoke` for the CLI, calls the action in this thread on a miss.
+        """
+        policy = get_cache_policy(func)
+        key = self.make_key(action, policy, kwargs)
+        entry = self.get(key, action)
+        if entry is not None:
+            return entry.value
+        value = func(**kwargs)
+        if inspect.iscoroutine(value):
+            value = asyncio.run(value)
+        return self.put(key, action, value, policy).value
+
+    def invalidate(self, action: str = None, prefix: str = None) -> int:
+        """
+        Drop cached results, all of them, those of one action, and/or those whose key starts with `prefix`.
+        Keys are the action name, a colon and the normalized arguments, e.g. `get_user:{"user_id":"42"}`.
+
+        Returns:
+            int: The number of results dropped.
+        """
+        with self._lock:
+            entries = [
+                entry for entry in self._entries.values()
+                if (action is None or entry.action == action) and (prefix is None or entry.key.startswith(prefix))
+            ]
+            for entry in entries:
+                self._remove(entry)
+                self._action_stats(entry.action).invalidations += 1
+            return len(entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            totals = ActionCacheStats()
+            for stats in self._stats.values():
+                for name in ActionCacheStats.__slots__:
+                    setattr(totals, name, getattr(totals, name) + getattr(stats, name))
+            return {
+                **totals.to_dict(),
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.get_max_bytes(),
+                "actions": {
+                    action: {**stats.to_dict(), "entries": len(self._action_keys.get(action, ()))}
+                    for action, stats in sorted(self._stats.items())
+                },
+            }
+
+
+_action_cache = ActionResultCache()
+
+
+def get_action_cache() -> ActionResultCache:
+    return _action_cache
+
+
+def invalidate_action_cache(action: str = None, prefix: str = None) -> int:
+    """
+    Drop cached action results, see `ActionResultCache.invalidate`.
+    """
+    return _action_cache.invalidate(action, prefix)
+
+
+def create_cached_function(action: str, func: Callable) -> Callable:
+    """
+    Wraps a cached action for callers that call it directly, like the CLI, keeping its signature.
+    """
+    @functools.wraps(func)
+    def cached_function(**kwargs):
+        return _action_cache.call(action, func, kwargs)
+
+    return cached_function
@@ -0,0 +1,126 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+from iterative.service.action_management.service.invoke_utils import ActionInvoker, get_action_invoker, make_call_key
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+COALESCE_ATTRIBUTE = "__iterative_coalesce__"
+
+
+class CoalescePolicy(NamedTuple):
+    key: Optional[Callable[..., str]]  # Builds the call key from the arguments, canonical JSON of them if None
+
+
+def coalesce_calls(func: Callable = None, *, key: Callable[..., str] = None):
+    """
+    Marks an action whose concurrent identical calls share one execution. Callers that arrive while a call
+    with the same arguments is running wait for it and get its result, or its exception.
+
+    Example:
+        @coalesce_calls
+        def get_report(report_id: str) -> Report:
+            ...
+    """
+    def decorator(func: Callable) -> Callable:
+        setattr(func, COALESCE_ATTRIBUTE, CoalescePolicy(key))
+        return func
+
+    return decorator(func) if func is not None else decorator
+
+
+def get_coalesce_policy(func: Callable) -> Optional[CoalescePolicy]:
+    for candidate in (func, getattr(func, "__wrapped__", None)):
+        policy = getattr(candidate, COALESCE_ATTRIBUTE, None)
+        if policy is not None:
+            return policy
+    return None
+
+
+class FlightStats:
+    __slots__ = ("executions", "callers", "max_callers", "last_callers")
+
+    def __init__(self):
+        self.executions = 0
+        self.callers = 0
+        self.max_callers = 0
+        self.last_callers = 0
+
+    def record(self, callers: int):
+        self.executions += 1
+        self.callers += callers
+        self.max_callers = max(self.max_callers, callers)
+        self.last_callers = callers
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = {name: getattr(self, name) for name in self.__slots__}
+        stats["coalesced"] = self.callers - self.executions
+        return stats
+
+
+class _Flight:
+    __slots__ = ("task", "callers")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.callers = 0
+
+
+class SingleFlight:
+    """
+    Runs at most one execution per key at a time on each event loop and shares it with every caller.
+
+    The execution runs as its own task, so a caller that goes away doesn't cancel it for the others.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Tuple[int, str], _Flight] = {}
+        self._stats: Dict[str, FlightStats] = {}
+
+    async def do(self, action: str, key: str, call: Callable[[], Awaitable]) -> Any:
+        """
+        Awaits the in-flight execution for `key`, starting `call()` if there is none.
+        """
+        flight_key = (id(asyncio.get_running_loop()), key)
+        flight = self._flights.get(flight_key)
+        if flight is None:
+            flight = self._flights[flight_key] = _Flight(asyncio.ensure_future(call()))
+            flight.task.add_done_callback(lambda task: self._land(action, flight_key, flight))
+        flight.callers += 1
+        return await asyncio.shield(flight.task)
+
+    def _land(self, action: str, flight_key: Tuple[int, str], flight: _Flight):
+        if self._flights.get(flight_key) is flight:
+            del self._flights[flight_key]
+        if not flight.task.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            flight.task.exception()
+        self._stats.setdefault(action, FlightStats()).record(flight.callers)
+        if flight.callers > 1:
+            logger.debug(f"One execution of {action} served {flight.callers} callers")
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, Any]:
+        return {action: stats.to_dict() for action, stats in sorted(self._stats.items())}
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    return _single_flight
+
+
+async def invoke_action(action: str, func: Callable, kwargs: Dict[str, Any], invoker: ActionInvoker = None) -> Any:
+    """
+    Calls an action through the invoker, sharing the execution with identical concurrent calls if the
+    action is marked with `coalesce_calls`.
+    """
+    invoker = invoker or get_action_invoker()
+    policy = get_coalesce_policy(func)
+    if policy is None:
+        return await invoker.invoke(func, **kwargs)
+    key = make_call_key(action, kwargs, policy.key)
+    return await _single_flight.do(action, key, lambda: invoker.invoke(func, **kwargs))
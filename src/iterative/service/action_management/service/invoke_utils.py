@@ -0,0 +1,173 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+from iterative.service.telemetry_management.service.trace_utils import trace_span
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+# How an action is run when it is invoked from the web app
+EXECUTION_ATTRIBUTE = "__iterative_execution__"
+THREAD = "thread"
+PROCESS = "process"
+
+DEFAULT_ACTION_THREADS = 32
+
+
+def run_in_process(func: Callable) -> Callable:
+    """
+    Marks an action to run in the action process pool instead of a thread, for CPU bound work that would
+    otherwise hold the GIL. Its arguments and result must be picklable.
+
+    Example:
+        @run_in_process
+        def render_report(report_id: str) -> Report:
+            ...
+    """
+    setattr(func, EXECUTION_ATTRIBUTE, PROCESS)
+    return func
+
+
+def get_execution_mode(func: Callable) -> str:
+    """
+    Returns "process" for actions marked with `run_in_process`, "thread" otherwise.
+    """
+    for candidate in (func, getattr(func, "__wrapped__", None)):
+        mode = getattr(candidate, EXECUTION_ATTRIBUTE, None)
+        if mode:
+            return mode
+    return THREAD
+
+
+def make_call_key(action: str, kwargs: dict, key: Callable[..., str] = None) -> str:
+    """
+    Returns the key identifying a call: the action name, a colon and either `key(**kwargs)` or the
+    arguments serialized as canonical JSON, e.g. `get_user:{"user_id":"42"}`.
+    """
+    # Imported on use so the CLI doesn't load FastAPI for plain actions
+    from iterative.service.service_management.service.json_encoder import CustomEncoder
+
+    if key is not None:
+        normalized = str(key(**kwargs))
+    else:
+        normalized = json.dumps(kwargs, sort_keys=True, separators=(",", ":"), cls=CustomEncoder)
+    return f"{action}:{normalized}"
+
+
+def _call_in_process(file_path: str, name: str, args: tuple, kwargs: dict):
+    # Functions of user modules can't be pickled by reference, the worker loads them from their file
+    from iterative.service.project_management.service.project_utils import load_module_from_path
+
+    func = getattr(load_module_from_path(file_path), name)
+    result = func(*args, **kwargs)
+    if inspect.iscoroutine(result):
+        result = asyncio.run(result)
+    return result
+
+
+class ActionInvoker:
+    """
+    Runs actions without blocking the event loop.
+
+    Coroutine functions are awaited on the loop, synchronous actions run in a bounded thread pool and
+    actions marked with `run_in_process` in a process pool. Both pools are created on first use.
+    """
+
+    def __init__(self, threads: int = None, processes: int = None):
+        self.threads = threads
+        self.processes = processes
+        self._lock = threading.Lock()
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                threads = self.threads or get_action_threads()
+                self._thread_pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="iterative-action")
+            return self._thread_pool
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.processes or get_action_processes())
+            return self._process_pool
+
+    async def invoke(self, func: Callable, *args, **kwargs):
+        """
+        Call an action and return its result.
+
+        Args:
+            func (Callable): The action's function.
+            *args, **kwargs: The arguments to call it with.
+        """
+        original_func = getattr(func, "__wrapped__", func)
+        loop = asyncio.get_running_loop()
+        mode = get_execution_mode(func)
+
+        with trace_span(f"execute {original_func.__name__}", **{"iterative.execution": mode}):
+            if mode == PROCESS:
+                call = functools.partial(_call_in_process, inspect.getfile(original_func), original_func.__name__, args, kwargs)
+                return await loop.run_in_executor(self._get_process_pool(), call)
+
+            if inspect.iscoroutinefunction(original_func):
+                return await original_func(*args, **kwargs)
+
+            # Run in a copy of the caller's context, so spans of nested calls land in the caller's trace
+            call = functools.partial(contextvars.copy_context().run, original_func, *args, **kwargs)
+            result = await loop.run_in_executor(self._get_thread_pool(), call)
+            # Sync wrappers around async functions hand back a coroutine
+            if inspect.iscoroutine(result):
+                result = await result
+            return result
+
+    async def run_in_thread(self, func: Callable, *args):
+        """
+        Runs a blocking call in the action thread pool and returns its result.
+        """
+        call = functools.partial(contextvars.copy_context().run, func, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._get_thread_pool(), call)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the pools. They are created again, with the current config, on the next invocation.
+        """
+        with self._lock:
+            thread_pool, self._thread_pool = self._thread_pool, None
+            process_pool, self._process_pool = self._process_pool, None
+        if thread_pool is not None:
+            thread_pool.shutdown(wait=wait)
+        if process_pool is not None:
+            process_pool.shutdown(wait=wait)
+
+
+def get_action_threads() -> int:
+    """
+    Returns the size of the thread pool for synchronous actions from the `action_threads` config value.
+    """
+    from iterative.config import get_config
+
+    return max(int(get_config().get("action_threads") or DEFAULT_ACTION_THREADS), 1)
+
+
+def get_action_processes() -> Optional[int]:
+    """
+    Returns the size of the process pool from the `action_processes` config value, None for all cores.
+    """
+    from iterative.config import get_config
+
+    processes = get_config().get("action_processes")
+    return max(int(processes), 1) if processes else None
+
+
+_invoker = ActionInvoker()
+
+
+def get_action_invoker() -> ActionInvoker:
+    return _invoker
+
@@ -0,0 +1,127 @@
+import asyncio
+import functools
+import inspect
+import sys
+from typing import Any, AsyncIterator, Callable, Dict, TextIO
+from iterative.service.action_management.service.invoke_utils import ActionInvoker, get_action_invoker
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+_DONE = object()
+
+
+def is_streaming_action(func: Callable) -> bool:
+    """
+    Returns True for generator and async generator actions, whose items are streamed as they are produced.
+    """
+    original_func = getattr(func, "__wrapped__", func)
+    return inspect.isgeneratorfunction(original_func) or inspect.isasyncgenfunction(original_func)
+
+
+def is_stream(value: Any) -> bool:
+    return inspect.isgenerator(value) or inspect.isasyncgen(value)
+
+
+async def iter_action_items(func: Callable, kwargs: Dict[str, Any], invoker: ActionInvoker = None) -> AsyncIterator[Any]:
+    """
+    Yields the items of a generator action one at a time, producing the next one only once the previous
+    one was consumed. Sync generators advance in the action thread pool so they never block the event loop.
+    The generator is closed when iteration stops early, e.g. because the client disconnected.
+    """
+    original_func = getattr(func, "__wrapped__", func)
+    if inspect.isasyncgenfunction(original_func):
+        items = original_func(**kwargs)
+        try:
+            async for item in items:
+                yield item
+        finally:
+            await items.aclose()
+        return
+
+    invoker = invoker or get_action_invoker()
+    items = await invoker.run_in_thread(lambda: original_func(**kwargs))
+    try:
+        while True:
+            item = await invoker.run_in_thread(next, items, _DONE)
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        # Runs the generator's cleanup in a thread too, it may block
+        await invoker.run_in_thread(items.close)
+
+
+def choose_media_type(accept: str = None) -> str:
+    """
+    Returns Server-Sent Events if the Accept header asks for them, NDJSON otherwise.
+    """
+    if accept and SSE_MEDIA_TYPE in accept:
+        return SSE_MEDIA_TYPE
+    return NDJSON_MEDIA_TYPE
+
+
+async def encode_stream(items: AsyncIterator[Any], media_type: str) -> AsyncIterator[bytes]:
+    """
+    Encodes each item as an NDJSON line or an SSE `data` event. An error raised by the action is sent as
+    a last `{"error": ...}` line, or an `error` event, since the status code was already sent.
+    """
+    from iterative.service.service_management.service.serializer import dumps
+
+    try:
+        async for item in items:
+            if media_type == SSE_MEDIA_TYPE:
+                yield b"data: " + dumps(item) + b"\n\n"
+            else:
+                yield dumps(item) + b"\n"
+    except Exception as e:
+        logger.exception("Streaming action failed")
+        error = dumps({"error": str(e)})
+        yield b"event: error\ndata: " + error + b"\n\n" if media_type == SSE_MEDIA_TYPE else error + b"\n"
+
+
+def print_stream(items, out: TextIO = None):
+    """
+    Prints the items of a generator or async generator one per line as they are produced, strings as they
+    are and anything else as JSON, so the output never has to fit in memory.
+    """
+    out = out or sys.stdout
+
+    def print_item(item):
+        if isinstance(item, str):
+            out.write(item + "\n")
+        else:
+            from iterative.service.service_management.service.serializer import dumps
+
+            out.write(dumps(item).decode("utf-8") + "\n")
+
+    if inspect.isasyncgen(items):
+        async def consume():
+            try:
+                async for item in items:
+                    print_item(item)
+            finally:
+                await items.aclose()
+
+        asyncio.run(consume())
+    else:
+        try:
+            for item in items:
+                print_item(item)
+        finally:
+            items.close()
+    out.flush()
+
+
+def create_streaming_command(func: Callable) -> Callable:
+    """
+    Wraps a generator action for the CLI so its command prints the items as they are produced.
+    """
+    @functools.wraps(func)
+    def streaming_command(**kwargs):
+        print_stream(func(**kwargs))
+
+    return streaming_command
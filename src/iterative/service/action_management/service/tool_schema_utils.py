@@ -0,0 +1,160 @@
+import inspect
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+from pydantic import create_model
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+DEFAULT_DESCRIPTION = "No description provided"
+
+# `name (type): description` or `name: description` lines of a docstring's Args section
+_ARGUMENT_LINE = re.compile(r"^\s*\*{0,2}(\w+)\s*(?:\([^)]*\))?\s*:\s*(.*)$")
+_SECTION_LINE = re.compile(r"^\s*(Args|Arguments|Parameters|Returns|Raises|Yields|Example|Examples|Note|Notes)\s*:\s*$")
+
+
+def parse_docstring(doc: Optional[str]) -> Tuple[str, Dict[str, str]]:
+    """
+    Splits a docstring into its description and the descriptions of the arguments in its Args section.
+    """
+    if not doc:
+        return "", {}
+    description_lines: List[str] = []
+    arguments: Dict[str, str] = {}
+    section = None
+    current = None
+    for line in inspect.cleandoc(doc).splitlines():
+        section_match = _SECTION_LINE.match(line)
+        if section_match:
+            section = section_match.group(1)
+            current = None
+            continue
+        if section is None:
+            description_lines.append(line)
+        elif section in ("Args", "Arguments", "Parameters"):
+            argument_match = _ARGUMENT_LINE.match(line)
+            if argument_match and len(line) - len(line.lstrip()) <= 4:
+                current = argument_match.group(1)
+                arguments[current] = argument_match.group(2).strip()
+            elif current and line.strip():
+                # Continuation of the previous argument's description
+                arguments[current] = f"{arguments[current]} {line.strip()}".strip()
+    return "\n".join(description_lines).strip(), arguments
+
+
+def _is_framework_parameter(parameter: inspect.Parameter) -> bool:
+    # Requests, responses and dependencies are filled in by FastAPI on API routes, not passed by the caller
+    if hasattr(parameter.default, "dependency"):
+        return True
+    module = getattr(parameter.annotation, "__module__", "") or ""
+    return inspect.isclass(parameter.annotation) and module.split(".")[0] in ("starlette", "fastapi")
+
+
+def _clean_property(schema: Dict[str, Any]) -> Dict[str, Any]:
+    schema.pop("title", None)
+    for key in ("anyOf", "allOf", "oneOf"):
+        for option in schema.get(key, ()):
+            option.pop("title", None)
+    return schema
+
+
+def compile_tool_schema(name: str, func: Callable) -> Dict[str, Any]:
+    """
+    Returns the function tool describing an action, its parameters as JSON Schema.
+
+    Lists, dicts, enums, Optional and Pydantic models are described fully, models and enums through `$defs`.
+    Parameter descriptions come from the Args section of the docstring.
+    """
+    original_func = getattr(func, "__wrapped__", func)
+    signature = inspect.signature(original_func)
+    description, argument_descriptions = parse_docstring(inspect.getdoc(original_func))
+
+    fields: Dict[str, Any] = {}
+    unannotated = set()
+    for parameter in signature.parameters.values():
+        if parameter.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+            continue
+        if _is_framework_parameter(parameter):
+            continue
+        if parameter.annotation is inspect.Parameter.empty:
+            unannotated.add(parameter.name)
+        annotation = Any if parameter.annotation is inspect.Parameter.empty else parameter.annotation
+        default = ... if parameter.default is inspect.Parameter.empty else parameter.default
+        fields[parameter.name] = (annotation, default)
+
+    arguments_model = create_model(f"{name}_arguments", **fields)
+    # `model_json_schema` on Pydantic 2, `schema` on Pydantic 1
+    schema = getattr(arguments_model, "model_json_schema", arguments_model.schema)()
+
+    properties = {}
+    for parameter_name, property_schema in schema.get("properties", {}).items():
+        property_schema = _clean_property(dict(property_schema))
+        if parameter_name in unannotated:
+            # Like the web app, which receives unannotated arguments as query strings
+            property_schema.setdefault("type", "string")
+        property_schema["description"] = argument_descriptions.get(parameter_name) or property_schema.get("description") or parameter_name
+        properties[parameter_name] = property_schema
+
+    parameters: Dict[str, Any] = {"type": "object", "properties": properties, "required": schema.get("required", [])}
+    for definitions_key in ("$defs", "definitions"):
+        if schema.get(definitions_key):
+            parameters[definitions_key] = schema[definitions_key]
+
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description or DEFAULT_DESCRIPTION,
+            "parameters": parameters,
+        },
+    }
+
+
+class ToolSchemaCompiler:
+    """
+    Compiles action signatures to function tools, once per function.
+
+    Entries are keyed by the function object, so reloading an action's module, which creates new
+    function objects, compiles them again and lets the old entries be garbage collected.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools: "WeakKeyDictionary[Callable, Dict[str, Dict[str, Any]]]" = WeakKeyDictionary()
+        self.compiled = 0
+
+    def compile(self, name: str, func: Callable) -> Dict[str, Any]:
+        """
+        Returns the function tool for the action, compiling it on first use. Don't mutate it, it is shared.
+        """
+        try:
+            tools = self._tools.get(func)
+        except TypeError:
+            # Not weak referenceable, e.g. a builtin
+            return compile_tool_schema(name, func)
+        tool = tools.get(name) if tools is not None else None
+        if tool is None:
+            tool = compile_tool_schema(name, func)
+            with self._lock:
+                self._tools.setdefault(func, {})[name] = tool
+                self.compiled += 1
+        return tool
+
+    def invalidate(self, func: Callable = None):
+        """
+        Forget the compiled tools of a function, or of every function.
+        """
+        with self._lock:
+            if func is None:
+                self._tools.clear()
+            else:
+                self._tools.pop(func, None)
+
+
+_compiler = ToolSchemaCompiler()
+
+
+def get_tool_schema_compiler() -> ToolSchemaCompiler:
+    return _compiler
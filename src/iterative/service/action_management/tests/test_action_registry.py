@@ -0,0 +1,79 @@
+from iterative.service.action_management.service.action_registry import API, DEFAULT, PROJECT, ActionRegistry
+
+
+def greet(name: str) -> str:
+    return f"Hello {name}"
+
+
+def default_greet(name: str) -> str:
+    return f"Hi {name}"
+
+
+def get_user(user_id: str):
+    return user_id
+
+
+def getUser(user_id: str):
+    return user_id
+
+
+def make_registry(calls):
+    def loader(source, actions):
+        def load():
+            calls.append(source)
+            return actions
+        return load
+
+    return ActionRegistry({
+        PROJECT: loader(PROJECT, [("greet", greet, "actions/greet.py", "Project Actions"),
+                                  ("get_user", get_user, "actions/users.py", "Project Actions")]),
+        DEFAULT: loader(DEFAULT, [("greet", default_greet, "defaults/greet.py", "Iterative Defaults")]),
+        API: loader(API, [("get-user", getUser, "api/users.py", "API")]),
+    })
+
+
+def test_views_discover_each_source_once():
+    calls = []
+    registry = make_registry(calls)
+
+    project_and_defaults = registry.view([PROJECT, DEFAULT])
+    assert project_and_defaults["greet"].get_function() is greet
+    assert registry.view([DEFAULT, PROJECT]) is project_and_defaults
+    assert registry.view([DEFAULT])["greet"].get_function() is default_greet
+    assert calls == [PROJECT, DEFAULT]
+
+
+def test_indexes():
+    registry = make_registry([])
+    assert registry.get("greet").source == PROJECT
+    assert registry.get_by_snake_name("get_user").get_function() is get_user
+    assert [entry.name for entry in registry.in_category("Project Actions")] == ["greet", "get_user"]
+    assert [entry.name for entry in registry.in_file("api/users.py")] == ["get-user"]
+    assert registry.get("missing") is None
+    assert len(registry) == 4
+
+
+def test_collisions_are_reported():
+    registry = make_registry([])
+    registry.view([PROJECT, DEFAULT, API])
+    collisions = {(collision.kind, collision.key): collision for collision in registry.collisions()}
+    assert collisions[("name", "greet")].dropped.source == DEFAULT
+    assert collisions[("snake_name", "get_user")].dropped.name == "get-user"
+    assert len(collisions) == 2
+
+
+def test_invalidate_rediscovers_and_bumps_the_generation():
+    calls = []
+    registry = make_registry(calls)
+    view = registry.view([PROJECT])
+    registry.invalidate()
+    assert registry.generation == 1
+    assert registry.view([PROJECT]) is not view
+    assert calls == [PROJECT, PROJECT]
+
+
+def test_entries_convert_to_actions():
+    registry = make_registry([])
+    action = registry.get("greet").to_action()
+    assert action.get_name() == "greet"
+    assert action.get_file() == "actions/greet.py"
@@ -0,0 +1,86 @@
+import inspect
+import sys
+from typing import Optional
+import pytest
+from iterative.service.action_management.service.action_spec_utils import (
+    StaticSpecUnavailable,
+    create_lazy_function,
+    extract_action_specs_from_source,
+)
+
+ACTIONS_SOURCE = '''
+from typing import Optional
+from logging import getLogger as _getLogger
+
+def greet(name: str, times: int = 2, loud: Optional[bool] = None):
+    """Greets someone."""
+    return [name.upper() if loud else name] * times
+
+def _helper():
+    pass
+'''
+
+
+def test_extract_action_specs_reads_signature_and_docstring():
+    [spec] = extract_action_specs_from_source(ACTIONS_SOURCE, "greet_actions.py", "Project Actions")
+
+    assert spec.name == "greet"
+    assert spec.docstring == "Greets someone."
+    assert [(p.name, p.annotation, p.default, p.has_default) for p in spec.parameters] == [
+        ("name", "str", None, False),
+        ("times", "int", 2, True),
+        ("loud", "Optional[bool]", None, True),
+    ]
+
+
+@pytest.mark.parametrize("source", [
+    "@decorator\ndef action(): pass\n",
+    "def action(when=time.time()): pass\n",
+    "def action(user: User): pass\n",
+    "from helpers import shared_action\n",
+])
+def test_extract_action_specs_needs_import(source):
+    with pytest.raises(StaticSpecUnavailable):
+        extract_action_specs_from_source(source, "x_actions.py", "Project Actions")
+
+
+def test_lazy_function_imports_module_on_call(tmp_path):
+    actions_file = tmp_path / "greet_actions.py"
+    actions_file.write_text(ACTIONS_SOURCE)
+    [spec] = extract_action_specs_from_source(ACTIONS_SOURCE, str(actions_file), "Project Actions")
+
+    function = create_lazy_function(spec)
+    signature = inspect.signature(function)
+    assert list(signature.parameters) == ["name", "times", "loud"]
+    assert signature.parameters["loud"].annotation == Optional[bool]
+    assert function.__doc__ == "Greets someone."
+    assert not any(getattr(m, "__file__", None) == str(actions_file) for m in list(sys.modules.values()))
+
+    assert function(name="ada", times=1, loud=True) == ["ADA"]
+
+
+CACHED_SOURCE = '''
+import iterative
+
+calls = []
+
+def lookup(user_id: str):
+    calls.append(user_id)
+    return {"user_id": user_id}
+
+lookup = iterative.cached_action(lookup)
+'''
+
+
+def test_lazy_function_applies_the_cache_policy(tmp_path):
+    from iterative.service.action_management.service.cache_utils import get_action_cache
+    from iterative.service.project_management.service.project_utils import load_module_from_path
+
+    actions_file = tmp_path / "lookup_actions.py"
+    actions_file.write_text(CACHED_SOURCE)
+    [spec] = extract_action_specs_from_source(CACHED_SOURCE, str(actions_file), "Project Actions")
+    get_action_cache().invalidate("lookup")
+
+    function = create_lazy_function(spec)
+    assert function(user_id="1") == function(user_id="1") == {"user_id": "1"}
+    assert load_module_from_path(str(actions_file)).calls == ["1"]
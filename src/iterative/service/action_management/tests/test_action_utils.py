@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+from iterative.service.action_management.service import action_utils
+
+
+class _Config:
+    version = object()
+
+    def get(self, key, default=None):
+        return {"let_ai_use_apis": True}.get(key, default)
+
+
+def test_api_tools_are_named_after_their_path(monkeypatch):
+    router = APIRouter()
+
+    @router.get("/users/{user_id}")
+    def read_user(user_id: str) -> dict:
+        return {"user_id": user_id}
+
+    @router.get("/")
+    def root() -> dict:
+        return {}
+
+    monkeypatch.setattr(action_utils, "get_config", lambda: _Config())
+    monkeypatch.setattr(action_utils, "get_configured_actions", lambda: ({}, {}))
+    monkeypatch.setattr(action_utils, "find_api_routers_in_parent_project", lambda: {"project": [{"router": router}]})
+    monkeypatch.setattr(action_utils, "_tool_list", (None, []))
+
+    assert [tool["function"]["name"] for tool in action_utils.get_actions()] == ["users{user_id}"]
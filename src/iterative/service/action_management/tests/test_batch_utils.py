@@ -0,0 +1,131 @@
+import asyncio
+import json
+import time
+from fastapi import FastAPI
+from pydantic import BaseModel
+from starlette.requests import Request
+from iterative.service.action_management.api.batch_api import run_actions_batch
+from iterative.service.action_management.models.action import Action
+from iterative.service.action_management.models.batch import BatchCall, BatchRequest
+from iterative.service.action_management.service.batch_utils import get_action_routes, run_batch
+from iterative.web_app_integration import integrate_actions_into_web_app, replace_actions_in_web_app
+
+
+def add(a: int, b: int = 1) -> int:
+    return a + b
+
+
+async def nap(seconds: float) -> float:
+    await asyncio.sleep(seconds)
+    return seconds
+
+
+def fail() -> None:
+    raise RuntimeError("boom")
+
+
+class User(BaseModel):
+    user_id: str
+
+
+class UserInDB(User):
+    password_hash: str
+
+
+def get_user(user_id: str) -> User:
+    if user_id == "broken":
+        return {"name": "no user_id"}
+    return UserInDB(user_id=user_id, password_hash="secret")
+
+
+def _web_app(*functions):
+    web_app = FastAPI()
+    actions = [Action(name=f.__name__, function=f, file_path=__file__, category="Project Actions") for f in functions]
+    integrate_actions_into_web_app(actions, web_app)
+    return web_app
+
+
+def test_run_batch_validates_and_keeps_order():
+    action_routes = get_action_routes(_web_app(add, nap, fail))
+    calls = [
+        BatchCall(action="nap", arguments={"seconds": 0.05}),
+        BatchCall(action="add", arguments={"a": "2"}),
+        BatchCall(action="add", arguments={"a": "two"}),
+        BatchCall(action="missing"),
+        BatchCall(action="fail"),
+    ]
+
+    results = asyncio.run(run_batch(calls, action_routes))
+
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert (results[0].ok, results[0].result) == (True, 0.05)
+    assert (results[1].ok, results[1].result) == (True, 3)
+    assert (results[2].ok, results[2].status_code) == (False, 422)
+    assert results[2].error[0]["loc"] == ["a"]
+    assert results[3].status_code == 404
+    assert (results[4].status_code, results[4].error) == (500, "boom")
+
+
+def test_run_batch_applies_the_response_model():
+    calls = [BatchCall(action="get_user", arguments={"user_id": "7"}), BatchCall(action="get_user", arguments={"user_id": "broken"})]
+
+    results = asyncio.run(run_batch(calls, get_action_routes(_web_app(get_user))))
+
+    assert (results[0].ok, json.loads(results[0].model_dump_json())["result"]) == (True, {"user_id": "7"})
+    assert (results[1].ok, results[1].status_code) == (False, 500)
+    assert results[1].error[0]["loc"] == ["response", "user_id"]
+
+
+def test_run_batch_limits_fan_out():
+    action_routes = get_action_routes(_web_app(nap))
+    calls = [BatchCall(action="nap", arguments={"seconds": 0.05}) for _ in range(4)]
+
+    start = time.perf_counter()
+    asyncio.run(run_batch(calls, action_routes, max_concurrency=4))
+    concurrent = time.perf_counter() - start
+    start = time.perf_counter()
+    asyncio.run(run_batch(calls, action_routes, max_concurrency=1))
+    sequential = time.perf_counter() - start
+
+    assert concurrent < 0.15 <= sequential
+
+
+def test_action_routes_follow_replaced_actions():
+    web_app = _web_app(add)
+    assert set(get_action_routes(web_app)) == {"add"}
+    replace_actions_in_web_app([Action(name="nap", function=nap, file_path=__file__, category="Project Actions")], web_app)
+    assert set(get_action_routes(web_app)) == {"nap"}
+
+
+def test_action_routes_are_rebuilt_for_a_list_reusing_the_id_of_the_old_one():
+    web_app = _web_app(add)
+    get_action_routes(web_app)
+    old_id = id(web_app.router.routes)
+    replace_actions_in_web_app([Action(name="nap", function=nap, file_path=__file__, category="Project Actions")], web_app)
+
+    # Freed lists are reused, the swapped in list may well get the id of the one the table was built from
+    candidates = []
+    for _ in range(1000):
+        routes = [*web_app.router.routes]
+        if id(routes) == old_id:
+            break
+        candidates.append(routes)
+    web_app.router.routes = routes
+    assert set(get_action_routes(web_app)) == {"nap"}
+
+
+def test_batch_endpoint_streams_ndjson():
+    web_app = _web_app(add, nap)
+    request = Request({"type": "http", "app": web_app, "headers": []})
+    batch = BatchRequest(stream=True, calls=[
+        BatchCall(action="nap", arguments={"seconds": 0.05}),
+        BatchCall(action="add", arguments={"a": 1}),
+    ])
+
+    async def read():
+        response = await run_actions_batch(batch, request)
+        return [json.loads(line) async for line in response.body_iterator]
+
+    lines = asyncio.run(read())
+    # The quick call completes first
+    assert [(line["index"], line["result"]) for line in lines] == [(1, 2), (0, 0.05)]
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.exceptions import ResponseValidationError
+from pydantic import BaseModel
+from starlette.requests import Request
+from typer import Typer
+from iterative.cli_app_integration import integrate_actions_into_cli_app
+from iterative.service.action_management.models.action import Action
+from iterative.service.action_management.service.cache_utils import ActionResultCache, cached_action, get_action_cache, get_cache_policy
+from iterative.web_app_integration import integrate_actions_into_web_app
+
+calls = []
+
+
+@cached_action(ttl=60, maxsize=2)
+def lookup(user_id: str, verbose: bool = False) -> dict:
+    calls.append(user_id)
+    return {"user_id": user_id, "verbose": verbose}
+
+
+def _call_route(web_app, name, headers=None, **kwargs):
+    [route] = [route for route in web_app.routes if getattr(route, "path", None) == f"/{name}"]
+    raw_headers = [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()]
+    request = Request({"type": "http", "app": web_app, "headers": raw_headers})
+    return asyncio.run(route.endpoint(_iterative_request=request, **kwargs))
+
+
+def test_cache_counts_hits_and_evicts_least_recently_used():
+    cache = ActionResultCache(max_bytes=1024)
+    calls.clear()
+
+    assert cache.call("lookup", lookup, {"user_id": "1"}) == {"user_id": "1", "verbose": False}
+    cache.call("lookup", lookup, {"user_id": "1"})
+    cache.call("lookup", lookup, {"user_id": "2"})
+    cache.call("lookup", lookup, {"user_id": "1"})
+    cache.call("lookup", lookup, {"user_id": "3"})  # Over maxsize, 2 is the least recently used
+    cache.call("lookup", lookup, {"user_id": "1"})
+    cache.call("lookup", lookup, {"user_id": "2"})
+
+    assert calls == ["1", "2", "3", "2"]
+    stats = cache.stats()["actions"]["lookup"]
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (3, 4, 2, 2)
+
+
+def test_cache_bounds_bytes_and_expires():
+    cache = ActionResultCache(max_bytes=60)
+    cache.call("lookup", lookup, {"user_id": "a"})
+    cache.call("lookup", lookup, {"user_id": "b"})
+    assert cache.total_bytes <= 60
+    assert cache.stats()["entries"] == 1
+
+    @cached_action(ttl=0.01)
+    def now() -> float:
+        return time.monotonic()
+
+    first = cache.call("now", now, {})
+    time.sleep(0.02)
+    assert cache.call("now", now, {}) != first
+    assert cache.stats()["actions"]["now"]["expirations"] == 1
+
+
+def test_invalidate_by_action_and_prefix():
+    cache = ActionResultCache(max_bytes=4096)
+    for user_id in ("1", "2"):
+        cache.call("lookup", lookup, {"user_id": user_id})
+    assert cache.invalidate(prefix='lookup:{"user_id":"1"') == 1
+    assert cache.invalidate(action="lookup") == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_web_endpoint_serves_cached_results_with_etags():
+    get_action_cache().invalidate()
+    calls.clear()
+    web_app = FastAPI()
+    integrate_actions_into_web_app([Action(name="lookup", function=lookup, file_path=__file__, category="Project Actions")], web_app)
+
+    response = _call_route(web_app, "lookup", user_id="7", verbose=False)
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("max-age=")
+    etag = response.headers["etag"]
+
+    not_modified = _call_route(web_app, "lookup", {"If-None-Match": etag}, user_id="7", verbose=False)
+    assert not_modified.status_code == 304
+    assert calls == ["7"]
+    parameters = web_app.openapi()["paths"]["/lookup"]["get"]["parameters"]
+    assert [parameter["name"] for parameter in parameters] == ["user_id", "verbose"]
+
+
+def test_cli_commands_go_through_the_cache():
+    get_action_cache().invalidate()
+    calls.clear()
+    cli_app = Typer()
+    integrate_actions_into_cli_app([Action(name="lookup", function=lookup, file_path=__file__, category="Project Actions")], cli_app)
+    command = cli_app.registered_commands[0].callback
+
+    command(user_id="9", verbose=False)
+    command(user_id="9", verbose=False)
+    assert calls == ["9"]
+
+
+class User(BaseModel):
+    user_id: str
+
+
+class UserInDB(User):
+    password_hash: str
+
+
+@cached_action
+def get_user(user_id: str) -> User:
+    if user_id == "broken":
+        return {"name": "no user_id"}
+    return UserInDB(user_id=user_id, password_hash="secret")
+
+
+def test_cached_endpoint_stores_results_validated_against_the_response_model():
+    assert get_cache_policy(get_user).ttl is None
+    get_action_cache().invalidate()
+    web_app = FastAPI()
+    integrate_actions_into_web_app([Action(name="get_user", function=get_user, file_path=__file__, category="Project Actions")], web_app)
+
+    response = _call_route(web_app, "get_user", user_id="7")
+    assert json.loads(response.body) == {"user_id": "7"}
+    assert get_action_cache().call("get_user", get_user, {"user_id": "7"}) == {"user_id": "7"}
+
+    with pytest.raises(ResponseValidationError):
+        _call_route(web_app, "get_user", user_id="broken")
+    assert get_action_cache().stats()["actions"]["get_user"]["entries"] == 1
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+import pytest
+from iterative.service.action_management.service.cache_utils import ActionResultCache, cached_action
+from iterative.service.action_management.service.coalesce_utils import SingleFlight, coalesce_calls, invoke_action, get_single_flight
+from iterative.service.action_management.service.invoke_utils import ActionInvoker
+
+executions = []
+lock = threading.Lock()
+
+
+@coalesce_calls
+def slow_lookup(key: str) -> str:
+    with lock:
+        executions.append(key)
+    time.sleep(0.1)
+    return key.upper()
+
+
+@coalesce_calls
+async def failing_lookup(key: str) -> str:
+    executions.append(key)
+    await asyncio.sleep(0.05)
+    raise LookupError(key)
+
+
+def test_identical_concurrent_sync_calls_share_one_execution():
+    executions.clear()
+    invoker = ActionInvoker(threads=4)
+
+    async def main():
+        return await asyncio.gather(
+            *(invoke_action("slow_lookup", slow_lookup, {"key": "a"}, invoker) for _ in range(5)),
+            invoke_action("slow_lookup", slow_lookup, {"key": "b"}, invoker),
+        )
+
+    assert asyncio.run(main()) == ["A"] * 5 + ["B"]
+    invoker.shutdown()
+    assert sorted(executions) == ["a", "b"]
+    assert get_single_flight().stats()["slow_lookup"]["max_callers"] == 5
+
+
+def test_async_exceptions_reach_every_caller():
+    executions.clear()
+
+    async def main():
+        return await asyncio.gather(
+            *(invoke_action("failing_lookup", failing_lookup, {"key": "x"}) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, LookupError) for result in results)
+    assert executions == ["x"]
+    assert get_single_flight().in_flight() == 0
+
+
+def test_a_cancelled_caller_does_not_cancel_the_shared_execution():
+    single_flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def main():
+        first = asyncio.ensure_future(single_flight.do("work", "work:{}", work))
+        second = asyncio.ensure_future(single_flight.do("work", "work:{}", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == 42
+    assert single_flight.stats()["work"]["last_callers"] == 2
+
+
+def test_cached_misses_are_coalesced():
+    executions.clear()
+    cache = ActionResultCache(max_bytes=1024)
+
+    @cached_action(ttl=60)
+    @coalesce_calls
+    async def profile(user_id: str) -> dict:
+        executions.append(user_id)
+        await asyncio.sleep(0.05)
+        return {"user_id": user_id}
+
+    async def main():
+        return await asyncio.gather(*(cache.invoke("profile", profile, {"user_id": "1"}) for _ in range(4)))
+
+    results = asyncio.run(main())
+    assert executions == ["1"]
+    assert len({id(entry) for entry, _ in results}) == 1
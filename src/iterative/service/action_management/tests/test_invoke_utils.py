@@ -0,0 +1,74 @@
+import asyncio
+import os
+import threading
+import time
+from iterative.service.action_management.service.invoke_utils import ActionInvoker, get_execution_mode, run_in_process
+from iterative.service.project_management.service.project_utils import load_module_from_path
+
+PROCESS_ACTIONS_SOURCE = '''
+import os
+from iterative.service.action_management.service.invoke_utils import run_in_process
+
+
+@run_in_process
+def square(value: int) -> dict:
+    return {"value": value * value, "pid": os.getpid()}
+'''
+
+
+def test_async_actions_are_awaited():
+    async def greet(name: str) -> str:
+        await asyncio.sleep(0)
+        return f"hello {name}"
+
+    assert asyncio.run(ActionInvoker(threads=1).invoke(greet, name="ada")) == "hello ada"
+
+
+def test_sync_actions_do_not_block_the_event_loop():
+    invoker = ActionInvoker(threads=2)
+
+    def slow_action() -> int:
+        time.sleep(0.2)
+        return threading.get_ident()
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        idents = await asyncio.gather(invoker.invoke(slow_action), invoker.invoke(slow_action))
+        ticking.cancel()
+        return ticks, idents
+
+    start = time.perf_counter()
+    ticks, idents = asyncio.run(main())
+    invoker.shutdown()
+    assert ticks > 5
+    assert time.perf_counter() - start < 0.35
+    assert threading.get_ident() not in idents
+
+
+def test_actions_marked_run_in_process_run_in_the_process_pool(tmp_path):
+    actions_file = tmp_path / "math_actions.py"
+    actions_file.write_text(PROCESS_ACTIONS_SOURCE)
+    square = load_module_from_path(str(actions_file)).square
+    assert get_execution_mode(square) == "process"
+
+    invoker = ActionInvoker(processes=1)
+    result = asyncio.run(invoker.invoke(square, value=7))
+    invoker.shutdown()
+    assert result["value"] == 49
+    assert result["pid"] != os.getpid()
+
+
+def test_run_in_process_keeps_the_function():
+    def action():
+        pass
+
+    assert run_in_process(action) is action
+    assert get_execution_mode(lambda: None) == "thread"
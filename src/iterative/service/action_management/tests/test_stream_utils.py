@@ -0,0 +1,82 @@
+import asyncio
+import io
+import json
+from typing import Iterator
+from fastapi import FastAPI
+from starlette.requests import Request
+from iterative.service.action_management.models.action import Action
+from iterative.service.action_management.service.stream_utils import encode_stream, iter_action_items, print_stream
+from iterative.web_app_integration import integrate_actions_into_web_app
+
+closed = []
+
+
+def export_rows(count: int) -> Iterator[dict]:
+    try:
+        for row in range(count):
+            yield {"row": row}
+    finally:
+        closed.append("export_rows")
+
+
+async def tail_events(count: int):
+    for event in range(count):
+        await asyncio.sleep(0)
+        yield f"event {event}"
+
+
+def broken_rows():
+    yield {"row": 0}
+    raise ValueError("disk full")
+
+
+def _stream_route(function, accept=None, **kwargs):
+    web_app = FastAPI()
+    integrate_actions_into_web_app([Action(name=function.__name__, function=function, file_path=__file__, category="Project Actions")], web_app)
+    [route] = [route for route in web_app.routes if getattr(route, "path", None) == f"/{function.__name__}"]
+    headers = [(b"accept", accept.encode())] if accept else []
+    request = Request({"type": "http", "app": web_app, "headers": headers})
+    return asyncio.run(route.endpoint(_iterative_request=request, **kwargs))
+
+
+async def _read(body_iterator, limit=None):
+    chunks = []
+    async for chunk in body_iterator:
+        chunks.append(chunk)
+        if limit and len(chunks) == limit:
+            await body_iterator.aclose()
+            break
+    return chunks
+
+
+def test_generator_actions_stream_ndjson():
+    response = _stream_route(export_rows, count=3)
+    assert response.media_type == "application/x-ndjson"
+    chunks = asyncio.run(_read(response.body_iterator))
+    assert [json.loads(chunk) for chunk in chunks] == [{"row": 0}, {"row": 1}, {"row": 2}]
+
+
+def test_async_generator_actions_stream_sse():
+    response = _stream_route(tail_events, accept="text/event-stream", count=2)
+    assert response.media_type == "text/event-stream"
+    assert asyncio.run(_read(response.body_iterator)) == [b'data: "event 0"\n\n', b'data: "event 1"\n\n']
+
+
+def test_generator_is_closed_when_the_client_stops_reading():
+    closed.clear()
+    items = iter_action_items(export_rows, {"count": 1000000})
+    chunks = asyncio.run(_read(encode_stream(items, "application/x-ndjson"), limit=2))
+    assert len(chunks) == 2
+    assert closed == ["export_rows"]
+
+
+def test_errors_end_the_stream_with_an_error_item():
+    chunks = asyncio.run(_read(encode_stream(iter_action_items(broken_rows, {}), "application/x-ndjson")))
+    assert [json.loads(chunk) for chunk in chunks] == [{"row": 0}, {"error": "disk full"}]
+
+
+def test_print_stream_prints_items_incrementally():
+    out = io.StringIO()
+    print_stream(export_rows(2), out)
+    print_stream(tail_events(1), out)
+    assert out.getvalue() == '{"row":0}\n{"row":1}\nevent 0\n'
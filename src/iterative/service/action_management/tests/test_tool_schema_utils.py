@@ -0,0 +1,81 @@
+from enum import Enum
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from iterative.service.action_management.service.tool_schema_utils import (
+    ToolSchemaCompiler,
+    compile_tool_schema,
+    parse_docstring,
+)
+
+
+class Color(str, Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Address(BaseModel):
+    street: str
+    zip_code: Optional[str] = None
+
+
+def create_user(name: str, age: int, tags: List[str], scores: Dict[str, float], color: Color,
+                address: Address, nickname: Optional[str] = None, notes=None):
+    """
+    Create a user.
+
+    Args:
+        name (str): The user's full name.
+        age (int): Age in years,
+            rounded down.
+        nickname: What friends call them.
+    """
+
+
+def test_parse_docstring():
+    description, arguments = parse_docstring(create_user.__doc__)
+    assert description == "Create a user."
+    assert arguments == {
+        "name": "The user's full name.",
+        "age": "Age in years, rounded down.",
+        "nickname": "What friends call them.",
+    }
+
+
+def test_compiles_signatures_to_json_schema():
+    tool = compile_tool_schema("create_user", create_user)
+    function = tool["function"]
+    parameters = function["parameters"]
+    properties = parameters["properties"]
+
+    assert function["name"] == "create_user"
+    assert function["description"] == "Create a user."
+    assert properties["age"]["type"] == "integer"
+    assert properties["age"]["description"] == "Age in years, rounded down."
+    assert properties["tags"] == {"type": "array", "items": {"type": "string"}, "description": "tags"}
+    assert properties["scores"]["additionalProperties"] == {"type": "number"}
+    assert properties["color"]["$ref"].endswith("Color")
+    assert properties["address"]["$ref"].endswith("Address")
+    assert {"type": "null"} in properties["nickname"]["anyOf"]
+    assert properties["notes"]["type"] == "string"
+    assert sorted(parameters["required"]) == ["address", "age", "color", "name", "scores", "tags"]
+
+    definitions = parameters.get("$defs") or parameters["definitions"]
+    assert definitions["Color"]["enum"] == ["red", "blue"]
+    assert definitions["Address"]["required"] == ["street"]
+
+
+def test_compiler_reuses_tools_until_the_function_changes():
+    compiler = ToolSchemaCompiler()
+    tool = compiler.compile("create_user", create_user)
+    assert compiler.compile("create_user", create_user) is tool
+    assert compiler.compiled == 1
+
+    # A reloaded module hands out a new function object
+    def create_user_reloaded(name: str):
+        pass
+
+    compiler.compile("create_user", create_user_reloaded)
+    assert compiler.compiled == 2
+
+    compiler.invalidate(create_user)
+    assert compiler.compile("create_user", create_user) is not tool
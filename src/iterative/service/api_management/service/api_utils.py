@@ -1,13 +1,17 @@
 from collections import defaultdict
-import ast
 import os
 import inspect
+import sys
 import textwrap
+import time
 from typing import Dict
 import humps
 import yaml
 from fastapi import APIRouter
 from iterative.service.project_management.service.project_utils import get_parent_project_root, get_project_root, is_iterative_project, load_module_from_path
+from iterative.service.project_management.service.index_utils import fingerprint_file, get_discovery_index
+from iterative.service.project_management.service.analysis_utils import FileSummary, analyze_files
+from iterative.service.project_management.service.scan_utils import files_within, get_project_index, is_path_within
 from logging import getLogger
 from iterative.config import get_config as _get_config
 from iterative.service.project_management.service.project_utils import (
@@ -35,46 +39,91 @@ def find_api_routers_from_path(start_path: str, file_name: str = None):
     Only considers directories that are identified as iterative projects.
     """
     routers_dict = defaultdict(list)
+    index = get_discovery_index()
+
+    def add_routers_from_files(project_path, api_files, summaries):
+        project_name = os.path.basename(project_path)
+        for full_path in api_files:
+            indexed_names = index.lookup("routers", full_path) if index else None
+            if indexed_names == []:
+                # The file was indexed and holds no routers, no need to import it
+                index.skipped("routers", full_path)
+                continue
+            if indexed_names is None and not may_define_router(summaries[full_path]):
+                if index:
+                    index.store("routers", full_path, [])
+                continue
 
-    def add_routers_from_path(search_path):
-        for root, _, files in os.walk(search_path):
-            for file in files:
-                if file.endswith(".py") and (not file_name or file == file_name):
-                    full_path = os.path.join(root, file)
-                    module = load_module_from_path(full_path)
-                    project_path = get_project_root(root)
-                    project_name = os.path.basename(project_path)
-
-                    for _, obj in inspect.getmembers(module):
-                        if isinstance(obj, APIRouter):
-                            # Check if the router has tags, if not, add a default tag
-                            obj.tags = [f'{project_name}']
-                            routers_dict[project_name].append({
-                                "file_path": full_path,
-                                "project_name": project_name,
-                                "router": obj,
-                                "router_name": "Unnamed router"
-                            })
+            fingerprint = fingerprint_file(full_path)
+            start = time.perf_counter()
+            module = load_module_from_path(full_path)
+
+            router_names = []
+            for attr_name, obj in inspect.getmembers(module):
+                if isinstance(obj, APIRouter):
+                    router_names.append(attr_name)
+                    # Check if the router has tags, if not, add a default tag
+                    obj.tags = [f'{project_name}']
+                    routers_dict[project_name].append({
+                        "file_path": full_path,
+                        "project_name": project_name,
+                        "router": obj,
+                        "router_name": "Unnamed router"
+                    })
+
+            if index and indexed_names is None:
+                index.store("routers", full_path, router_names, time.perf_counter() - start, fingerprint)
 
     def search_iterative_projects_in_service_dirs(root_path):
-        if is_iterative_project(root_path):
-            api_folder = os.path.join(root_path, 'api')
-            if os.path.exists(api_folder):
-                add_routers_from_path(api_folder)
-
-        for root, dirs, _ in os.walk(root_path):
-            if 'service' in root.split(os.sep):  # Checking if 'service' is in the path
-                for dir in dirs:
-                    service_dir_path = os.path.join(root, dir)
-                    if is_iterative_project(service_dir_path):
-                        api_folder = os.path.join(service_dir_path, 'api')
-                        if os.path.exists(api_folder):
-                            add_routers_from_path(api_folder)
+        root_path = os.path.abspath(root_path)
+        project_index = get_project_index(root_path)
+        project_api_files = []
+        for project_path in project_index.projects:
+            api_files = project_index.api_files.get(project_path)
+            if not api_files or not is_path_within(project_path, root_path):
+                continue
+            # The start path's own api folder, and the api folders of projects nested in 'service' directories
+            if project_path != root_path and 'service' not in os.path.dirname(project_path).split(os.sep):
+                continue
+            if file_name:
+                api_files = [full_path for full_path in api_files if os.path.basename(full_path) == file_name]
+            if api_files and is_iterative_project(project_path):
+                project_api_files.append((project_path, api_files))
+
+        summaries = analyze_files(full_path for _, api_files in project_api_files for full_path in api_files)
+        for project_path, api_files in project_api_files:
+            add_routers_from_files(project_path, api_files, summaries)
 
     search_iterative_projects_in_service_dirs(start_path)
     return routers_dict
 
 
+# Packages that define router classes but no router instances a module could import
+ROUTER_FREE_PACKAGES = {"fastapi", "starlette", "pydantic", "typing_extensions"}
+# Python before 3.10 doesn't list its standard library, every import may yield a router there
+STDLIB_MODULES = getattr(sys, "stdlib_module_names", frozenset())
+
+
+def may_define_router(summary: FileSummary) -> bool:
+    """
+    This function tells from a file's summary whether importing it can yield an APIRouter. Only files the
+    analysis proves router-free are skipped: nothing at their top level is bound to what a call returned,
+    as a router factory like `users = make_crud(User)` would be, and they import nothing but the standard
+    library and the frameworks routers are built with. Files that don't parse are imported to surface the error.
+    """
+    if summary.error or summary.router_names or summary.call_assignments or summary.has_star_import:
+        return True
+    return any(_may_import_router(imported) for imported in summary.imports)
+
+
+def _may_import_router(imported: str) -> bool:
+    # Project modules, relative or not, and third-party packages may hand out routers
+    if "router" in imported.rsplit(".", 1)[-1].lower():
+        return True
+    package = imported.split(".", 1)[0]
+    return not package or not (package in STDLIB_MODULES or package in ROUTER_FREE_PACKAGES)
+
+
 def find_api_routers_in_iterative_project():
     project_root = get_project_root()
     logger.info(f"Project root: {project_root}")
@@ -108,8 +157,8 @@ def get_model_router(model_name: str):
     iterative_root = os.getcwd()
     target_file_name = f"{model_name.lower()}_api.py"  # File name pattern
 
-    for root, dirs, _ in os.walk(iterative_root):
-        if '.iterative' in dirs:
+    for root in get_project_index(iterative_root).projects:
+        if is_path_within(root, iterative_root):
             config_path = os.path.join(root, '.iterative', 'config.yaml')
             if not os.path.exists(config_path):
                 continue
@@ -213,32 +262,18 @@ def generate_endpoints_for_model(model_name: str):
 
     os.makedirs(api_path, exist_ok=True)
 
-    # New logic to search for the model in all Python files
-    model_found = False
+    # Search for the model in all Python files
     model_file_path = None
-    for root, dirs, files in os.walk(models_path):
-        for file in files:
-            if file.endswith(".py"):
-                file_path = os.path.join(root, file)
-                with open(file_path, "r", encoding="utf-8") as f:
-                    file_content = f.read()
-                    try:
-                        tree = ast.parse(file_content)
-                        for node in ast.walk(tree):
-                            if (
-                                isinstance(node, ast.ClassDef)
-                                and node.name == model_name_pascal
-                            ):
-                                model_found = True
-                                model_file_path = file_path
-                                break
-                    except SyntaxError:
-                        logger.error(f"Syntax error in file: {file_path}")
-                        continue
-        if model_found:
+    model_files = files_within(get_project_index(models_path).python_files, models_path)
+    for file_path, summary in analyze_files(model_files).items():
+        if summary.error:
+            logger.error(f"Syntax error in file: {file_path}")
+            continue
+        if summary.get_class(model_name_pascal):
+            model_file_path = file_path
             break
 
-    if not model_found:
+    if not model_file_path:
         logger.error(f"Model {model_name_pascal} not found in any file under {models_path}.")
         return
 
@@ -5,6 +5,7 @@ import os
 import shutil
 import yaml
 from iterative.service.project_management.service.project_utils import find_all_iterative_projects, get_project_name, get_project_root
+from iterative.service.project_management.service.scan_utils import files_within, get_project_index
 
 def find_docs_in_project(project_path: str, root: bool=False) -> list:
     """
@@ -18,24 +19,23 @@ def find_docs_in_project(project_path: str, root: bool=False) -> list:
         list: A list of paths to markdown files.
     """
     docs_list = []
+    project_root = get_project_root(project_path)
+    project_index = get_project_index(project_root)
 
     if root:
         # Search for markdown files in the 'docs' directory
-        docs_path = os.path.join(get_project_root(project_path), 'docs')
-        for root, dirs, files in os.walk(docs_path):
-            for file in files:
-                if file.endswith('.md'):
-                    docs_list.append(os.path.relpath(os.path.join(root, file), project_path))
-    
-    # Search for markdown files in the 'service' directory
-    service_path = os.path.join(get_project_root(project_path), 'service')
-    for root, dirs, files in os.walk(service_path):
-        if '.iterative' in dirs:
-            docs_subdir = os.path.join(get_project_root(root), 'docs')
-            if os.path.exists(docs_subdir):
-                for file in os.listdir(docs_subdir):
-                    if file.endswith('.md'):
-                        docs_list.append(os.path.relpath(os.path.join(docs_subdir, file), project_path))
+        docs_path = os.path.join(project_root, 'docs')
+        for doc in files_within(project_index.docs, docs_path):
+            docs_list.append(os.path.relpath(doc, project_path))
+
+    # Search for markdown files in the 'docs' folder of projects nested in the 'service' directory
+    service_path = os.path.join(project_root, 'service')
+    nested_docs_folders = {
+        os.path.join(nested_project, 'docs') for nested_project in files_within(project_index.projects, service_path)
+    }
+    for doc in files_within(project_index.docs, service_path):
+        if os.path.dirname(doc) in nested_docs_folders:
+            docs_list.append(os.path.relpath(doc, project_path))
     return docs_list
 
 def generate_mkdocs_nav(build_dir: str) -> list:
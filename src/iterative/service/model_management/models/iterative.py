@@ -35,8 +35,8 @@ class IterativeAppConfig(IterativeModel):
     ui_path: Optional[str] = "ui"
     ui_clients_path: Optional[str] = "clients"
     ui_models_path: Optional[str] = "models"
-    reload_dirs: Optional[list[str]] = ["."]  # Specify directories to be reloaded
-    reload: Optional[bool] = True
+    reload_dirs: Optional[list[str]] = ["."]  # Folders watched for changes when reload is on, relative to the project root
+    reload: Optional[bool] = False  # Development mode: re-import changed modules and patch their routes and commands while the app runs
     persist_cache_as_db: Optional[bool] = False
     read_write_to_cache: Optional[bool] = False
     default_ai_model: Optional[str] = "gpt-3.5-turbo"
@@ -56,3 +56,31 @@ class IterativeAppConfig(IterativeModel):
     actions_cap: Optional[int] = 128
     metadata: Optional[dict] = {}
     swagger_ui_nested_path: Optional[str] = ""
+    use_discovery_index: Optional[bool] = True  # Cache discovery results under .iterative/cache
+    scan_ignore: Optional[list[str]] = ["node_modules", "__pycache__", "venv", "env", "site-packages", "build", "dist"]  # Directory names the project scanner never enters
+    scan_cache_ttl: Optional[float] = 2.0  # Seconds before a cached project scan is checked for changes
+    analysis_workers: Optional[int] = None  # Processes used to parse large projects, all cores if unset, 1 parses in-process
+    watch_config: Optional[bool] = False  # Apply changes to .iterative/config.yaml without a restart where possible
+    config_watch_interval: Optional[float] = 1.0  # Seconds between checks of the config file
+    action_threads: Optional[int] = 32  # Threads running synchronous actions called from the web app
+    action_processes: Optional[int] = None  # Processes running actions marked with run_in_process, all cores if unset
+    batch_max_calls: Optional[int] = 100  # Most calls accepted by /_iterative/batch in one request
+    batch_max_concurrency: Optional[int] = 8  # Calls of one batch running at the same time
+    action_cache_max_bytes: Optional[int] = 67108864  # Total serialized size of the results kept by cached_action
+    metrics_enabled: Optional[bool] = True  # Count and time requests to actions and routers, served at /metrics
+    metrics_multiprocess_dir: Optional[str] = None  # Folder where each worker writes its metrics so /metrics adds them up
+    metrics_flush_interval: Optional[float] = 1.0  # Seconds between writes of a worker's metrics to metrics_multiprocess_dir
+    trace_enabled: Optional[bool] = False  # Trace requests and prep_app, traces are written to logs_path
+    trace_sample_rate: Optional[float] = 1.0  # Share of requests traced, decided when the request starts
+    trace_format: Optional[str] = "chrome"  # "chrome" for chrome://tracing and Perfetto, or "otlp" for OTLP JSON lines
+    server_workers: Optional[int] = 1  # Processes serving the web app, forked from one prepared app, 0 for one per core
+    server_loop: Optional[str] = "auto"  # Event loop of the web server: "auto", "asyncio" or "uvloop"
+    server_http: Optional[str] = "auto"  # HTTP implementation of the web server: "auto", "h11" or "httptools"
+    server_backlog: Optional[int] = 2048  # Connections waiting to be accepted before new ones are refused
+    server_limit_concurrency: Optional[int] = None  # Connections or tasks per worker before it answers 503, unlimited if unset
+    server_graceful_shutdown: Optional[float] = None  # Seconds workers wait for running requests on shutdown, unlimited if unset
+    process_start_timeout: Optional[float] = 30.0  # Seconds uvicorn and ngrok get to become ready when started as subprocesses
+    reload_backend: Optional[str] = "auto"  # How changes are noticed: "inotify", "poll", or "auto" for inotify where available
+    reload_poll_interval: Optional[float] = 0.5  # Seconds between scans of the watched folders with the "poll" backend
+    reload_debounce: Optional[float] = 0.05  # Seconds without further changes before a batch of changes is reloaded
+    reload_in_workers: Optional[bool] = False  # Let every worker reload on its own when reload is on and server_workers > 1
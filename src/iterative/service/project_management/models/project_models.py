@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import Field
 from iterative.service.model_management.models.iterative import IterativeModel, IterativeAppConfig
 from enum import Enum
@@ -23,4 +23,19 @@ class Project(IterativeModel):
     config: Optional[IterativeAppConfig] = Field(None)
     models: Optional[dict] = Field(None)
     services: Optional[dict] = Field(None)
-    actions: Optional[dict] = Field(None)
\ No newline at end of file
+    actions: Optional[dict] = Field(None)
+
+
+class ProjectIndex(IterativeModel):
+    """
+    Everything discovery needs to know about a project tree, collected in a single walk.
+    All paths are absolute.
+    """
+    root_path: str
+    projects: List[str] = []  # Directories that contain a `.iterative` folder
+    python_files: List[str] = []
+    action_files: List[str] = []
+    api_files: Dict[str, List[str]] = {}  # Project root -> python files under its `api` folder
+    model_files: List[str] = []
+    docs: List[str] = []
+    streamlits: List[str] = []
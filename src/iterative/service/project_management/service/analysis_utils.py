@@ -0,0 +1,239 @@
+import ast
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+from iterative.service.project_management.service.index_utils import Fingerprint, fingerprint_file
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+# Below this many files, starting worker processes costs more than parsing in this process
+PARALLEL_THRESHOLD = 256
+
+
+class ClassSummary(NamedTuple):
+    name: str
+    bases: Tuple[str, ...]
+    lineno: int
+    top_level: bool
+
+
+class FunctionSummary(NamedTuple):
+    name: str
+    signature: str
+    docstring: Optional[str]
+    is_async: bool
+    lineno: int
+
+
+class FileSummary(NamedTuple):
+    """
+    What the static finders need to know about a Python file, small enough to send back from a worker process.
+
+    `classes` and `function_names` list every class and `def` in the file in `ast.walk` order, nested ones
+    included. `functions` only describes the functions defined at the top level.
+    """
+    path: str
+    classes: Tuple[ClassSummary, ...] = ()
+    functions: Tuple[FunctionSummary, ...] = ()
+    function_names: Tuple[str, ...] = ()
+    router_names: Tuple[str, ...] = ()
+    imports: Tuple[str, ...] = ()
+    error: Optional[str] = None
+    # (local name, imported dotted name), relative imports keep their leading dots
+    import_aliases: Tuple[Tuple[str, str], ...] = ()
+    has_star_import: bool = False
+    # Names bound at the top level to what a call returned, `users = make_crud(User)`, routers included
+    call_assignments: Tuple[str, ...] = ()
+
+    def get_class(self, name: str) -> Optional[ClassSummary]:
+        for class_summary in self.classes:
+            if class_summary.name == name:
+                return class_summary
+        return None
+
+
+def _is_router_call(node: ast.expr) -> bool:
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    if isinstance(func, ast.Attribute):
+        return func.attr == "APIRouter"
+    return isinstance(func, ast.Name) and func.id == "APIRouter"
+
+
+def _top_level_statements(body: list) -> Iterable[ast.stmt]:
+    # Statements run on import, including those nested in top-level ifs, trys, withs and loops
+    for node in body:
+        yield node
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            for field in ("body", "orelse", "finalbody"):
+                yield from _top_level_statements(getattr(node, field, None) or [])
+            for handler in getattr(node, "handlers", None) or []:
+                yield from _top_level_statements(handler.body)
+
+
+def _call_assignments(tree: ast.Module) -> Tuple[str, ...]:
+    names = []
+    for node in _top_level_statements(tree.body):
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Call):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.value, ast.Call):
+            targets = [node.target]
+        else:
+            continue
+        names.extend(name.id for target in targets for name in ast.walk(target) if isinstance(name, ast.Name))
+    return tuple(names)
+
+
+def _imports(tree: ast.Module) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, str], ...], bool]:
+    imports = []
+    aliases = []
+    has_star_import = False
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.append(alias.name)
+                # `import a.b` binds `a`, `import a.b as c` binds `c` to `a.b`
+                aliases.append((alias.asname, alias.name) if alias.asname else (alias.name.split(".")[0], alias.name.split(".")[0]))
+        elif isinstance(node, ast.ImportFrom):
+            module = "." * node.level + (node.module or "")
+            for alias in node.names:
+                imported = f"{module}.{alias.name}" if module.strip(".") else f"{module}{alias.name}"
+                imports.append(imported)
+                if alias.name == "*":
+                    has_star_import = True
+                else:
+                    aliases.append((alias.asname or alias.name, imported))
+    return tuple(imports), tuple(aliases), has_star_import
+
+
+def analyze_source(source: str, path: str) -> FileSummary:
+    """
+    Summarizes the classes, functions, routers and imports of a Python source.
+
+    Returns:
+        FileSummary: The summary, with `error` set and everything else empty if the source doesn't parse.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        return FileSummary(path=path, error=f"{type(e).__name__}: {e}")
+
+    top_level = set(map(id, tree.body))
+    classes = []
+    function_names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            classes.append(ClassSummary(
+                name=node.name,
+                bases=tuple(ast.unparse(base) for base in node.bases),
+                lineno=node.lineno,
+                top_level=id(node) in top_level,
+            ))
+        elif isinstance(node, ast.FunctionDef):
+            function_names.append(node.name)
+
+    functions = []
+    router_names = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append(FunctionSummary(
+                name=node.name,
+                signature=f"({ast.unparse(node.args)})" + (f" -> {ast.unparse(node.returns)}" if node.returns else ""),
+                docstring=ast.get_docstring(node),
+                is_async=isinstance(node, ast.AsyncFunctionDef),
+                lineno=node.lineno,
+            ))
+        elif isinstance(node, ast.Assign) and _is_router_call(node.value):
+            router_names.extend(target.id for target in node.targets if isinstance(target, ast.Name))
+        elif isinstance(node, ast.AnnAssign) and node.value and _is_router_call(node.value) and isinstance(node.target, ast.Name):
+            router_names.append(node.target.id)
+
+    imports, import_aliases, has_star_import = _imports(tree)
+    return FileSummary(
+        path=path,
+        classes=tuple(classes),
+        functions=tuple(functions),
+        function_names=tuple(function_names),
+        router_names=tuple(router_names),
+        imports=imports,
+        import_aliases=import_aliases,
+        has_star_import=has_star_import,
+        call_assignments=_call_assignments(tree),
+    )
+
+
+def analyze_file(path: str) -> FileSummary:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return FileSummary(path=path, error=f"{type(e).__name__}: {e}")
+    return analyze_source(source, path)
+
+
+def get_analysis_workers() -> int:
+    """
+    Returns the number of worker processes from the `analysis_workers` config value, all cores if unset.
+    """
+    from iterative.config import get_config
+
+    workers = get_config().get("analysis_workers")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(int(workers), 1)
+
+
+def _analyze_in_pool(paths: list, workers: int) -> list:
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(analyze_file, paths, chunksize=chunksize))
+
+
+# Summaries of unchanged files are reused across finders within the process
+_summaries: Dict[str, Tuple[Fingerprint, FileSummary]] = {}
+
+
+def analyze_files(paths: Iterable[str], workers: int = None) -> Dict[str, FileSummary]:
+    """
+    Summarizes many Python files, parsing them in a process pool when there are enough of them.
+
+    Args:
+        paths (Iterable[str]): The files to analyze.
+        workers (int, optional): Worker processes to use. Defaults to the `analysis_workers` config value.
+            With 1 worker, or fewer than PARALLEL_THRESHOLD files to parse, files are parsed in this process.
+
+    Returns:
+        Dict[str, FileSummary]: The summary of every file, in the order the paths were given.
+    """
+    paths = list(paths)
+    fingerprints = {path: fingerprint_file(path) for path in paths}
+    summaries: Dict[str, FileSummary] = {}
+    pending = []
+    for path in paths:
+        cached = _summaries.get(path)
+        if cached is not None and fingerprints[path] is not None and cached[0] == fingerprints[path]:
+            summaries[path] = cached[1]
+        else:
+            pending.append(path)
+
+    workers = workers if workers is not None else get_analysis_workers()
+    results = None
+    if workers > 1 and len(pending) >= PARALLEL_THRESHOLD:
+        try:
+            results = _analyze_in_pool(pending, workers)
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning(f"Parallel analysis failed, parsing in this process instead: {e}")
+    if results is None:
+        results = [analyze_file(path) for path in pending]
+
+    for path, summary in zip(pending, results):
+        summaries[path] = summary
+        if fingerprints[path] is not None:
+            _summaries[path] = (fingerprints[path], summary)
+        if summary.error:
+            logger.debug(f"Could not analyze {path}: {summary.error}")
+
+    return {path: summaries[path] for path in paths}
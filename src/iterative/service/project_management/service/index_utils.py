@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+from collections import defaultdict
+from typing import Any, Dict, Optional, Tuple
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+DISCOVERY_INDEX_VERSION = 3
+DISCOVERY_INDEX_FILE = "discovery_index.json"
+
+# Discovery results that can be kept in the index, one bucket per kind
+INDEX_KINDS = ("actions", "action_specs", "routers", "models")
+
+Fingerprint = Tuple[int, int]
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Returns the sha256 hex digest of the file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_file(file_path: str) -> Optional[Fingerprint]:
+    """
+    Returns the (mtime_ns, size) pair for the file, or None if it cannot be stat'ed.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DiscoveryIndex:
+    """
+    Persistent record of what discovery found in each file, stored under `.iterative/cache/`.
+
+    Entries are bucketed by kind ("actions", "routers", "models") and keyed by absolute file path.
+    Each entry keeps the file's mtime, size and content hash, so unchanged files are served from the
+    index and only changed files are re-parsed or re-imported.
+    """
+
+    def __init__(self, project_root: str):
+        self.project_root = project_root
+        self.path = os.path.join(project_root, ".iterative", "cache", DISCOVERY_INDEX_FILE)
+        self.entries: Dict[str, Dict[str, Dict[str, Any]]] = {kind: {} for kind in INDEX_KINDS}
+        self.dirty = False
+        self.reset_stats()
+        self.load()
+
+    def reset_stats(self):
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        self.saved_seconds = 0.0
+        self.spent_seconds = 0.0
+
+    def load(self):
+        """
+        Load the index from disk. A missing, unreadable or outdated index starts empty.
+        """
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable discovery index at {self.path}: {e}")
+            return
+        if data.get("version") != DISCOVERY_INDEX_VERSION:
+            logger.info("Discovery index was written by another version, starting fresh.")
+            self.dirty = True
+            return
+        for kind in INDEX_KINDS:
+            self.entries[kind] = data.get("entries", {}).get(kind, {})
+
+    def save(self):
+        """
+        Write the index to disk if it changed. The file is replaced atomically so concurrent
+        readers never see a partial index.
+        """
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": DISCOVERY_INDEX_VERSION, "entries": self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def clear(self):
+        self.entries = {kind: {} for kind in INDEX_KINDS}
+        self.dirty = True
+        self.reset_stats()
+
+    def _is_fresh(self, entry: Dict[str, Any], file_path: str) -> bool:
+        fingerprint = fingerprint_file(file_path)
+        if fingerprint is None:
+            return False
+        mtime_ns, size = fingerprint
+        if entry["mtime_ns"] == mtime_ns and entry["size"] == size:
+            return True
+        if entry["size"] != size:
+            return False
+        # Touched but possibly unchanged, fall back to the content hash
+        if hash_file(file_path) != entry["sha256"]:
+            return False
+        entry["mtime_ns"] = mtime_ns
+        self.dirty = True
+        return True
+
+    def lookup(self, kind: str, file_path: str) -> Optional[Any]:
+        """
+        Returns the indexed discovery result for the file, or None if the file is not indexed
+        or changed since it was indexed.
+        """
+        file_path = os.path.abspath(file_path)
+        entry = self.entries[kind].get(file_path)
+        if entry is None or not self._is_fresh(entry, file_path):
+            self.misses[kind] += 1
+            return None
+        self.hits[kind] += 1
+        return entry["data"]
+
+    def skipped(self, kind: str, file_path: str):
+        """
+        Record that a hit let discovery skip parsing or importing the file, for the savings report.
+        """
+        entry = self.entries[kind].get(os.path.abspath(file_path))
+        if entry is not None:
+            self.saved_seconds += entry.get("elapsed", 0.0)
+
+    def store(self, kind: str, file_path: str, data: Any, elapsed: float = 0.0,
+              fingerprint: Optional[Fingerprint] = None):
+        """
+        Record the discovery result for the file.
+
+        Args:
+            kind (str): The kind of discovery result, one of INDEX_KINDS.
+            file_path (str): The absolute path of the file.
+            data: A JSON serializable discovery result.
+            elapsed (float): Seconds spent producing the result, used for the savings report.
+            fingerprint (Fingerprint, optional): The fingerprint taken before the file was processed.
+        """
+        file_path = os.path.abspath(file_path)
+        fingerprint = fingerprint or fingerprint_file(file_path)
+        if fingerprint is None:
+            return
+        self.entries[kind][file_path] = {
+            "mtime_ns": fingerprint[0],
+            "size": fingerprint[1],
+            "sha256": hash_file(file_path),
+            "elapsed": elapsed,
+            "data": data,
+        }
+        self.spent_seconds += elapsed
+        self.dirty = True
+
+    def status(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns the number of fresh and stale entries for each kind without modifying the index.
+        """
+        status = {}
+        for kind, entries in self.entries.items():
+            fresh = stale = 0
+            for file_path, entry in entries.items():
+                if fingerprint_file(file_path) == (entry["mtime_ns"], entry["size"]):
+                    fresh += 1
+                else:
+                    stale += 1
+            status[kind] = {"entries": len(entries), "fresh": fresh, "stale": stale}
+        return status
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Returns the hit/miss counters collected since the index was loaded.
+        """
+        return {
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "saved_seconds": round(self.saved_seconds, 4),
+            "spent_seconds": round(self.spent_seconds, 4),
+        }
+
+    def format_report(self) -> str:
+        hits = sum(self.hits.values())
+        misses = sum(self.misses.values())
+        return (
+            f"Discovery index: {hits} hits, {misses} misses, "
+            f"~{self.saved_seconds:.3f}s of parsing/imports skipped, {self.spent_seconds:.3f}s spent indexing"
+        )
+
+
+_discovery_indexes: Dict[str, DiscoveryIndex] = {}
+
+
+def get_discovery_index(project_root: str = None) -> Optional[DiscoveryIndex]:
+    """
+    Returns the process wide discovery index of the outermost iterative project, or None if
+    there is no project or the index is disabled with `use_discovery_index: false`.
+    """
+    from iterative.config import get_config
+    from iterative.service.project_management.service.project_utils import get_parent_project_root
+
+    if not get_config().get("use_discovery_index", True):
+        return None
+    project_root = project_root or get_parent_project_root()
+    if not project_root:
+        return None
+    if project_root not in _discovery_indexes:
+        _discovery_indexes[project_root] = DiscoveryIndex(project_root)
+    return _discovery_indexes[project_root]
+
+
+def save_discovery_index():
+    """
+    Persist every loaded discovery index and log its hit/miss report.
+    """
+    for index in _discovery_indexes.values():
+        logger.info(index.format_report())
+        try:
+            index.save()
+        except OSError as e:
+            logger.warning(f"Could not write discovery index to {index.path}: {e}")
@@ -0,0 +1,204 @@
+import os
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from iterative.service.project_management.service.analysis_utils import FileSummary, analyze_files
+from iterative.service.project_management.service.index_utils import hash_file
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+# Dotted names known to be, or not to be, Pydantic models without importing anything
+MODEL_BASES = frozenset({
+    "pydantic.BaseModel",
+    "pydantic.main.BaseModel",
+    "pydantic.v1.BaseModel",
+    "pydantic.v1.main.BaseModel",
+    "pydantic.generics.GenericModel",
+    "pydantic_settings.BaseSettings",
+    "pydantic.BaseSettings",
+    "iterative.IterativeModel",
+    "iterative.IterativeAppConfig",
+    "iterative.service.model_management.models.iterative.IterativeModel",
+    "iterative.service.model_management.models.iterative.IterativeAppConfig",
+})
+NON_MODEL_BASES = frozenset({
+    "object", "Exception", "BaseException", "ValueError", "TypeError", "KeyError", "RuntimeError",
+    "dict", "list", "set", "tuple", "str", "int", "float", "bytes", "type",
+    "enum.Enum", "enum.IntEnum", "enum.Flag", "enum.IntFlag", "enum.StrEnum",
+    "typing.NamedTuple", "typing.TypedDict", "typing.Generic", "typing.Protocol",
+    "typing_extensions.TypedDict", "typing_extensions.Protocol", "abc.ABC",
+})
+
+
+class FileVerdicts(NamedTuple):
+    """
+    Whether each top-level class of a file is a Pydantic model: True, False or None when it can't be decided
+    statically. `dependencies` holds the content hash of every file the verdicts were derived from.
+    """
+    verdicts: Dict[str, Optional[bool]]
+    dependencies: Dict[str, str]
+
+
+def _strip_subscript(base: str) -> str:
+    # `GenericModel[T]` and `Generic[T]` inherit from what's before the brackets
+    return base.split("[", 1)[0].strip()
+
+
+class ModelInheritanceResolver:
+    """
+    Decides from source alone whether classes inherit from `pydantic.BaseModel`, following imports and base
+    class chains across the project's files.
+
+    Imported names are looked up next to the importing file, as the module registry puts that folder on
+    `sys.path`, then in the extra search paths. Anything that leads outside those files, except the known
+    bases, is undecided.
+    """
+
+    def __init__(self, search_paths: List[str] = None):
+        self.search_paths = [os.path.abspath(path) for path in (search_paths or [])]
+        self._hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._results: Dict[Tuple[str, str], FileVerdicts] = {}
+
+    def _file_hash(self, path: str) -> Optional[str]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+        cached = self._hashes.get(path)
+        if cached is None or cached[0] != fingerprint:
+            cached = self._hashes[path] = (fingerprint, hash_file(path))
+        return cached[1]
+
+    def _summary(self, path: str) -> FileSummary:
+        return analyze_files([path], workers=1)[path]
+
+    def _find_module_file(self, module: str, from_path: str) -> Optional[str]:
+        """
+        Returns the project file a dotted module name refers to from the given file, if any.
+        """
+        level = len(module) - len(module.lstrip("."))
+        parts = [part for part in module.lstrip(".").split(".") if part]
+        if level:
+            base = os.path.dirname(from_path)
+            for _ in range(level - 1):
+                base = os.path.dirname(base)
+            bases = [base]
+        else:
+            bases = [os.path.dirname(from_path)] + self.search_paths
+        for base in bases:
+            candidate = os.path.join(base, *parts)
+            for path in (f"{candidate}.py", os.path.join(candidate, "__init__.py")):
+                if os.path.isfile(path):
+                    return path
+        return None
+
+    def _resolve_dotted(self, dotted: str, from_path: str, visiting: Set, dependencies: Dict[str, str]) -> Optional[bool]:
+        """
+        Resolves an imported dotted name such as `models.user.User` or `.base.Base` to a verdict.
+        """
+        if dotted in MODEL_BASES:
+            return True
+        if dotted in NON_MODEL_BASES:
+            return False
+        # Try the longest module prefix that is a project file, the rest names a class in it
+        relative_dots = "." * (len(dotted) - len(dotted.lstrip(".")))
+        parts = dotted.lstrip(".").split(".")
+        for split in range(len(parts) - 1, 0, -1):
+            module = relative_dots + ".".join(parts[:split])
+            module_path = self._find_module_file(module, from_path)
+            if module_path is None:
+                continue
+            attribute = parts[split:]
+            if len(attribute) != 1:
+                return None
+            return self._resolve_class(module_path, attribute[0], visiting, dependencies)
+        return None
+
+    def _resolve_name(self, summary: FileSummary, name: str, visiting: Set, dependencies: Dict[str, str]) -> Optional[bool]:
+        """
+        Resolves a base class expression as written in the file, e.g. `BaseModel` or `models.Base`.
+        """
+        name = _strip_subscript(name)
+        head, _, rest = name.partition(".")
+        if not rest:
+            class_summary = summary.get_class(head)
+            if class_summary is not None and class_summary.top_level:
+                return self._resolve_class(summary.path, head, visiting, dependencies)
+        for local_name, imported in reversed(summary.import_aliases):
+            if local_name == head:
+                return self._resolve_dotted(f"{imported}.{rest}" if rest else imported, summary.path, visiting, dependencies)
+        if summary.has_star_import:
+            return None
+        # Builtins such as `object` or `dict`
+        if name in NON_MODEL_BASES:
+            return False
+        return None
+
+    def _resolve_class(self, path: str, class_name: str, visiting: Set, dependencies: Dict[str, str]) -> Optional[bool]:
+        key = (path, class_name)
+        if key in visiting:
+            return None
+        file_hash = self._file_hash(path)
+        if file_hash is None:
+            return None
+        dependencies[path] = file_hash
+
+        summary = self._summary(path)
+        class_summary = summary.get_class(class_name)
+        if summary.error or class_summary is None or not class_summary.top_level:
+            return None
+        if not class_summary.bases:
+            return False
+
+        visiting.add(key)
+        try:
+            verdicts = [self._resolve_name(summary, base, visiting, dependencies) for base in class_summary.bases]
+        finally:
+            visiting.discard(key)
+        if any(verdict is True for verdict in verdicts):
+            return True
+        if all(verdict is False for verdict in verdicts):
+            return False
+        return None
+
+    def dependencies_unchanged(self, dependencies: Dict[str, str]) -> bool:
+        """
+        Returns True if every file still has the content hash recorded in `dependencies`.
+        """
+        return all(self._file_hash(path) == file_hash for path, file_hash in dependencies.items())
+
+    def resolve_file(self, path: str) -> FileVerdicts:
+        """
+        Returns the verdict for every top-level class of the file. Results are cached by the file's content
+        hash and reused until the file or a file it inherits from changes.
+        """
+        path = os.path.abspath(path)
+        file_hash = self._file_hash(path)
+        cached = self._results.get((path, file_hash))
+        if cached is not None and self.dependencies_unchanged(cached.dependencies):
+            return cached
+
+        summary = self._summary(path)
+        dependencies: Dict[str, str] = {path: file_hash} if file_hash else {}
+        verdicts = {
+            class_summary.name: self._resolve_class(path, class_summary.name, set(), dependencies)
+            for class_summary in summary.classes
+            if class_summary.top_level
+        }
+        result = FileVerdicts(verdicts, dependencies)
+        if file_hash:
+            self._results[(path, file_hash)] = result
+        return result
+
+
+_resolvers: Dict[Tuple[str, ...], ModelInheritanceResolver] = {}
+
+
+def get_model_inheritance_resolver(search_paths: List[str] = None) -> ModelInheritanceResolver:
+    """
+    Returns the process wide resolver for the given search paths.
+    """
+    key = tuple(os.path.abspath(path) for path in (search_paths or []))
+    if key not in _resolvers:
+        _resolvers[key] = ModelInheritanceResolver(list(key))
+    return _resolvers[key]
@@ -0,0 +1,177 @@
+import hashlib
+import importlib.util
+import os
+import re
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Dict, List, Optional
+from iterative.service.telemetry_management.service.profile_utils import module_import
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+QUALIFIED_NAME_PREFIX = "_iterative_user__"
+
+
+def qualified_module_name(path: str) -> str:
+    """
+    Returns the name a user module is registered under in `sys.modules`.
+
+    The name is derived from the file name plus a hash of the absolute path, so it is the same in every
+    process and two files called `models.py` in different services never collide. It has no dots, so
+    pickle and Pydantic can resolve it without a parent package.
+    """
+    path = os.path.abspath(path)
+    stem = re.sub(r"\W", "_", os.path.splitext(os.path.basename(path))[0])
+    digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:12]
+    return f"{QUALIFIED_NAME_PREFIX}{stem}_{digest}"
+
+
+class ModuleRecord:
+    __slots__ = ("path", "qualified_name", "mtime_ns", "module", "load_count", "hit_count", "import_seconds")
+
+    def __init__(self, path: str, qualified_name: str):
+        self.path = path
+        self.qualified_name = qualified_name
+        self.mtime_ns: Optional[int] = None
+        self.module: Optional[ModuleType] = None
+        self.load_count = 0
+        self.hit_count = 0
+        self.import_seconds = 0.0
+
+
+class ModuleRegistry:
+    """
+    Executes each user module once and hands the same module object to every caller until the file changes.
+
+    Modules are keyed by absolute path and mtime. A changed file is executed again on its next load.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, ModuleRecord] = {}
+        # Re-entrant, a module being executed may load other user modules through the registry
+        self._lock = threading.RLock()
+        self.generation = 0
+
+    def load(self, path: str) -> ModuleType:
+        """
+        Returns the executed module for the file, executing it only if it was never loaded or changed since.
+        """
+        path = os.path.abspath(path)
+        mtime_ns = os.stat(path).st_mtime_ns
+        with self._lock:
+            record = self._records.get(path)
+            if record is None:
+                record = self._records[path] = ModuleRecord(path, qualified_module_name(path))
+            elif record.module is not None and record.mtime_ns == mtime_ns:
+                record.hit_count += 1
+                return record.module
+
+            # Add the directory containing the module to sys.path so it can import its siblings
+            module_dir = os.path.dirname(path)
+            if module_dir not in sys.path:
+                sys.path.insert(0, module_dir)
+
+            spec = importlib.util.spec_from_file_location(record.qualified_name, path)
+            module = importlib.util.module_from_spec(spec)
+            previous_module = sys.modules.get(record.qualified_name)
+            sys.modules[record.qualified_name] = module
+            start = time.perf_counter()
+            try:
+                with module_import(record.qualified_name, path, is_user=True):
+                    spec.loader.exec_module(module)
+            except BaseException:
+                if previous_module is not None:
+                    sys.modules[record.qualified_name] = previous_module
+                else:
+                    sys.modules.pop(record.qualified_name, None)
+                raise
+            finally:
+                record.import_seconds += time.perf_counter() - start
+
+            record.module = module
+            record.mtime_ns = mtime_ns
+            record.load_count += 1
+            self.generation += 1
+            logger.debug(f"Loaded {path} as {record.qualified_name}")
+            return module
+
+    def get(self, path: str) -> Optional[ModuleType]:
+        """
+        Returns the module loaded for the file, without loading or re-validating it.
+        """
+        record = self._records.get(os.path.abspath(path))
+        return record.module if record else None
+
+    def reload(self, path: str) -> ModuleType:
+        """
+        Execute the file again even if it didn't change, e.g. because a module it imports did. If executing
+        it fails, the module loaded before stays in place.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            record = self._records.get(path)
+            if record is None:
+                return self.load(path)
+            mtime_ns = record.mtime_ns
+            record.mtime_ns = None
+            try:
+                return self.load(path)
+            except BaseException:
+                if record.mtime_ns is None:
+                    record.mtime_ns = mtime_ns
+                raise
+
+    def loaded_paths(self) -> List[str]:
+        """
+        Returns the files whose module is currently loaded.
+        """
+        return [path for path, record in self._records.items() if record.module is not None]
+
+    def invalidate(self, path: str) -> bool:
+        """
+        Forget the module loaded for the file so its next load executes it again.
+
+        Returns:
+            bool: True if a module was loaded for the file.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            record = self._records.get(path)
+            if record is None or record.module is None:
+                return False
+            sys.modules.pop(record.qualified_name, None)
+            record.module = None
+            record.mtime_ns = None
+            self.generation += 1
+            return True
+
+    def invalidate_all(self):
+        with self._lock:
+            for path in list(self._records):
+                self.invalidate(path)
+
+    def stats(self) -> List[Dict]:
+        """
+        Returns the load count, cache hits and cumulative import time of every file, slowest first.
+        """
+        stats = [
+            {
+                "path": record.path,
+                "qualified_name": record.qualified_name,
+                "load_count": record.load_count,
+                "hit_count": record.hit_count,
+                "import_seconds": round(record.import_seconds, 6),
+            }
+            for record in self._records.values()
+        ]
+        return sorted(stats, key=lambda stat: stat["import_seconds"], reverse=True)
+
+
+_module_registry = ModuleRegistry()
+
+
+def get_module_registry() -> ModuleRegistry:
+    return _module_registry
@@ -1,9 +1,13 @@
-import ast
-import sys
 import os
-import importlib.util
+import time
 from typing import Dict
 from iterative.service.project_management.models.project_models import ProjectFile, Project
+from iterative.service.project_management.service.analysis_utils import analyze_files
+from iterative.service.project_management.service.index_utils import fingerprint_file, get_discovery_index
+from iterative.service.project_management.service.inheritance_utils import get_model_inheritance_resolver
+from iterative.service.project_management.service.module_registry import get_module_registry
+from iterative.service.project_management.service.root_utils import get_project_root_resolver
+from iterative.service.project_management.service.scan_utils import files_within, get_project_index, is_path_within
 from pydantic import BaseModel
 import yaml
 from logging import getLogger
@@ -15,18 +19,10 @@ def snake_case(s: str) -> str:
     return s.replace("-", "_").replace(" ", "_")
 
 def load_module_from_path(path: str):
-    # Derive a module name from the file path
-    module_name = os.path.splitext(os.path.basename(path))[0]
-
-    # Add the directory containing the module to sys.path
-    module_dir = os.path.dirname(path)
-    if module_dir not in sys.path:
-        sys.path.insert(0, module_dir)
-
-    spec = importlib.util.spec_from_file_location(module_name, path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+    """
+    Returns the module for the file, executed once per process and again only when the file changes.
+    """
+    return get_module_registry().load(path)
 
 
 def resolve_project_folder_path(folder_path: str, parent: bool = False, package: bool = False, *args):
@@ -41,14 +37,14 @@ def resolve_project_folder_path(folder_path: str, parent: bool = False, package:
             project_root = get_project_root()
             if not project_root:
                 return os.path.join(folder_path, *args)
-            return os.path.join(get_project_root(), folder_path, *args)
+            return os.path.join(project_root, folder_path, *args)
     
 
 def is_iterative_project(folder_path):
     if 'templates' in folder_path.split(os.sep):
         return False
     # Ensure the .iterative folder exists
-    return os.path.exists(os.path.join(folder_path, ".iterative"))
+    return get_project_root_resolver().is_project(folder_path)
 
 def get_project_root(start_path: str = None):
     """
@@ -69,21 +65,18 @@ def get_project_root(start_path: str = None):
     Returns:
         str: The path to the parent directory of the nearest `.iterative` folder, or None if no such folder is found.
     """
-    path = start_path if start_path else os.getcwd()
-    while path != '/':
-        if os.path.exists(os.path.join(path, ".iterative")):
-            return path
-        path = os.path.dirname(path)
-    logger.info("No '.iterative' project found.")
-    return None
+    project_root = get_project_root_resolver().nearest(start_path if start_path else os.getcwd())
+    if project_root is None:
+        logger.info("No '.iterative' project found.")
+    return project_root
 
 
 def find_all_iterative_projects(start_path):
-    iterative_projects = []
-    for root, dirs, files in os.walk(start_path):
-        if '.iterative' in dirs:
-            iterative_projects.append(root)
-    return iterative_projects
+    start_path = os.path.abspath(start_path)
+    return [
+        project_path for project_path in get_project_index(start_path).projects
+        if is_path_within(project_path, start_path)
+    ]
 
 
 def get_parent_project_root():
@@ -102,33 +95,13 @@ def get_parent_project_root():
     Returns:
         str: The path to the parent directory of the last `.iterative` folder found, or None if no such folder is found.
     """
-    path = os.getcwd()
-    last_project_root = None
-    while True:
-        if os.path.exists(os.path.join(path, ".iterative")):
-            last_project_root = path
-        parent_path = os.path.dirname(path)
-        if path == parent_path:  # We've reached the root directory
-            break
-        path = parent_path
-    return last_project_root
+    return get_project_root_resolver().outermost(os.getcwd())
 
 
 def is_pydantic_model(node, file_path):
 
-    # Get the root directory of the project
-    project_root = os.path.dirname(file_path)
-
-    # Add the project root to sys.path
-    if project_root not in sys.path:
-        sys.path.insert(0, project_root)
-
-    # Dynamically import the module
-    module_name = os.path.splitext(os.path.basename(file_path))[0]
-    spec = importlib.util.spec_from_file_location(module_name, file_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[spec.name] = module
-    spec.loader.exec_module(module)
+    # Load the module, the registry executes it once for all of its classes
+    module = load_module_from_path(file_path)
 
     # Get the class from the module
     model_class = getattr(module, node.name, None)
@@ -141,22 +114,45 @@ def is_pydantic_model(node, file_path):
 
 def find_pydantic_models_in_models_folders(root_path) -> Dict[str, str]:
     models = {}
-    for root, dirs, files in os.walk(root_path):
-        if 'models' in root.split(os.sep):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_content = f.read()
-                        try:
-                            tree = ast.parse(file_content)
-                            for node in ast.walk(tree):
-                                if isinstance(node, ast.ClassDef) and is_pydantic_model(node, file_path):
-                                    # Include both file name and class name in the model identifier
-                                    model_identifier = f"{file.split('.')[0]}.{node.name}"
-                                    models[model_identifier] = file_path
-                        except SyntaxError:
-                            continue
+    index = get_discovery_index()
+    resolver = get_model_inheritance_resolver([root_path, get_parent_project_root() or root_path])
+    model_files = files_within(get_project_index(root_path).model_files, root_path)
+
+    indexed = {}
+    for file_path in model_files:
+        entry = index.lookup("models", file_path) if index else None
+        # A model's verdict also depends on the files its base classes come from
+        if entry is not None and resolver.dependencies_unchanged(entry["dependencies"]):
+            indexed[file_path] = entry
+    # Parse every file the index can't answer for in one batch, in parallel for large projects
+    summaries = analyze_files([file_path for file_path in model_files if file_path not in indexed])
+
+    for file_path in model_files:
+        file = os.path.basename(file_path)
+        if file_path in indexed:
+            index.skipped("models", file_path)
+            model_names = indexed[file_path]["names"]
+        else:
+            fingerprint = fingerprint_file(file_path)
+            start = time.perf_counter()
+            if summaries[file_path].error:
+                continue
+            file_verdicts = resolver.resolve_file(file_path)
+            # Only classes the resolver can't decide statically need the module, which is imported once
+            model_names = [
+                class_summary.name for class_summary in summaries[file_path].classes
+                if class_summary.top_level and (
+                    file_verdicts.verdicts.get(class_summary.name)
+                    or (file_verdicts.verdicts.get(class_summary.name) is None and is_pydantic_model(class_summary, file_path))
+                )
+            ]
+            if index:
+                data = {"names": model_names, "dependencies": file_verdicts.dependencies}
+                index.store("models", file_path, data, time.perf_counter() - start, fingerprint)
+        for model_name in model_names:
+            # Include both file name and class name in the model identifier
+            model_identifier = f"{file.split('.')[0]}.{model_name}"
+            models[model_identifier] = file_path
     models = dict(sorted(models.items()))
     return models
 
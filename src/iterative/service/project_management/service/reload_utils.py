@@ -0,0 +1,152 @@
+import os
+import sys
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from iterative.service.project_management.service.analysis_utils import analyze_files
+from iterative.service.project_management.service.module_registry import QUALIFIED_NAME_PREFIX, get_module_registry
+from iterative.service.project_management.service.scan_utils import is_path_within
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+# The framework itself is never reloaded, only the project's modules
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+class ModuleReload(NamedTuple):
+    reloaded: Tuple[str, ...]  # Files executed again through the module registry
+    unloaded: Tuple[str, ...]  # Names dropped from sys.modules, imported again by whoever needs them next
+    removed: Tuple[str, ...]  # Deleted files whose module was forgotten
+
+
+def _module_file(module) -> Optional[str]:
+    path = getattr(module, "__file__", None)
+    return os.path.abspath(path) if isinstance(path, str) else None
+
+
+def find_user_modules(roots: Iterable[str], ignore: Iterable[str] = ()) -> Dict[str, List[str]]:
+    """
+    Returns the names in `sys.modules` of every loaded project module, by file. Those are the modules the
+    module registry loaded and the modules imported by name from the project folders.
+    """
+    roots = [os.path.abspath(root) for root in roots]
+    ignore = set(ignore)
+    registry = get_module_registry()
+    modules: Dict[str, List[str]] = {path: [] for path in registry.loaded_paths()}
+    for name, module in list(sys.modules.items()):
+        path = _module_file(module)
+        if path is None:
+            continue
+        if path not in modules:
+            if is_path_within(path, PACKAGE_ROOT) or not any(is_path_within(path, root) for root in roots):
+                continue
+            folders = os.path.dirname(path).split(os.sep)
+            if any(folder in ignore or folder.startswith(".") for folder in folders if folder):
+                continue
+        modules.setdefault(path, []).append(name)
+    return modules
+
+
+def _imported_names(imported: str, package: str) -> Set[str]:
+    """
+    Returns the module names an import may refer to. `from a.b import c` is recorded as `a.b.c`, which is
+    either the module `a.b.c` or the name `c` in `a.b`.
+    """
+    if imported.startswith("."):
+        level = len(imported) - len(imported.lstrip("."))
+        parts = package.split(".") if package else []
+        if level - 1 > len(parts):
+            return set()
+        base = parts[:len(parts) - (level - 1)]
+        imported = ".".join(base + [part for part in imported.lstrip(".").split(".") if part])
+    parts = imported.split(".")
+    return {".".join(parts[:end]) for end in range(1, len(parts) + 1)}
+
+
+def find_dependents(changed_paths: Iterable[str], modules: Dict[str, List[str]]) -> Set[str]:
+    """
+    Returns the loaded module files among the changed files, plus the loaded files importing them, directly
+    or through other project modules.
+    """
+    changed_paths = {os.path.abspath(path) for path in changed_paths}
+    owners: Dict[str, str] = {name: path for path, names in modules.items() for name in names}
+    summaries = analyze_files(path for path in modules if os.path.exists(path))
+
+    dependents: Dict[str, Set[str]] = {}
+    for path, summary in summaries.items():
+        module = next((sys.modules.get(name) for name in modules[path] if name in sys.modules), None)
+        package = getattr(module, "__package__", None) or ""
+        for imported in summary.imports:
+            for name in _imported_names(imported, package):
+                owner = owners.get(name)
+                if owner is not None and owner != path:
+                    dependents.setdefault(owner, set()).add(path)
+
+    affected = {path for path in changed_paths if path in modules}
+    pending = list(affected)
+    while pending:
+        for dependent in dependents.get(pending.pop(), ()):
+            if dependent not in affected:
+                affected.add(dependent)
+                pending.append(dependent)
+    return affected
+
+
+def check_syntax(paths: Iterable[str]):
+    """
+    Compile the files that exist, so a typo is reported before any module is touched.
+
+    Raises:
+        SyntaxError: If a file doesn't compile.
+    """
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                source = f.read()
+        except FileNotFoundError:
+            continue
+        compile(source, path, "exec")
+
+
+def reload_user_modules(changed_paths: Iterable[str], roots: Iterable[str], ignore: Iterable[str] = ()) -> ModuleReload:
+    """
+    Re-execute the changed project modules and every project module importing them, leaving the others alone.
+
+    Modules the registry loaded are executed again right away, in the order they were first loaded. Modules
+    imported by name are dropped from `sys.modules`, so the re-executed modules import their new version.
+    If executing a module fails, the dropped modules are put back and the error is raised.
+
+    Raises:
+        SyntaxError: If a changed file doesn't compile, nothing is reloaded then.
+    """
+    changed_paths = [os.path.abspath(path) for path in changed_paths]
+    check_syntax(changed_paths)
+
+    registry = get_module_registry()
+    modules = find_user_modules(roots, ignore)
+    affected = find_dependents(changed_paths, modules)
+    registry_paths = [path for path in registry.loaded_paths() if path in affected]
+
+    dropped = {}
+    for path in affected:
+        for name in modules[path]:
+            # The registry replaces the modules it loaded itself
+            if name.startswith(QUALIFIED_NAME_PREFIX):
+                continue
+            module = sys.modules.pop(name, None)
+            if module is not None:
+                dropped[name] = module
+
+    reloaded, removed = [], []
+    try:
+        for path in registry_paths:
+            if os.path.exists(path):
+                registry.reload(path)
+                reloaded.append(path)
+            else:
+                registry.invalidate(path)
+                removed.append(path)
+    except BaseException:
+        for name, module in dropped.items():
+            sys.modules[name] = module
+        raise
+    return ModuleReload(tuple(reloaded), tuple(sorted(dropped)), tuple(removed))
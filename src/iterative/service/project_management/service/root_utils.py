@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+ITERATIVE_FOLDER = ".iterative"
+CONFIG_FILE = os.path.join(ITERATIVE_FOLDER, "config.yaml")
+
+# Seconds a stat result or a resolved root is trusted before the filesystem is asked again
+STAT_CACHE_TTL = 2.0
+# Most stat results, and resolved directories per lookup kind, kept before the least recently used are dropped
+STAT_CACHE_MAXSIZE = 4096
+
+
+class ProjectRootResolver:
+    """
+    Finds the iterative projects above a directory with as few `stat` calls as possible.
+
+    Existence checks go through a short-lived stat cache shared by every lookup, and each resolved
+    directory remembers its answer, so walking up from a sibling or a child stops at the first directory
+    already resolved. Both caches keep at most `maxsize` entries, least recently stored first out. Call
+    `invalidate()` when a `.iterative` folder is created or removed.
+    """
+
+    def __init__(self, ttl: float = STAT_CACHE_TTL, maxsize: int = STAT_CACHE_MAXSIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._exists: "OrderedDict[str, Tuple[float, bool]]" = OrderedDict()
+        # (marker, kind) -> directory -> (expires_at, result)
+        self._roots: Dict[Tuple[str, str], "OrderedDict[str, Tuple[float, Optional[str]]]"] = {}
+        self.stat_calls = 0
+
+    def _store(self, cache: OrderedDict, path: str, value: tuple):
+        with self._lock:
+            cache[path] = value
+            cache.move_to_end(path)
+            while len(cache) > self.maxsize:
+                cache.popitem(last=False)
+
+    def exists(self, path: str) -> bool:
+        now = time.monotonic()
+        cached = self._exists.get(path)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        self.stat_calls += 1
+        exists = os.path.exists(path)
+        self._store(self._exists, path, (now + self.ttl, exists))
+        return exists
+
+    def _memo(self, marker: str, kind: str) -> "OrderedDict[str, Tuple[float, Optional[str]]]":
+        with self._lock:
+            return self._roots.setdefault((marker, kind), OrderedDict())
+
+    def nearest(self, start_path: str, marker: str = ITERATIVE_FOLDER, include_root: bool = False) -> Optional[str]:
+        """
+        Returns the closest directory at or above `start_path` that contains `marker`.
+
+        Args:
+            start_path (str): The directory to start from.
+            marker (str): The path, relative to each directory, whose existence marks the match.
+            include_root (bool): Whether the filesystem root itself is checked.
+        """
+        memo = self._memo(marker, "nearest" if not include_root else "nearest_with_root")
+        now = time.monotonic()
+        path = os.path.abspath(start_path)
+        visited = []
+        result = None
+        while True:
+            cached = memo.get(path)
+            if cached is not None and cached[0] > now:
+                result = cached[1]
+                break
+            parent_path = os.path.dirname(path)
+            is_root = parent_path == path
+            if (not is_root or include_root) and self.exists(os.path.join(path, marker)):
+                result = path
+                break
+            visited.append(path)
+            if is_root:
+                break
+            path = parent_path
+
+        expires_at = now + self.ttl
+        for visited_path in visited:
+            self._store(memo, visited_path, (expires_at, result))
+        if result is not None:
+            self._store(memo, result, (expires_at, result))
+        return result
+
+    def outermost(self, start_path: str, marker: str = ITERATIVE_FOLDER) -> Optional[str]:
+        """
+        Returns the directory furthest up from `start_path`, filesystem root included, that contains `marker`.
+        """
+        memo = self._memo(marker, "outermost")
+        now = time.monotonic()
+        path = os.path.abspath(start_path)
+        chain = []
+        result = None
+        while True:
+            cached = memo.get(path)
+            if cached is not None and cached[0] > now:
+                result = cached[1]
+                break
+            chain.append(path)
+            parent_path = os.path.dirname(path)
+            if parent_path == path:
+                break
+            path = parent_path
+
+        # A directory's outermost project is its ancestors' one if they have any, else itself if it is one
+        expires_at = now + self.ttl
+        for chain_path in reversed(chain):
+            if result is None and self.exists(os.path.join(chain_path, marker)):
+                result = chain_path
+            self._store(memo, chain_path, (expires_at, result))
+        return result
+
+    def is_project(self, directory: str) -> bool:
+        return self.exists(os.path.join(os.path.abspath(directory), ITERATIVE_FOLDER))
+
+    def invalidate(self, path: str = None):
+        """
+        Forget cached lookups. With a path, only stat results at or below it are dropped, resolved roots are
+        always dropped since any of them may depend on it.
+        """
+        with self._lock:
+            self._roots.clear()
+            if path is None:
+                self._exists.clear()
+                return
+            path = os.path.abspath(path).rstrip(os.sep) or os.sep
+            prefix = path if path.endswith(os.sep) else path + os.sep
+            for cached_path in list(self._exists):
+                if cached_path == path or cached_path.startswith(prefix):
+                    del self._exists[cached_path]
+
+
+_resolver = ProjectRootResolver()
+
+
+def get_project_root_resolver() -> ProjectRootResolver:
+    return _resolver
+
+
+def invalidate_project_roots(path: str = None):
+    """
+    Call after creating or removing a `.iterative` folder so the project helpers see it right away.
+    """
+    _resolver.invalidate(path)
@@ -0,0 +1,289 @@
+import fnmatch
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from iterative.service.project_management.models.project_models import ProjectFile, ProjectFolder, ProjectIndex
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+ITERATIVE_FOLDER = ".iterative"
+API_FOLDER = "api"
+
+
+def is_path_within(path: str, directory: str) -> bool:
+    """
+    This function checks if a path is the directory itself or lies somewhere below it.
+    """
+    return path == directory or path.startswith(directory.rstrip(os.sep) + os.sep)
+
+
+class GitIgnore:
+    """
+    The patterns of one `.gitignore` file, matched against paths relative to the folder holding it.
+    Supports comments, negation, trailing `/` for directories, anchored patterns and leading `**/`.
+    """
+
+    def __init__(self, base_path: str, lines: Iterable[str]):
+        self.base_path = base_path
+        # (pattern, negated, directory_only, match_on) where match_on is "name", "path" or "any_depth"
+        self.patterns: List[Tuple[str, bool, bool, str]] = []
+        for line in lines:
+            line = line.rstrip("\n").strip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            directory_only = line.endswith("/")
+            line = line.rstrip("/")
+            if line.startswith("**/"):
+                line = line[3:]
+                match_on = "any_depth" if "/" in line else "name"
+            elif "/" in line:
+                # A slash at the start or in the middle anchors the pattern to the .gitignore's folder
+                match_on = "path"
+                line = line.lstrip("/")
+            else:
+                match_on = "name"
+            if line:
+                self.patterns.append((line, negated, directory_only, match_on))
+
+    @classmethod
+    def from_folder(cls, folder: str) -> Optional["GitIgnore"]:
+        path = os.path.join(folder, ".gitignore")
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                return cls(folder, f.readlines())
+        except OSError:
+            return None
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Returns True if the path is ignored, False if it is explicitly re-included and None if no pattern matches.
+        """
+        relative_path = os.path.relpath(path, self.base_path).replace(os.sep, "/")
+        name = os.path.basename(path)
+        result = None
+        for pattern, negated, directory_only, match_on in self.patterns:
+            if directory_only and not is_dir:
+                continue
+            if match_on == "name":
+                matched = fnmatch.fnmatchcase(name, pattern)
+            elif match_on == "path":
+                matched = fnmatch.fnmatchcase(relative_path, pattern)
+            else:
+                matched = fnmatch.fnmatchcase(relative_path, pattern) or fnmatch.fnmatchcase(relative_path, f"*/{pattern}")
+            if matched:
+                result = not negated
+        return result
+
+
+def _is_ignored(path: str, is_dir: bool, gitignores: List[GitIgnore]) -> bool:
+    ignored = False
+    for gitignore in gitignores:
+        result = gitignore.match(path, is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
+
+
+def scan_project(root_path: str, ignore: Optional[Iterable[str]] = None) -> Tuple[ProjectIndex, Dict[str, int]]:
+    """
+    Walk the project once with `os.scandir` and sort every file discovery cares about into a ProjectIndex.
+
+    Hidden folders, folders named in `ignore` and anything matched by a `.gitignore` are never entered.
+
+    Args:
+        root_path (str): The folder to scan.
+        ignore (Iterable[str], optional): Folder names to skip. Defaults to the `scan_ignore` config value.
+
+    Returns:
+        Tuple[ProjectIndex, Dict[str, int]]: The index and the mtime of every scanned folder, used to tell when
+        the scan is out of date.
+    """
+    if ignore is None:
+        from iterative.config import get_config
+        ignore = get_config().get("scan_ignore") or []
+    ignore = set(ignore)
+    root_path = os.path.abspath(root_path)
+
+    projects: List[str] = []
+    python_files: List[str] = []
+    action_files: List[str] = []
+    api_files: Dict[str, List[str]] = {}
+    model_files: List[str] = []
+    docs: List[str] = []
+    streamlits: List[str] = []
+    folder_mtimes: Dict[str, int] = {}
+
+    # (folder, gitignores in effect, project whose api folder holds it)
+    stack = [(root_path, [], None)]
+    while stack:
+        folder, gitignores, api_project = stack.pop()
+        try:
+            with os.scandir(folder) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+            folder_mtimes[folder] = os.stat(folder).st_mtime_ns
+        except OSError as e:
+            logger.debug(f"Skipping unreadable folder {folder}: {e}")
+            continue
+
+        names = {entry.name for entry in entries}
+        if ".gitignore" in names:
+            gitignore = GitIgnore.from_folder(folder)
+            if gitignore:
+                gitignores = gitignores + [gitignore]
+
+        is_project = ITERATIVE_FOLDER in names
+        if is_project:
+            projects.append(folder)
+
+        folder_parts = folder.split(os.sep)
+        in_models = ProjectFolder.MODELS.value in folder_parts
+        in_docs = ProjectFolder.DOCS.value in folder_parts
+        in_streamlits = ProjectFolder.STREAMLITS.value in folder_parts
+
+        subfolders = []
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                if name.startswith(".") or name in ignore or _is_ignored(entry.path, True, gitignores):
+                    continue
+                sub_api_project = folder if is_project and name == API_FOLDER else api_project
+                subfolders.append((entry.path, gitignores, sub_api_project))
+                continue
+
+            if name.endswith(".py"):
+                if gitignores and _is_ignored(entry.path, False, gitignores):
+                    continue
+                python_files.append(entry.path)
+                if name.endswith(ProjectFile.ACTION_POSTFIX.value):
+                    action_files.append(entry.path)
+                if api_project:
+                    api_files.setdefault(api_project, []).append(entry.path)
+                if in_models:
+                    model_files.append(entry.path)
+                if in_streamlits and not name.startswith("__"):
+                    streamlits.append(entry.path)
+            elif name.endswith(".md") and in_docs:
+                if gitignores and _is_ignored(entry.path, False, gitignores):
+                    continue
+                docs.append(entry.path)
+
+        # Reversed so folders are popped in name order, giving the same top-down order as os.walk
+        stack.extend(reversed(subfolders))
+
+    project_index = ProjectIndex(
+        root_path=root_path,
+        projects=projects,
+        python_files=python_files,
+        action_files=action_files,
+        api_files=api_files,
+        model_files=model_files,
+        docs=docs,
+        streamlits=streamlits,
+    )
+    return project_index, folder_mtimes
+
+
+class _ScanCacheEntry:
+    __slots__ = ("project_index", "folder_mtimes", "checked_at")
+
+    def __init__(self, project_index: ProjectIndex, folder_mtimes: Dict[str, int]):
+        self.project_index = project_index
+        self.folder_mtimes = folder_mtimes
+        self.checked_at = time.monotonic()
+
+    def is_fresh(self, ttl: float) -> bool:
+        now = time.monotonic()
+        if now - self.checked_at < ttl:
+            return True
+        # Adding, removing or renaming a file changes the mtime of its folder
+        for folder, mtime_ns in self.folder_mtimes.items():
+            try:
+                if os.stat(folder).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        self.checked_at = now
+        return True
+
+    def covers(self, path: str) -> bool:
+        """
+        Returns whether the scan entered the folder of the path. Folders below a pruned one, like a
+        virtualenv inside the project, aren't in it.
+        """
+        folder = path if os.path.isdir(path) else os.path.dirname(path)
+        return not os.path.isdir(folder) or folder in self.folder_mtimes
+
+
+_project_indexes: Dict[str, _ScanCacheEntry] = {}
+
+
+def get_project_index(path: str = None) -> ProjectIndex:
+    """
+    Returns a ProjectIndex covering the given path, scanning at most once per project.
+
+    A path inside the outermost iterative project is served from a scan of that whole project, so every
+    finder shares one walk. Other paths, and paths below a folder the project scan pruned, are scanned on
+    their own. Cached scans are re-validated against folder mtimes once they are older than the
+    `scan_cache_ttl` config value.
+    """
+    from iterative.config import get_config
+    from iterative.service.project_management.service.project_utils import get_parent_project_root
+
+    path = os.path.abspath(path or os.getcwd())
+    ttl = get_config().get("scan_cache_ttl", 2.0) or 0.0
+
+    for root_path, entry in list(_project_indexes.items()):
+        if is_path_within(path, root_path):
+            if not entry.is_fresh(ttl):
+                del _project_indexes[root_path]
+            elif entry.covers(path):
+                return entry.project_index
+
+    root_path = get_parent_project_root()
+    if not root_path or not is_path_within(path, root_path):
+        root_path = path
+    entry = _scan(root_path)
+    if root_path != path and not entry.covers(path):
+        # e.g. the package's default actions in a virtualenv inside the project, which the project scan skips
+        entry = _scan(path)
+    return entry.project_index
+
+
+def _scan(root_path: str) -> _ScanCacheEntry:
+    start = time.perf_counter()
+    project_index, folder_mtimes = scan_project(root_path)
+    logger.debug(
+        f"Scanned {root_path} in {time.perf_counter() - start:.3f}s: "
+        f"{len(folder_mtimes)} folders, {len(project_index.python_files)} python files"
+    )
+    entry = _project_indexes[root_path] = _ScanCacheEntry(project_index, folder_mtimes)
+    return entry
+
+
+def invalidate_project_index(path: str = None):
+    """
+    Drop cached scans. With a path, only the scans covering it are dropped.
+    """
+    if path is None:
+        _project_indexes.clear()
+        return
+    path = os.path.abspath(path)
+    for root_path in list(_project_indexes):
+        if is_path_within(path, root_path) or is_path_within(root_path, path):
+            del _project_indexes[root_path]
+
+
+def files_within(files: Iterable[str], directory: str) -> List[str]:
+    """
+    Returns the files that lie below the given directory.
+    """
+    directory = os.path.abspath(directory)
+    return [file for file in files if is_path_within(file, directory)]
@@ -1,6 +1,7 @@
 import shutil
 import os
 from iterative.service.project_management.service.project_utils import get_project_root, get_parent_project_root
+from iterative.service.project_management.service.root_utils import invalidate_project_roots
 from iterative.service.service_management.service.service_utils import get_service_name
 import yaml
 from logging import getLogger
@@ -25,6 +26,8 @@ def copy_template_to_target(template_dir: str, target_dir: str):
                 shutil.copytree(source_item, target_item, dirs_exist_ok=True)
             else:
                 shutil.copy(source_item, target_item)
+        # The template may have brought a .iterative folder with it
+        invalidate_project_roots(target_dir)
     except Exception as e:
         logger.error(f"Error copying template to target: {e}")
         raise
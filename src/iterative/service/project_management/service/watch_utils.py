@@ -0,0 +1,273 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterable, List, Set, Tuple
+from iterative.service.project_management.service.scan_utils import GitIgnore, _is_ignored
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+WATCHED_SUFFIXES = (".py",)
+
+# From <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def is_watched_file(path: str) -> bool:
+    return path.endswith(WATCHED_SUFFIXES)
+
+
+def iter_watched_folders(roots: Iterable[str], ignore: Iterable[str] = ()) -> List[Tuple[str, List[GitIgnore]]]:
+    """
+    Returns every folder below the roots with the `.gitignore` files in effect for it. Hidden folders,
+    folders named in `ignore` and folders a `.gitignore` matches are skipped, like the project scanner does.
+    """
+    ignore = set(ignore)
+    folders = []
+    seen = set()
+    stack = [(os.path.abspath(root), []) for root in reversed(list(roots))]
+    while stack:
+        folder, gitignores = stack.pop()
+        if folder in seen:
+            continue
+        seen.add(folder)
+        try:
+            with os.scandir(folder) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        if any(entry.name == ".gitignore" for entry in entries):
+            gitignore = GitIgnore.from_folder(folder)
+            if gitignore:
+                gitignores = gitignores + [gitignore]
+        folders.append((folder, gitignores))
+
+        subfolders = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if not is_dir or entry.name.startswith(".") or entry.name in ignore:
+                continue
+            if gitignores and _is_ignored(entry.path, True, gitignores):
+                continue
+            subfolders.append((entry.path, gitignores))
+        stack.extend(reversed(subfolders))
+    return folders
+
+
+class FileWatcher:
+    """
+    Reports the watched files created, changed or deleted below the roots.
+
+    Args:
+        roots (Iterable[str]): The folders to watch, recursively.
+        ignore (Iterable[str], optional): Folder names never watched, on top of hidden and gitignored folders.
+    """
+
+    backend = None
+
+    def __init__(self, roots: Iterable[str], ignore: Iterable[str] = ()):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.ignore = set(ignore)
+
+    def wait(self, timeout: float) -> Set[str]:
+        """
+        Block until files change or `timeout` seconds pass, and return the paths of the changed files.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def _is_ignored_file(self, path: str, gitignores: List[GitIgnore]) -> bool:
+        return not is_watched_file(path) or bool(gitignores and _is_ignored(path, False, gitignores))
+
+
+class PollingWatcher(FileWatcher):
+    """
+    Compares the mtime and size of every watched file on each poll. Works everywhere, but its cost grows
+    with the number of files.
+    """
+
+    backend = "poll"
+
+    def __init__(self, roots: Iterable[str], ignore: Iterable[str] = (), interval: float = 0.5):
+        super().__init__(roots, ignore)
+        self.interval = interval
+        self._stats = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        stats = {}
+        for folder, gitignores in iter_watched_folders(self.roots, self.ignore):
+            try:
+                with os.scandir(folder) as it:
+                    for entry in it:
+                        if entry.is_file() and not self._is_ignored_file(entry.path, gitignores):
+                            stat = entry.stat()
+                            stats[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return stats
+
+    def wait(self, timeout: float) -> Set[str]:
+        deadline = time.monotonic() + timeout
+        while True:
+            stats = self._snapshot()
+            changed = {path for path in stats.keys() | self._stats.keys() if stats.get(path) != self._stats.get(path)}
+            self._stats = stats
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+
+class InotifyWatcher(FileWatcher):
+    """
+    Gets change events from the Linux kernel through inotify, called with ctypes. Waiting costs nothing
+    however many files are watched, only the folders holding them are registered.
+    """
+
+    backend = "inotify"
+
+    def __init__(self, roots: Iterable[str], ignore: Iterable[str] = ()):
+        super().__init__(roots, ignore)
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError("inotify is not available on this platform")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._folders: Dict[int, Tuple[str, List[GitIgnore]]] = {}  # watch descriptor -> (folder, gitignores)
+        for root in self.roots:
+            self._add_tree(root, [])
+
+    def _add_tree(self, root: str, gitignores: List[GitIgnore]) -> Set[str]:
+        """
+        Watch a folder and its subfolders. Returns the watched files already in them, which a folder created
+        while the watcher runs may hold before its watch is added.
+        """
+        files = set()
+        for folder, folder_gitignores in iter_watched_folders([root], self.ignore):
+            folder_gitignores = gitignores + folder_gitignores
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), WATCH_MASK)
+            if wd < 0:
+                logger.warning(f"Can't watch {folder}: {os.strerror(ctypes.get_errno())}")
+                continue
+            self._folders[wd] = (folder, folder_gitignores)
+            try:
+                with os.scandir(folder) as it:
+                    files.update(entry.path for entry in it if entry.is_file() and not self._is_ignored_file(entry.path, folder_gitignores))
+            except OSError:
+                pass
+        return files
+
+    def wait(self, timeout: float) -> Set[str]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            changed |= self._parse_events(data)
+        return changed
+
+    def _parse_events(self, data: bytes) -> Set[str]:
+        changed = set()
+        overflowed = False
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                overflowed = True
+                continue
+            watched = self._folders.get(wd)
+            if watched is None:
+                continue
+            if mask & IN_IGNORED:
+                # The folder was deleted or moved away
+                del self._folders[wd]
+                continue
+            folder, gitignores = watched
+            path = os.path.join(folder, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    folder_name = os.path.basename(path)
+                    if not (folder_name.startswith(".") or folder_name in self.ignore or (gitignores and _is_ignored(path, True, gitignores))):
+                        changed |= self._add_tree(path, gitignores)
+                continue
+            if name and not self._is_ignored_file(path, gitignores):
+                changed.add(path)
+        if overflowed:
+            logger.warning("Missed file change events, the kernel queue overflowed. Reporting every watched file.")
+            changed |= self._rescan()
+        return changed
+
+    def _rescan(self) -> Set[str]:
+        # Watches folders created while events were lost, adding a folder watched already keeps its watch
+        files = set()
+        for root in self.roots:
+            files |= self._add_tree(root, [])
+        return files
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def create_file_watcher(roots: Iterable[str], backend: str = "auto", ignore: Iterable[str] = (),
+                        poll_interval: float = 0.5) -> FileWatcher:
+    """
+    Returns a watcher for the roots.
+
+    Args:
+        backend (str): "inotify", "poll", or "auto" for inotify where the platform has it and polling elsewhere.
+    """
+    roots = list(roots)
+    if backend in ("auto", "inotify"):
+        try:
+            return InotifyWatcher(roots, ignore)
+        except OSError as e:
+            if backend == "inotify":
+                raise
+            logger.debug(f"Falling back to polling for file changes: {e}")
+    elif backend != "poll":
+        raise ValueError(f"Unknown file watcher backend {backend!r}, expected 'auto', 'inotify' or 'poll'")
+    return PollingWatcher(roots, ignore, poll_interval)
@@ -0,0 +1,73 @@
+import pickle
+from iterative.service.project_management.service import analysis_utils
+from iterative.service.project_management.service.analysis_utils import analyze_files, analyze_source
+
+SOURCE = '''
+from fastapi import APIRouter
+from .models import User
+
+router = APIRouter()
+
+
+class UserModel(BaseModel):
+    class Config:
+        pass
+
+
+async def get_user(user_id: str, verbose: bool = False) -> dict:
+    """Fetch a user."""
+    def helper():
+        pass
+'''
+
+
+def test_analyze_source_summarizes_file():
+    summary = analyze_source(SOURCE, "users_api.py")
+
+    assert summary.error is None
+    assert [(c.name, c.bases, c.top_level) for c in summary.classes] == [
+        ("UserModel", ("BaseModel",), True),
+        ("Config", (), False),
+    ]
+    function = summary.functions[0]
+    assert (function.name, function.is_async, function.docstring) == ("get_user", True, "Fetch a user.")
+    assert function.signature == "(user_id: str, verbose: bool=False) -> dict"
+    assert summary.function_names == ("helper",)
+    assert summary.router_names == ("router",)
+    assert summary.imports == ("fastapi.APIRouter", ".models.User")
+    assert pickle.loads(pickle.dumps(summary)) == summary
+
+
+def test_parallel_and_sequential_analysis_agree(tmp_path, monkeypatch):
+    paths = []
+    for i in range(12):
+        path = tmp_path / f"module_{i}.py"
+        path.write_text(f"class Model{i}(Base):\n    pass\n\ndef action_{i}(x: int = {i}):\n    return x\n")
+        paths.append(str(path))
+    broken = tmp_path / "broken.py"
+    broken.write_text("def broken(:\n")
+    paths.append(str(broken))
+
+    sequential = analyze_files(paths, workers=1)
+    monkeypatch.setattr(analysis_utils, "_summaries", {})
+    monkeypatch.setattr(analysis_utils, "PARALLEL_THRESHOLD", 1)
+    parallel = analyze_files(paths, workers=2)
+
+    assert list(parallel) == paths
+    assert parallel == sequential
+    assert parallel[str(broken)].error.startswith("SyntaxError")
+
+
+def test_router_factories_are_not_skipped():
+    from iterative.service.api_management.service.api_utils import may_define_router
+
+    factory = analyze_source("from .crud import make_crud\nfrom .models import User\n\nusers = make_crud(User)\n", "users_api.py")
+    assert factory.call_assignments == ("users",)
+    assert may_define_router(factory)
+    # A router built in another project module and imported under any name
+    assert may_define_router(analyze_source("from app.crud import users\n", "users_api.py"))
+    assert may_define_router(analyze_source("from .crud import users\n", "users_api.py"))
+
+    helpers = analyze_source("import os\nfrom typing import List\nfrom fastapi import Depends\n\nLIMIT = 10\n\ndef f():\n    x = g()\n", "helpers.py")
+    assert helpers.call_assignments == ()
+    assert not may_define_router(helpers)
@@ -0,0 +1,41 @@
+import os
+from iterative.service.project_management.service.index_utils import DiscoveryIndex
+
+
+def _write(path, content):
+    path.write_text(content)
+    return str(path)
+
+
+def test_lookup_hits_unchanged_file_and_misses_changed_file(tmp_path):
+    actions_file = _write(tmp_path / "hello_actions.py", "def hello():\n    pass\n")
+    index = DiscoveryIndex(str(tmp_path))
+
+    assert index.lookup("actions", actions_file) is None
+    index.store("actions", actions_file, ["hello"], elapsed=0.5)
+    assert index.lookup("actions", actions_file) == ["hello"]
+
+    _write(tmp_path / "hello_actions.py", "def hello():\n    pass\n\ndef bye():\n    pass\n")
+    assert index.lookup("actions", actions_file) is None
+    assert index.report()["hits"] == {"actions": 1}
+    assert index.report()["misses"] == {"actions": 2}
+
+
+def test_touched_file_with_same_content_is_still_a_hit(tmp_path):
+    models_file = _write(tmp_path / "user.py", "class User: ...\n")
+    index = DiscoveryIndex(str(tmp_path))
+    index.store("models", models_file, ["User"])
+
+    stat = os.stat(models_file)
+    os.utime(models_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+    assert index.lookup("models", models_file) == ["User"]
+
+
+def test_index_persists_between_instances(tmp_path):
+    router_file = _write(tmp_path / "health.py", "router = None\n")
+    index = DiscoveryIndex(str(tmp_path))
+    index.store("routers", router_file, ["router"])
+    index.save()
+
+    assert os.path.exists(os.path.join(str(tmp_path), ".iterative", "cache", "discovery_index.json"))
+    assert DiscoveryIndex(str(tmp_path)).lookup("routers", router_file) == ["router"]
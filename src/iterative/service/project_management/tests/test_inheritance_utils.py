@@ -0,0 +1,55 @@
+import os
+from iterative.service.project_management.service.analysis_utils import analyze_source
+from iterative.service.project_management.service.inheritance_utils import ModelInheritanceResolver
+
+
+def write(path, source):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(source)
+
+
+def test_resolves_base_chains_across_files(tmp_path):
+    write(tmp_path / "models" / "base.py", "from pydantic import BaseModel\n\nclass Base(BaseModel):\n    pass\n")
+    write(tmp_path / "models" / "user.py", (
+        "from enum import Enum\n"
+        "import iterative\n"
+        "from .base import Base as Parent\n"
+        "from somewhere import Mixin\n"
+        "\n"
+        "class User(Parent):\n    pass\n"
+        "class Admin(User):\n    pass\n"
+        "class Item(iterative.IterativeModel):\n    pass\n"
+        "class Role(Enum):\n    ADMIN = 1\n"
+        "class Plain:\n    pass\n"
+        "class Unknown(Mixin):\n    pass\n"
+    ))
+
+    result = ModelInheritanceResolver([str(tmp_path)]).resolve_file(str(tmp_path / "models" / "user.py"))
+
+    assert result.verdicts == {
+        "User": True, "Admin": True, "Item": True, "Role": False, "Plain": False, "Unknown": None,
+    }
+    assert set(result.dependencies) == {str(tmp_path / "models" / "user.py"), str(tmp_path / "models" / "base.py")}
+
+
+def test_star_imports_are_undecided():
+    source = "from pydantic import *\n\nclass User(BaseModel):\n    pass\n"
+    summary = analyze_source(source, "user.py")
+    assert summary.has_star_import
+    assert ModelInheritanceResolver()._resolve_name(summary, "BaseModel", set(), {}) is None
+
+
+def test_result_is_refreshed_when_a_base_file_changes(tmp_path):
+    base_file = tmp_path / "base.py"
+    write(base_file, "from pydantic import BaseModel\n\nclass Base(BaseModel):\n    pass\n")
+    write(tmp_path / "user.py", "from base import Base\n\nclass User(Base):\n    pass\n")
+    resolver = ModelInheritanceResolver()
+
+    first = resolver.resolve_file(str(tmp_path / "user.py"))
+    assert resolver.resolve_file(str(tmp_path / "user.py")) is first
+    assert first.verdicts == {"User": True}
+
+    write(base_file, "class Base:\n    value: int = 0\n")
+    assert not resolver.dependencies_unchanged(first.dependencies)
+    assert resolver.resolve_file(str(tmp_path / "user.py")).verdicts == {"User": False}
@@ -0,0 +1,52 @@
+import os
+import pickle
+import sys
+from iterative.service.project_management.service.module_registry import ModuleRegistry, qualified_module_name
+
+
+def _write(path, content):
+    path.write_text(content)
+    return str(path)
+
+
+def test_module_is_executed_once_until_it_changes(tmp_path):
+    counter_file = _write(tmp_path / "counter.py", "import builtins\nbuiltins.registry_loads = getattr(builtins, 'registry_loads', 0) + 1\n")
+    registry = ModuleRegistry()
+
+    first = registry.load(counter_file)
+    assert registry.load(counter_file) is first
+    assert registry.stats()[0]["load_count"] == 1
+    assert registry.stats()[0]["hit_count"] == 1
+
+    stat = os.stat(counter_file)
+    os.utime(counter_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+    assert registry.load(counter_file) is not first
+    assert registry.stats()[0]["load_count"] == 2
+
+    assert registry.invalidate(counter_file)
+    assert qualified_module_name(counter_file) not in sys.modules
+    registry.load(counter_file)
+    assert registry.stats()[0]["load_count"] == 3
+
+
+def test_same_file_names_do_not_collide(tmp_path):
+    (tmp_path / "users").mkdir()
+    (tmp_path / "orders").mkdir()
+    users_models = _write(tmp_path / "users" / "models.py", "NAME = 'users'\n")
+    orders_models = _write(tmp_path / "orders" / "models.py", "NAME = 'orders'\n")
+    registry = ModuleRegistry()
+
+    assert registry.load(users_models).NAME == "users"
+    assert registry.load(orders_models).NAME == "orders"
+    assert sys.modules[qualified_module_name(users_models)].NAME == "users"
+    assert sys.modules[qualified_module_name(orders_models)].NAME == "orders"
+    # A user file named after a real package must not replace it
+    assert "models" not in sys.modules or sys.modules["models"].__file__ not in (users_models, orders_models)
+
+
+def test_loaded_classes_can_be_pickled(tmp_path):
+    point_file = _write(tmp_path / "point.py", "class Point:\n    def __init__(self, x):\n        self.x = x\n")
+    module = ModuleRegistry().load(point_file)
+
+    point = pickle.loads(pickle.dumps(module.Point(3)))
+    assert point.x == 3
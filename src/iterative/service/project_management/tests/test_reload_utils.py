@@ -0,0 +1,87 @@
+import os
+import sys
+import pytest
+from iterative.service.project_management.service.module_registry import get_module_registry
+from iterative.service.project_management.service.reload_utils import (
+    _imported_names,
+    find_dependents,
+    reload_user_modules,
+)
+
+
+def _write(path, content):
+    path.write_text(content)
+    stat = os.stat(path)
+    # Several writes within the same clock tick must still change the mtime
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+    return str(path)
+
+
+@pytest.fixture
+def project(tmp_path):
+    folder = tmp_path / "actions"
+    folder.mkdir()
+    paths = {
+        "constants": _write(folder / "reload_constants.py", "GREETING = 'Hello'\n"),
+        "helpers": _write(folder / "reload_helpers.py", "from reload_constants import GREETING\n\ndef greet(name):\n    return f'{GREETING} {name}'\n"),
+        "actions": _write(folder / "reload_greet_actions.py", "import reload_helpers\n\ndef greet(name: str) -> str:\n    return reload_helpers.greet(name)\n"),
+        "other": _write(folder / "reload_other_actions.py", "def other() -> int:\n    return 1\n"),
+    }
+    registry = get_module_registry()
+    yield paths, registry, folder
+    for path in paths.values():
+        registry.invalidate(path)
+    for name in ("reload_constants", "reload_helpers"):
+        sys.modules.pop(name, None)
+    sys.path[:] = [entry for entry in sys.path if entry != str(folder)]
+
+
+def test_imported_names():
+    assert _imported_names("a.b.c", "") == {"a", "a.b", "a.b.c"}
+    assert _imported_names(".models.User", "shop.api") == {"shop", "shop.api", "shop.api.models", "shop.api.models.User"}
+    assert _imported_names("..models", "shop.api") == {"shop", "shop.models"}
+
+
+def test_dependents_are_found_through_plain_modules(project):
+    paths, registry, folder = project
+    registry.load(paths["actions"])
+    registry.load(paths["other"])
+    modules = {
+        paths["actions"]: [],
+        paths["other"]: [],
+        paths["helpers"]: ["reload_helpers"],
+        paths["constants"]: ["reload_constants"],
+    }
+
+    assert find_dependents([paths["constants"]], modules) == {paths["constants"], paths["helpers"], paths["actions"]}
+    assert find_dependents([paths["other"]], modules) == {paths["other"]}
+    # Files no module was loaded from have no dependents
+    assert find_dependents(["/nowhere/new_actions.py"], modules) == set()
+
+
+def test_only_affected_modules_are_executed_again(project):
+    paths, registry, folder = project
+    actions = registry.load(paths["actions"])
+    other = registry.load(paths["other"])
+    assert actions.greet("Ada") == "Hello Ada"
+
+    _write(folder / "reload_constants.py", "GREETING = 'Hi'\n")
+    result = reload_user_modules([paths["constants"]], [str(folder)])
+
+    assert result.reloaded == (paths["actions"],)
+    assert set(result.unloaded) == {"reload_constants", "reload_helpers"}
+    assert registry.get(paths["actions"]).greet("Ada") == "Hi Ada"
+    assert registry.get(paths["other"]) is other
+
+
+def test_syntax_error_changes_nothing(project):
+    paths, registry, folder = project
+    actions = registry.load(paths["actions"])
+
+    _write(folder / "reload_constants.py", "GREETING = \n")
+    with pytest.raises(SyntaxError):
+        reload_user_modules([paths["constants"]], [str(folder)])
+
+    assert registry.get(paths["actions"]) is actions
+    assert "reload_constants" in sys.modules
+
@@ -0,0 +1,71 @@
+import os
+from iterative.service.project_management.service.root_utils import CONFIG_FILE, ProjectRootResolver
+
+
+def _make_project(path):
+    os.makedirs(os.path.join(path, ".iterative"))
+    return str(path)
+
+
+def test_resolves_nearest_and_outermost_roots(tmp_path):
+    outer = _make_project(tmp_path / "outer")
+    inner = _make_project(tmp_path / "outer" / "service" / "inner")
+    deep = os.path.join(inner, "api", "v1")
+    os.makedirs(deep)
+    resolver = ProjectRootResolver()
+
+    assert resolver.nearest(deep) == inner
+    assert resolver.outermost(deep) == outer
+    assert resolver.nearest(str(tmp_path)) is None
+    assert resolver.is_project(inner)
+    assert not resolver.is_project(deep)
+
+
+def test_repeated_lookups_reuse_cached_stats(tmp_path):
+    root = _make_project(tmp_path / "project")
+    folders = [os.path.join(root, "service", f"service_{i}") for i in range(20)]
+    for folder in folders:
+        os.makedirs(folder)
+    resolver = ProjectRootResolver()
+
+    resolver.nearest(folders[0])
+    first_lookup_calls = resolver.stat_calls
+    for folder in folders * 5:
+        assert resolver.nearest(folder) == root
+        assert resolver.outermost(folder) == root
+    # Each sibling costs one stat of its own, everything above it is memoized
+    assert resolver.stat_calls <= first_lookup_calls + 2 * len(folders) + 10
+
+
+def test_relative_paths_and_invalidation(tmp_path, monkeypatch):
+    os.makedirs(tmp_path / "app" / "models")
+    monkeypatch.chdir(tmp_path / "app" / "models")
+    resolver = ProjectRootResolver(ttl=60)
+
+    assert resolver.nearest(".") is None
+    _make_project(tmp_path / "app")
+    (tmp_path / "app" / ".iterative" / "config.yaml").write_text("reload: true\n")
+    # Cached for the ttl until told that a project appeared
+    assert resolver.nearest(".") is None
+    resolver.invalidate(str(tmp_path / "app"))
+    assert resolver.nearest(".") == str(tmp_path / "app")
+    assert resolver.nearest(".", marker=CONFIG_FILE, include_root=True) == str(tmp_path / "app")
+
+
+def test_caches_are_bounded(tmp_path):
+    root = _make_project(tmp_path / "project")
+    folders = [os.path.join(root, "service", f"service_{i}") for i in range(50)]
+    for folder in folders:
+        os.makedirs(folder)
+    resolver = ProjectRootResolver(ttl=60, maxsize=16)
+
+    for folder in folders:
+        assert resolver.nearest(folder) == root
+        assert resolver.outermost(folder) == root
+        assert not resolver.is_project(folder)
+    assert len(resolver._exists) == 16
+    assert all(len(memo) <= 16 for memo in resolver._roots.values())
+    # The most recent lookups are still served from the cache
+    stat_calls = resolver.stat_calls
+    assert resolver.nearest(folders[-1]) == root
+    assert resolver.stat_calls == stat_calls
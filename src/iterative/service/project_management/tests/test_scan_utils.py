@@ -0,0 +1,73 @@
+import pytest
+from iterative.service.action_management.service.action_utils import find_action_files
+from iterative.service.project_management.service.scan_utils import GitIgnore, get_project_index, invalidate_project_index, scan_project
+
+
+def _touch(root, relative_path, content=""):
+    path = root / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return str(path)
+
+
+def test_scan_project_sorts_files_into_the_index(tmp_path):
+    _touch(tmp_path, ".iterative/config.yaml")
+    action_file = _touch(tmp_path, "actions/hello_actions.py")
+    model_file = _touch(tmp_path, "models/user.py")
+    api_file = _touch(tmp_path, "api/user_api.py")
+    doc_file = _touch(tmp_path, "docs/index.md")
+    streamlit_file = _touch(tmp_path, "streamlits/dashboard.py")
+    _touch(tmp_path, "service/billing/.iterative/config.yaml")
+    nested_api_file = _touch(tmp_path, "service/billing/api/invoice_api.py")
+
+    project_index, folder_mtimes = scan_project(str(tmp_path), ignore=[])
+
+    root = str(tmp_path)
+    nested_project = str(tmp_path / "service" / "billing")
+    assert project_index.projects == [root, nested_project]
+    assert project_index.action_files == [action_file]
+    assert project_index.model_files == [model_file]
+    assert project_index.api_files == {root: [api_file], nested_project: [nested_api_file]}
+    assert project_index.docs == [doc_file]
+    assert project_index.streamlits == [streamlit_file]
+    assert root in folder_mtimes
+
+
+def test_scan_project_prunes_ignored_and_hidden_folders(tmp_path):
+    _touch(tmp_path, ".gitignore", "generated/\n/local_actions.py\n")
+    kept = _touch(tmp_path, "kept_actions.py")
+    _touch(tmp_path, "local_actions.py")
+    _touch(tmp_path, "generated/old_actions.py")
+    _touch(tmp_path, "node_modules/pkg/models/thing.py")
+    _touch(tmp_path, ".venv/lib/models/thing.py")
+
+    project_index, _ = scan_project(str(tmp_path), ignore=["node_modules"])
+
+    assert project_index.python_files == [kept]
+    assert project_index.model_files == []
+
+
+def test_gitignore_patterns():
+    gitignore = GitIgnore("/repo", ["*.log", "/build", "**/cache/tmp", "!keep.log", "# comment"])
+
+    assert gitignore.match("/repo/a/debug.log", False) is True
+    assert gitignore.match("/repo/a/keep.log", False) is False
+    assert gitignore.match("/repo/build", True) is True
+    assert gitignore.match("/repo/a/build", True) is None
+    assert gitignore.match("/repo/a/cache/tmp", True) is True
+
+
+@pytest.mark.parametrize("venv", [".venv", "venv"])
+def test_folders_the_project_scan_pruned_are_scanned_on_their_own(tmp_path, monkeypatch, venv):
+    _touch(tmp_path, ".iterative/config.yaml")
+    project_action = _touch(tmp_path, "actions/hello_actions.py")
+    default_action = _touch(tmp_path, f"{venv}/lib/site-packages/iterative/actions/project_actions.py")
+    defaults_directory = str(tmp_path / venv / "lib" / "site-packages" / "iterative" / "actions")
+    monkeypatch.chdir(tmp_path)
+    invalidate_project_index()
+    try:
+        assert get_project_index(str(tmp_path)).action_files == [project_action]
+        assert find_action_files(defaults_directory) == [default_action]
+        assert find_action_files(str(tmp_path / "actions")) == [project_action]
+    finally:
+        invalidate_project_index()
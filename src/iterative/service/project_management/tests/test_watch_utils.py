@@ -0,0 +1,97 @@
+import os
+import pytest
+from iterative.service.project_management.service.watch_utils import (
+    EVENT_HEADER,
+    IN_Q_OVERFLOW,
+    InotifyWatcher,
+    PollingWatcher,
+    create_file_watcher,
+    iter_watched_folders,
+)
+
+
+def _bump(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "actions").mkdir()
+    (tmp_path / "actions" / "greet_actions.py").write_text("def greet():\n    return 1\n")
+    (tmp_path / ".iterative").mkdir()
+    (tmp_path / "venv").mkdir()
+    (tmp_path / "generated").mkdir()
+    (tmp_path / ".gitignore").write_text("generated/\n")
+    return tmp_path
+
+
+def test_ignored_folders_are_not_watched(project):
+    folders = [folder for folder, _ in iter_watched_folders([str(project)], ignore=["venv"])]
+    assert folders == [str(project), str(project / "actions")]
+
+
+def test_polling_watcher_reports_changed_python_files(project):
+    watcher = PollingWatcher([str(project)], ignore=["venv"], interval=0.01)
+    assert watcher.wait(0) == set()
+
+    action_file = project / "actions" / "greet_actions.py"
+    action_file.write_text("def greet():\n    return 2\n")
+    _bump(action_file)
+    (project / "actions" / "notes.txt").write_text("not watched")
+    (project / "venv" / "lib.py").write_text("")
+    (project / "generated" / "client.py").write_text("")
+    assert watcher.wait(1) == {str(action_file)}
+
+    os.remove(action_file)
+    (project / "actions" / "new_actions.py").write_text("")
+    assert watcher.wait(1) == {str(action_file), str(project / "actions" / "new_actions.py")}
+
+
+def test_inotify_watcher_follows_new_folders(project):
+    try:
+        watcher = InotifyWatcher([str(project)], ignore=["venv"])
+    except OSError:
+        pytest.skip("inotify is not available")
+    try:
+        action_file = project / "actions" / "greet_actions.py"
+        action_file.write_text("def greet():\n    return 2\n")
+        assert watcher.wait(2) == {str(action_file)}
+
+        (project / "venv" / "lib.py").write_text("")
+        (project / "generated" / "client.py").write_text("")
+        (project / "actions" / "notes.txt").write_text("not watched")
+        assert watcher.wait(0.1) == set()
+
+        (project / "api").mkdir()
+        (project / "api" / "items_api.py").write_text("")
+        changed = watcher.wait(2) | watcher.wait(0.1)
+        assert str(project / "api" / "items_api.py") in changed
+    finally:
+        watcher.close()
+
+
+def test_inotify_queue_overflow_reports_every_watched_file(project):
+    try:
+        watcher = InotifyWatcher([str(project)], ignore=["venv"])
+    except OSError:
+        pytest.skip("inotify is not available")
+    try:
+        # Written while events were lost, the folder has no watch yet
+        (project / "api").mkdir()
+        (project / "api" / "items_api.py").write_text("")
+        (project / "generated" / "client.py").write_text("")
+        overflow = EVENT_HEADER.pack(-1, IN_Q_OVERFLOW, 0, 0)
+        assert watcher._parse_events(overflow) == {
+            str(project / "actions" / "greet_actions.py"),
+            str(project / "api" / "items_api.py"),
+        }
+        assert str(project / "api") in [folder for folder, _ in watcher._folders.values()]
+    finally:
+        watcher.close()
+
+
+def test_unknown_backend_is_rejected(project):
+    with pytest.raises(ValueError):
+        create_file_watcher([str(project)], backend="fsevents")
+    assert create_file_watcher([str(project)], backend="poll").backend == "poll"
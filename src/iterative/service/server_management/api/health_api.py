@@ -0,0 +1,17 @@
+import os
+from fastapi import APIRouter
+from iterative.service.server_management.service.supervisor_utils import HEALTH_PATH
+
+router = APIRouter()
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@router.get(HEALTH_PATH, include_in_schema=False)
+def get_health():
+    """
+    Answers once the server is up, used to tell when a started server is ready.
+    """
+    return {"status": "ok", "pid": os.getpid()}
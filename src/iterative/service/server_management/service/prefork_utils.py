@@ -0,0 +1,227 @@
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+# A worker that exits within this many seconds of starting counts as a crash at startup
+WORKER_STARTUP_SECONDS = 5.0
+MAX_STARTUP_CRASHES = 5
+
+
+class ServerSettings(NamedTuple):
+    host: str
+    port: int
+    workers: int
+    loop: str  # "auto", "asyncio" or "uvloop"
+    http: str  # "auto", "h11" or "httptools"
+    backlog: int
+    limit_concurrency: Optional[int]
+    graceful_shutdown: Optional[float]
+
+
+def resolve_worker_count(workers: Optional[int]) -> int:
+    """
+    Returns the number of worker processes, one per core if `workers` is 0 or None.
+    """
+    if not workers or workers < 1:
+        return os.cpu_count() or 1
+    return int(workers)
+
+
+def get_server_settings(workers: int = None) -> ServerSettings:
+    """
+    Returns the web server settings from the config, `workers` overriding `server_workers`.
+    """
+    from iterative.config import get_config
+
+    config = get_config()
+    return ServerSettings(
+        host=config.get("fastapi_host") or "0.0.0.0",
+        port=int(config.get("fastapi_port") or 5279),
+        workers=resolve_worker_count(workers if workers is not None else config.get("server_workers")),
+        loop=config.get("server_loop") or "auto",
+        http=config.get("server_http") or "auto",
+        backlog=int(config.get("server_backlog") or 2048),
+        limit_concurrency=config.get("server_limit_concurrency"),
+        graceful_shutdown=config.get("server_graceful_shutdown"),
+    )
+
+
+def create_uvicorn_config(app, settings: ServerSettings):
+    import uvicorn
+
+    return uvicorn.Config(
+        app,
+        host=settings.host,
+        port=settings.port,
+        loop=settings.loop,
+        http=settings.http,
+        backlog=settings.backlog,
+        limit_concurrency=settings.limit_concurrency,
+        timeout_graceful_shutdown=settings.graceful_shutdown,
+    )
+
+
+def create_listen_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """
+    Returns a listening socket the workers inherit and accept connections from.
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkServer:
+    """
+    Serves a prepared app from several worker processes forked from this one.
+
+    Everything built before `run`, the discovered actions, the routes and the imported user modules, is
+    shared with the workers copy-on-write. The master moves it to the permanent generation with
+    `gc.freeze()` first, so the workers' garbage collections don't write to, and copy, the shared pages.
+    The master only supervises, it replaces workers that die and stops them on SIGINT or SIGTERM.
+
+    Args:
+        app: The ASGI app the workers serve.
+        settings (ServerSettings): Where and how to serve it.
+        before_fork (List[Callable], optional): Called in the master before the workers are forked, to stop
+            threads that wouldn't survive the fork.
+        after_fork (List[Callable], optional): Called in each worker before it starts serving.
+    """
+
+    def __init__(self, app, settings: ServerSettings, before_fork: List[Callable] = None, after_fork: List[Callable] = None):
+        self.app = app
+        self.settings = settings
+        self.before_fork = before_fork or []
+        self.after_fork = after_fork or []
+        self.workers: Dict[int, float] = {}  # pid -> start time
+        self.socket: Optional[socket.socket] = None
+        self._should_exit = False
+        self._startup_crashes = 0
+
+    def run(self):
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Running several workers needs os.fork, which this platform doesn't have")
+
+        self.socket = create_listen_socket(self.settings.host, self.settings.port, self.settings.backlog)
+        for hook in self.before_fork:
+            hook()
+        # Collect once, then keep the surviving objects out of every later collection
+        gc.collect()
+        gc.freeze()
+
+        previous_handlers = {sig: signal.signal(sig, self._handle_exit) for sig in (signal.SIGINT, signal.SIGTERM)}
+        logger.info(f"Starting {self.settings.workers} workers on {self.settings.host}:{self.settings.port}")
+        try:
+            for _ in range(self.settings.workers):
+                self._spawn_worker()
+            self._supervise()
+        finally:
+            self._stop_workers()
+            for sig, handler in previous_handlers.items():
+                signal.signal(sig, handler)
+            self.socket.close()
+            gc.unfreeze()
+
+    def _handle_exit(self, sig, frame):
+        self._should_exit = True
+
+    def _spawn_worker(self):
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self.workers[pid] = time.monotonic()
+
+    def _run_worker(self):
+        # Never returns, the worker exits here so it doesn't run the master's code after the fork
+        exit_code = 0
+        try:
+            # A stop signal raises KeyboardInterrupt, also when uvicorn raises it again after shutting down,
+            # so the worker always exits through the finally block
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, signal.default_int_handler)
+            for hook in self.after_fork:
+                hook()
+            import uvicorn
+
+            uvicorn.Server(create_uvicorn_config(self.app, self.settings)).run(sockets=[self.socket])
+        except KeyboardInterrupt:
+            pass
+        except BaseException:
+            logger.exception(f"Worker {os.getpid()} failed")
+            exit_code = 1
+        finally:
+            # os._exit skips atexit handlers, whatever the worker counted since its last flush is written now
+            _flush_metrics()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
+
+    def _supervise(self):
+        while not self._should_exit:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid, status = 0, 0
+            if pid == 0:
+                time.sleep(0.2)
+                continue
+            started = self.workers.pop(pid, None)
+            if started is None or self._should_exit:
+                continue
+
+            logger.warning(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, starting a new one")
+            if time.monotonic() - started < WORKER_STARTUP_SECONDS:
+                self._startup_crashes += 1
+                if self._startup_crashes >= MAX_STARTUP_CRASHES:
+                    logger.error(f"Workers keep exiting right after they start, stopping the server")
+                    return
+            self._spawn_worker()
+
+    def _stop_workers(self):
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.workers.pop(pid, None)
+
+        # Leave the workers time to finish their requests, uvicorn's own timeout bounds it if set
+        deadline = time.monotonic() + (self.settings.graceful_shutdown or 30) + 5
+        while self.workers and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.1)
+                continue
+            self.workers.pop(pid, None)
+
+        for pid in list(self.workers):
+            logger.warning(f"Worker {pid} didn't stop in time, killing it")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self.workers.clear()
+
+
+def _flush_metrics():
+    try:
+        from iterative.service.telemetry_management.service.metrics_utils import get_metrics_registry
+
+        registry = get_metrics_registry()
+        registry.stop_flushing()
+        registry.flush()
+    except Exception:
+        logger.exception(f"Worker {os.getpid()} could not flush its metrics")
@@ -0,0 +1,254 @@
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import time
+from typing import Callable, List, Optional, Tuple
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+HEALTH_PATH = "/_iterative/health"
+RUN_FOLDER = os.path.join(".iterative", "run")
+DEFAULT_START_TIMEOUT = 30.0
+
+
+def wait_for(check: Callable[[], bool], timeout: float, description: str = "condition",
+             initial_delay: float = 0.02, max_delay: float = 1.0, factor: float = 2.0):
+    """
+    Call `check` until it returns true, sleeping exponentially longer between calls.
+
+    Raises:
+        TimeoutError: If `check` still returns false after `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    while True:
+        if check():
+            return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Timed out after {timeout:.1f}s waiting for {description}")
+        time.sleep(min(delay, remaining))
+        delay = min(delay * factor, max_delay)
+
+
+def _connect_host(host: str) -> str:
+    # A server listening on every interface is reached through the loopback one
+    return {"0.0.0.0": "127.0.0.1", "::": "::1", "": "127.0.0.1"}.get(host, host)
+
+
+def is_port_free(host: str, port: int) -> bool:
+    """
+    Returns whether a server could listen on the port, by binding it.
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind((host, port))
+        except OSError:
+            return False
+    return True
+
+
+def accepts_connections(host: str, port: int, timeout: float = 0.5) -> bool:
+    try:
+        with socket.create_connection((_connect_host(host), port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def http_responds(host: str, port: int, path: str = HEALTH_PATH, timeout: float = 1.0) -> bool:
+    """
+    Returns whether an HTTP server answers on the port. Any status counts, so apps without the
+    health endpoint are ready once they answer with a 404.
+    """
+    connection = http.client.HTTPConnection(_connect_host(host), port, timeout=timeout)
+    try:
+        connection.request("GET", path)
+        return connection.getresponse().status < 500
+    except (OSError, http.client.HTTPException):
+        return False
+    finally:
+        connection.close()
+
+
+def _read_cmdline(pid: int) -> Optional[List[str]]:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return [part.decode(errors="replace") for part in f.read().split(b"\0") if part]
+    except OSError:
+        return None
+
+
+def command_matches(cmdline: List[str], args: List[str]) -> bool:
+    """
+    Returns whether a process's command line is the one it was started with. The program may show up
+    resolved, e.g. `uvicorn` as `python /venv/bin/uvicorn`, so only its base name is compared.
+    """
+    if not args:
+        return True
+    arguments = args[1:]
+    if arguments and cmdline[-len(arguments):] != arguments:
+        return False
+    program = os.path.basename(args[0])
+    return any(os.path.basename(part) == program for part in cmdline[:len(cmdline) - len(arguments)])
+
+
+def is_process_alive(pid: int) -> bool:
+    try:
+        # Reap it if it is an exited child of ours, a zombie still accepts signals
+        finished, _ = os.waitpid(pid, os.WNOHANG)
+        if finished == pid:
+            return False
+    except ChildProcessError:
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class PidFile:
+    """
+    Records the pid and command line of a started process, so it can be stopped by a later run
+    without touching a process that reused its pid.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def write(self, pid: int, args: List[str]):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"pid": pid, "args": [str(arg) for arg in args]}, f)
+        os.replace(tmp_path, self.path)
+
+    def read(self) -> Optional[Tuple[int, List[str]]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return int(data["pid"]), list(data.get("args", []))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def running_pid(self) -> Optional[int]:
+        """
+        Returns the pid if the recorded process still runs the recorded command.
+        """
+        recorded = self.read()
+        if recorded is None:
+            return None
+        pid, args = recorded
+        if not is_process_alive(pid):
+            return None
+        cmdline = _read_cmdline(pid)
+        # Without /proc the pid is all there is to go on
+        if cmdline is not None and not command_matches(cmdline, args):
+            return None
+        return pid
+
+
+def stop_process(pid: int, timeout: float = 10.0) -> bool:
+    """
+    Send SIGTERM, then SIGKILL if the process is still running after `timeout` seconds.
+
+    Returns:
+        bool: False if the process had already exited.
+    """
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return False
+    try:
+        wait_for(lambda: not is_process_alive(pid), timeout, f"process {pid} to exit")
+    except TimeoutError:
+        logger.warning(f"Process {pid} didn't exit after SIGTERM, killing it")
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        wait_for(lambda: not is_process_alive(pid), timeout, f"process {pid} to be killed")
+    return True
+
+
+class ProcessSupervisor:
+    """
+    Starts child processes, waits until they are ready and keeps their pids in `<project>/.iterative/run`,
+    so a restart stops exactly the processes the previous run started.
+    """
+
+    def __init__(self, run_dir: str = None):
+        self.run_dir = run_dir
+
+    def get_run_dir(self) -> str:
+        if self.run_dir is None:
+            from iterative.service.project_management.service.project_utils import get_project_root
+
+            self.run_dir = os.path.join(get_project_root() or os.getcwd(), RUN_FOLDER)
+        return self.run_dir
+
+    def pid_file(self, name: str) -> PidFile:
+        return PidFile(os.path.join(self.get_run_dir(), f"{name}.pid"))
+
+    def stop(self, name: str, timeout: float = 10.0) -> bool:
+        """
+        Stop the process started under `name`, if it is still running.
+        """
+        pid_file = self.pid_file(name)
+        pid = pid_file.running_pid()
+        stopped = False
+        if pid is not None:
+            logger.info(f"Stopping {name} (pid {pid})")
+            stopped = stop_process(pid, timeout)
+        pid_file.remove()
+        return stopped
+
+    def start(self, name: str, args: List[str], ready: Callable[[], bool], timeout: float = DEFAULT_START_TIMEOUT,
+              **popen_kwargs) -> subprocess.Popen:
+        """
+        Start a process and return once `ready` returns true.
+
+        Raises:
+            RuntimeError: If the process exits before it is ready.
+            TimeoutError: If it isn't ready within `timeout` seconds. It is stopped first.
+        """
+        started = time.perf_counter()
+        process = subprocess.Popen(args, **popen_kwargs)
+        self.pid_file(name).write(process.pid, args)
+
+        def is_ready() -> bool:
+            if process.poll() is not None:
+                raise RuntimeError(f"{name} exited with code {process.returncode} before it was ready")
+            return ready()
+
+        try:
+            wait_for(is_ready, timeout, f"{name} to be ready")
+        except BaseException:
+            if process.poll() is None:
+                stop_process(process.pid)
+            self.pid_file(name).remove()
+            raise
+        logger.info(f"{name} is ready after {time.perf_counter() - started:.2f}s (pid {process.pid})")
+        return process
+
+
+_supervisor = ProcessSupervisor()
+
+
+def get_process_supervisor() -> ProcessSupervisor:
+    return _supervisor
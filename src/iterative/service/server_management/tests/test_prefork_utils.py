@@ -0,0 +1,127 @@
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import pytest
+from iterative.service.server_management.service.prefork_utils import create_listen_socket, resolve_worker_count
+
+SERVER_SCRIPT = """
+import os, sys
+from iterative.service.server_management.service.prefork_utils import PreforkServer, ServerSettings
+
+async def app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": str(os.getpid()).encode()})
+
+PreforkServer(app, ServerSettings("127.0.0.1", int(sys.argv[1]), 2, "asyncio", "h11", 128, None, 5)).run()
+"""
+
+METRICS_SERVER_SCRIPT = """
+import os, sys
+from iterative.service.server_management.service.prefork_utils import PreforkServer, ServerSettings
+from iterative.service.telemetry_management.service.metrics_utils import get_metrics_registry
+
+async def app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    # Counted without flushing, only the flush on exit writes it
+    get_metrics_registry().series("ping", "Test").observe(0.001, error=False)
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+PreforkServer(app, ServerSettings("127.0.0.1", int(sys.argv[1]), 2, "asyncio", "h11", 128, None, 5)).run()
+"""
+
+
+def test_resolve_worker_count():
+    assert resolve_worker_count(3) == 3
+    assert resolve_worker_count(0) == (os.cpu_count() or 1)
+    assert resolve_worker_count(None) == (os.cpu_count() or 1)
+
+
+def test_create_listen_socket():
+    sock = create_listen_socket("127.0.0.1", 0, 16)
+    try:
+        assert sock.get_inheritable()
+        client = socket.create_connection(sock.getsockname(), timeout=2)
+        client.close()
+    finally:
+        sock.close()
+
+
+def get(port: int, path: str = "/") -> str:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+    try:
+        connection.request("GET", path)
+        return connection.getresponse().read().decode()
+    finally:
+        connection.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_workers_share_the_socket_and_stop_on_sigterm():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    server = subprocess.Popen([sys.executable, "-c", SERVER_SCRIPT, str(port)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                first_pid = get(port)
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            pytest.fail("The server didn't start")
+
+        pids = {get(port) for _ in range(40)} | {first_pid}
+        assert str(server.pid) not in pids
+        assert 1 <= len(pids) <= 2
+
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=20) == 0
+    finally:
+        if server.poll() is None:
+            server.kill()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_workers_flush_their_metrics_when_they_exit(tmp_path):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    env = {**os.environ, "ITERATIVE_METRICS_DIR": str(tmp_path)}
+    server = subprocess.Popen([sys.executable, "-c", METRICS_SERVER_SCRIPT, str(port)], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                get(port)
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            pytest.fail("The server didn't start")
+        for _ in range(9):
+            get(port)
+
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=20) == 0
+    finally:
+        if server.poll() is None:
+            server.kill()
+
+    requests = 0
+    for name in os.listdir(tmp_path):
+        if name.startswith("metrics-"):
+            with open(os.path.join(tmp_path, name)) as f:
+                requests += sum(values["requests"] for _, values in json.load(f)["series"])
+    assert requests == 10
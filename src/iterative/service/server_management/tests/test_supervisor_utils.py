@@ -0,0 +1,115 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+import pytest
+from iterative.service.server_management.service.supervisor_utils import (
+    PidFile,
+    ProcessSupervisor,
+    accepts_connections,
+    command_matches,
+    is_port_free,
+    is_process_alive,
+    wait_for,
+)
+
+
+def test_wait_for_returns_once_check_passes():
+    calls = []
+
+    def check():
+        calls.append(1)
+        return len(calls) >= 3
+
+    wait_for(check, timeout=2, initial_delay=0.001)
+    assert len(calls) == 3
+
+
+def test_wait_for_times_out():
+    start = time.monotonic()
+    with pytest.raises(TimeoutError, match="the thing"):
+        wait_for(lambda: False, timeout=0.1, description="the thing", initial_delay=0.01)
+    assert time.monotonic() - start < 1
+
+
+def test_port_checks():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(1)
+    port = sock.getsockname()[1]
+    try:
+        assert not is_port_free("127.0.0.1", port)
+        assert accepts_connections("127.0.0.1", port)
+    finally:
+        sock.close()
+    assert is_port_free("127.0.0.1", port)
+    assert not accepts_connections("127.0.0.1", port)
+
+
+def test_command_matches():
+    assert command_matches(["python", "/venv/bin/uvicorn", "app:app", "--port", "80"], ["uvicorn", "app:app", "--port", "80"])
+    assert not command_matches(["python", "/venv/bin/uvicorn", "app:app", "--port", "81"], ["uvicorn", "app:app", "--port", "80"])
+    assert not command_matches(["sleep", "app:app", "--port", "80"], ["uvicorn", "app:app", "--port", "80"])
+    assert command_matches(["/usr/local/bin/ngrok", "http", "80"], ["ngrok"])
+
+
+def test_pid_file_roundtrip(tmp_path):
+    pid_file = PidFile(str(tmp_path / "run" / "server.pid"))
+    assert pid_file.read() is None
+
+    pid_file.write(os.getpid(), [sys.executable])
+    assert pid_file.read() == (os.getpid(), [sys.executable])
+
+    pid_file.remove()
+    assert pid_file.read() is None
+    pid_file.remove()
+
+
+def test_pid_file_ignores_exited_process(tmp_path):
+    process = subprocess.Popen(["sleep", "0"])
+    process.wait()
+    pid_file = PidFile(str(tmp_path / "sleep.pid"))
+    pid_file.write(process.pid, ["sleep", "0"])
+    assert pid_file.running_pid() is None
+
+
+def test_supervisor_start_and_stop(tmp_path):
+    supervisor = ProcessSupervisor(str(tmp_path))
+    checks = []
+
+    def ready():
+        checks.append(1)
+        return len(checks) >= 2
+
+    process = supervisor.start("sleeper", ["sleep", "30"], ready=ready, timeout=5)
+    try:
+        assert supervisor.pid_file("sleeper").running_pid() == process.pid
+        assert supervisor.stop("sleeper")
+        assert not is_process_alive(process.pid)
+        assert not os.path.exists(supervisor.pid_file("sleeper").path)
+        # Nothing left to stop
+        assert not supervisor.stop("sleeper")
+    finally:
+        if process.poll() is None:
+            process.kill()
+
+
+def test_supervisor_start_fails_when_process_exits(tmp_path):
+    supervisor = ProcessSupervisor(str(tmp_path))
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="exited with code 3"):
+        supervisor.start("failing", ["sh", "-c", "exit 3"], ready=lambda: False, timeout=10)
+    assert time.monotonic() - start < 5
+    assert not os.path.exists(supervisor.pid_file("failing").path)
+
+
+def test_supervisor_start_timeout_stops_process(tmp_path):
+    supervisor = ProcessSupervisor(str(tmp_path))
+    with pytest.raises(TimeoutError):
+        supervisor.start("slow", ["sleep", "30"], ready=lambda: False, timeout=0.2)
+    assert not os.path.exists(supervisor.pid_file("slow").path)
+
+
+def test_is_process_alive():
+    assert is_process_alive(os.getpid())
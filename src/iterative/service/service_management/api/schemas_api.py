@@ -1,9 +1,7 @@
-import os
-from fastapi import APIRouter
-from typing import Dict
-from iterative.service.project_management.service.project_utils import find_pydantic_models_in_models_folders, get_project_root
-from iterative.service.service_management.service.utils import load_model_schema
-import json
+from fastapi import APIRouter, Request, Response
+from typing import Dict, Optional
+from iterative.service.project_management.service.project_utils import get_project_root
+from iterative.service.service_management.service.schema_cache import get_model_schema_cache
 
 
 router = APIRouter()
@@ -13,30 +11,28 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
 @router.get("/model_schemas", response_model=Dict[str, Dict[str, Dict]])
-def get_model_schemas():
+def get_model_schemas(request: Request, service: Optional[str] = None):
+    """
+    Returns the JSON schema of every model grouped by service, or only the given service's models.
+    Only the model files that changed since the last request are loaded again. Send the returned ETag
+    in `If-None-Match` to get a 304 while nothing changed.
+    """
     try:
-        logger.info("Starting to get model schemas.")
-        project_root = get_project_root()  # replace with your project root directory
-        pydantic_models = find_pydantic_models_in_models_folders(project_root)
-
-        model_schemas = {}
-        for model_name, model_path in pydantic_models.items():
-            model_schema_json = load_model_schema(model_path, model_name)
-            model_schema = json.loads(model_schema_json)
-
-            # Extract the service name from the model path
-            path_parts = model_path.split(os.sep)
-            if 'service' in path_parts:
-                service_index = path_parts.index('service')
-                if len(path_parts) > service_index + 1:
-                    service_name = path_parts[service_index + 1]
-                    if service_name not in model_schemas:
-                        model_schemas[service_name] = {}
-                    model_schemas[service_name][model_name] = model_schema
-
-        logger.info("Successfully got model schemas.")
-        return model_schemas
+        project_root = get_project_root()
+        served = get_model_schema_cache().get(project_root, service)
+
+        headers = {"ETag": served.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), served.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=served.body, media_type="application/json", headers=headers)
     except Exception as e:
         logger.error("Failed to get model schemas.", exc_info=True)
-        raise
\ No newline at end of file
+        raise
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+from iterative.service.project_management.service.inheritance_utils import get_model_inheritance_resolver
+from iterative.service.project_management.service.project_utils import find_pydantic_models_in_models_folders, get_parent_project_root
+from iterative.service.project_management.service.reload_utils import reload_user_modules
+from iterative.service.project_management.service.scan_utils import get_project_index
+from iterative.service.service_management.service.json_encoder import CustomEncoder
+from iterative.service.service_management.service.utils import get_model_schemas_from_path
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+
+def get_service_name(model_path: str) -> Optional[str]:
+    """
+    Returns the name of the folder after `service` in the model's path, None if it isn't in a service.
+    """
+    path_parts = model_path.split(os.sep)
+    if 'service' in path_parts:
+        service_index = path_parts.index('service')
+        if len(path_parts) > service_index + 1:
+            return path_parts[service_index + 1]
+    return None
+
+
+class ServedSchemas:
+    """
+    A serialized `/model_schemas` response and its strong ETag.
+    """
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()}"'
+
+
+class ModelSchemaCache:
+    """
+    Keeps the JSON schema of every model in a project, grouped by service.
+
+    Each model file is imported and its schemas generated again only when its content, or the content of a
+    file its models inherit from, changes. The models folders are searched again only when the project's
+    files or those dependencies change. Serialized responses are kept per service filter until the schema
+    map changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # model file -> ({dependency file: content hash}, {model name: schema})
+        self._files: Dict[str, Tuple[Dict[str, str], Dict[str, dict]]] = {}
+        # (project root, ProjectIndex) the model files were last searched in
+        self._searched: Optional[Tuple[str, object]] = None
+        self._schemas: Dict[str, Dict[str, dict]] = {}
+        self._served: Dict[Optional[str], ServedSchemas] = {}
+        self.rebuilt_files = 0
+
+    def _refresh(self, project_root: str):
+        resolver = get_model_inheritance_resolver([project_root, get_parent_project_root() or project_root])
+        project_index = get_project_index(project_root)
+        # The scan is reused while no file was added or removed, so an unchanged project isn't searched again
+        if (
+            self._searched is not None and self._searched[0] == project_root and self._searched[1] is project_index
+            and all(resolver.dependencies_unchanged(dependencies) for dependencies, _ in self._files.values())
+        ):
+            return
+
+        models_by_file: Dict[str, list] = {}
+        for model_name, model_path in find_pydantic_models_in_models_folders(project_root).items():
+            if get_service_name(model_path) is not None:
+                models_by_file.setdefault(model_path, []).append(model_name)
+        self._searched = (project_root, project_index)
+
+        changed = set(self._files) - set(models_by_file)
+        for model_path in changed:
+            del self._files[model_path]
+        stale: Dict[str, Dict[str, str]] = {}
+        changed_bases = set()
+        for model_path, model_names in models_by_file.items():
+            dependencies = resolver.resolve_file(model_path).dependencies
+            cached = self._files.get(model_path)
+            if cached is not None and cached[0] == dependencies and set(cached[1]) == set(model_names):
+                continue
+            stale[model_path] = dependencies
+            if cached is not None:
+                changed_bases.update(
+                    path for path, file_hash in dependencies.items()
+                    if path != model_path and cached[0].get(path) != file_hash
+                )
+        if changed_bases:
+            # The model modules still hold the classes built from the old base, execute them again
+            reload_user_modules(changed_bases, [project_root])
+
+        for model_path, dependencies in stale.items():
+            # Serialize once with the custom encoder so the cached schemas only hold plain JSON values
+            schemas = json.loads(json.dumps(get_model_schemas_from_path(model_path, models_by_file[model_path]), cls=CustomEncoder))
+            self._files[model_path] = (dependencies, schemas)
+            self.rebuilt_files += 1
+            changed.add(model_path)
+
+        if changed or not self._served:
+            self._rebuild_schema_map()
+            if changed:
+                logger.info(f"Rebuilt model schemas for {len(changed)} changed model files")
+
+    def _rebuild_schema_map(self):
+        model_schemas: Dict[str, Dict[str, dict]] = {}
+        for model_path, (_, schemas) in self._files.items():
+            model_schemas.setdefault(get_service_name(model_path), {}).update(schemas)
+        self._schemas = model_schemas
+        self._served = {}
+
+    def get(self, project_root: str, service: str = None) -> ServedSchemas:
+        """
+        Returns the serialized schemas of the project's models, only those of `service` if given.
+        """
+        with self._lock:
+            self._refresh(project_root)
+            served = self._served.get(service)
+            if served is None:
+                if service is None:
+                    model_schemas = self._schemas
+                else:
+                    model_schemas = {service: self._schemas[service]} if service in self._schemas else {}
+                body = json.dumps(model_schemas, sort_keys=True, separators=(",", ":")).encode("utf-8")
+                served = self._served[service] = ServedSchemas(body)
+            return served
+
+    def invalidate(self):
+        with self._lock:
+            self._files.clear()
+            self._searched = None
+            self._schemas = {}
+            self._served = {}
+
+
+_schema_cache = ModelSchemaCache()
+
+
+def get_model_schema_cache() -> ModelSchemaCache:
+    return _schema_cache
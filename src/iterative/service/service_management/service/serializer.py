@@ -0,0 +1,233 @@
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+from fastapi import Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from iterative.service.telemetry_management.service.trace_utils import trace_span
+from logging import getLogger
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard library encoder is used without it
+    orjson = None
+
+try:
+    from requests import Response as RequestsResponse
+except ImportError:  # requests is optional, its responses can't show up without it
+    RequestsResponse = None
+
+logger = getLogger(__name__)
+
+# Lists are streamed in chunks of about this many bytes
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Lists with more items than this are streamed by `create_json_response`
+STREAM_MIN_ITEMS = 1000
+
+# Pydantic 2 serializes models straight to JSON bytes, Pydantic 1 goes through `.dict()`
+PYDANTIC_V2 = hasattr(BaseModel, "model_dump_json")
+
+
+def _encode_model(obj: BaseModel):
+    # FastAPI's defaults, fields set to None are kept. Pydantic 2 encodes the values itself, as `_model_to_json`
+    # does, nested values the backend can't handle come back through the encoders.
+    if PYDANTIC_V2:
+        try:
+            return obj.model_dump(mode="json", by_alias=True)
+        except ValueError:
+            return obj.model_dump(by_alias=True)
+    return obj.dict(by_alias=True)
+
+
+def _encode_datetime(obj: datetime):
+    # Naive datetimes stay naive, like Pydantic and FastAPI write them
+    return obj.isoformat()
+
+
+def _encode_fastapi_response(obj: Response):
+    return {
+        "status_code": obj.status_code,
+        "headers": dict(obj.headers),
+        "body": str(obj.body) if obj.body else None,
+    }
+
+
+def _encode_requests_response(obj):
+    return {
+        "status_code": obj.status_code,
+        "headers": dict(obj.headers),
+        "body": obj.text,
+    }
+
+
+# Encoders by type, looked up along the MRO of the object's class
+_encoders: Dict[type, Callable[[Any], Any]] = {
+    Enum: lambda obj: obj.value,
+    BaseModel: _encode_model,
+    datetime: _encode_datetime,
+    date: lambda obj: obj.isoformat(),
+    time: lambda obj: obj.isoformat(),
+    set: list,
+    frozenset: list,
+    # orjson only handles exact floats
+    float: float,
+    Response: _encode_fastapi_response,
+}
+if RequestsResponse is not None:
+    _encoders[RequestsResponse] = _encode_requests_response
+
+# Concrete class -> encoder, None when nothing handles it
+_resolved: Dict[type, Optional[Callable[[Any], Any]]] = {}
+
+
+def register_encoder(cls: type, encoder: Callable[[Any], Any]):
+    """
+    Register how instances of `cls` and its subclasses are turned into JSON compatible values.
+
+    Args:
+        cls (type): The type to encode.
+        encoder (Callable): Returns a value the JSON backend can serialize, e.g. a str, dict or list.
+    """
+    _encoders[cls] = encoder
+    _resolved.clear()
+
+
+def get_encoder(cls: type) -> Optional[Callable[[Any], Any]]:
+    """
+    Returns the encoder for a class, resolved along its MRO once and cached.
+    """
+    try:
+        return _resolved[cls]
+    except KeyError:
+        pass
+    encoder = next((_encoders[base] for base in cls.__mro__ if base in _encoders), None)
+    _resolved[cls] = encoder
+    return encoder
+
+
+def encode_default(obj):
+    """
+    The `default` hook for JSON encoders: converts one object the backend doesn't handle natively.
+
+    Raises:
+        TypeError: If no encoder is registered for the object's type.
+    """
+    encoder = get_encoder(type(obj))
+    if encoder is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return encoder(obj)
+
+
+def _is_plain_model(obj) -> bool:
+    # Models without an encoder of their own are serialized by Pydantic
+    return isinstance(obj, BaseModel) and get_encoder(type(obj)) is _encode_model
+
+
+def _model_to_json(obj: BaseModel) -> bytes:
+    if PYDANTIC_V2:
+        try:
+            return type(obj).__pydantic_serializer__.to_json(obj, by_alias=True)
+        except ValueError:
+            # A field typed `Any` holds something only the registered encoders know
+            pass
+    return _backend_dumps(_encode_model(obj))
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+    # Nested models are embedded as the bytes Pydantic produces, without building a dict first
+    _EMBED_MODELS = PYDANTIC_V2 and hasattr(orjson, "Fragment")
+
+    def _orjson_default(obj):
+        encoder = get_encoder(type(obj))
+        if encoder is _encode_model and _EMBED_MODELS:
+            return orjson.Fragment(_model_to_json(obj))
+        if encoder is None:
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        return encoder(obj)
+
+    def _backend_dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=_orjson_default, option=_ORJSON_OPTIONS)
+else:
+    _encode_json = json.JSONEncoder(default=encode_default, ensure_ascii=False, separators=(",", ":")).encode
+
+    def _backend_dumps(obj) -> bytes:
+        return _encode_json(obj).encode("utf-8")
+
+
+def get_backend_name() -> str:
+    return "orjson" if orjson is not None else "json"
+
+
+def dumps(obj) -> bytes:
+    """
+    Serialize an object to compact JSON bytes.
+
+    Pydantic models and lists of them are serialized by Pydantic directly, everything else goes through
+    the JSON backend, orjson when installed, with the registered encoders. The output matches FastAPI's own
+    responses: fields set to None are kept and naive datetimes are written without an offset.
+    """
+    if _is_plain_model(obj):
+        return _model_to_json(obj)
+    if isinstance(obj, (list, tuple)) and obj and _is_plain_model(obj[0]):
+        return b"".join(iter_json(obj))
+    return _backend_dumps(obj)
+
+
+def iter_json(obj, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Serialize an object to JSON in chunks. The items of lists, tuples and other iterables are serialized
+    one at a time, so a large list is never held as one encoded tree.
+    """
+    if isinstance(obj, (dict, str, bytes, BaseModel)) or not isinstance(obj, Iterable):
+        yield dumps(obj)
+        return
+
+    parts = [b"["]
+    size = 1
+    first = True
+    for item in obj:
+        encoded = _model_to_json(item) if _is_plain_model(item) else _backend_dumps(item)
+        if not first:
+            parts.append(b",")
+            size += 1
+        parts.append(encoded)
+        size += len(encoded)
+        first = False
+        if size >= chunk_size:
+            yield b"".join(parts)
+            parts = []
+            size = 0
+    parts.append(b"]")
+    yield b"".join(parts)
+
+
+class IterativeJSONResponse(JSONResponse):
+    """
+    JSON response rendered with `dumps`, the web app's default response class.
+    """
+
+    def render(self, content) -> bytes:
+        with trace_span("serialize response"):
+            return dumps(content)
+
+
+class StreamingJSONResponse(StreamingResponse):
+    """
+    Streams a large list as a JSON array, serializing its items as the client reads them.
+    """
+
+    def __init__(self, content, status_code: int = 200, headers: dict = None, chunk_size: int = STREAM_CHUNK_SIZE):
+        super().__init__(iter_json(content, chunk_size), status_code=status_code, headers=headers, media_type="application/json")
+
+
+def create_json_response(content, headers: dict = None) -> Response:
+    """
+    Returns the response rendering `content` with the serializer, streamed for lists of more than
+    `STREAM_MIN_ITEMS` items.
+    """
+    if isinstance(content, (list, tuple)) and len(content) > STREAM_MIN_ITEMS:
+        return StreamingJSONResponse(content, headers=headers)
+    return IterativeJSONResponse(content, headers=headers)
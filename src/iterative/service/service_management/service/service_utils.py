@@ -1,10 +1,11 @@
 from collections import defaultdict
 import os
-import ast
 from typing import Any, Dict, List
 
 from iterative.service.project_management.models.project_models import ProjectFolder
+from iterative.service.project_management.service.analysis_utils import analyze_files
 from iterative.service.project_management.service.project_utils import get_parent_project_root, get_project_root, is_iterative_project
+from iterative.service.project_management.service.scan_utils import files_within, get_project_index
 import yaml
 from logging import getLogger 
 
@@ -26,24 +27,18 @@ def find_project_service_functions(service_path: str) -> Dict[str, List[Dict[str
     functions_dict: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
 
     def add_functions_from_path(search_path: str) -> None:
-        for root, dirs, files in os.walk(search_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_content = f.read()
-
-                    project_name = os.path.basename(root)
-
-                    module = ast.parse(file_content)
-                    functions = [node.name for node in ast.walk(module) if isinstance(node, ast.FunctionDef)]
-                    for function in functions:
-                        functions_dict[project_name].append({
-                            "file_path": file_path,
-                            "project_name": project_name,
-                            "func": function,
-                            "function_name": function,
-                        })
+        search_path = os.path.abspath(search_path)
+        file_paths = files_within(get_project_index(search_path).python_files, search_path)
+        for file_path, summary in analyze_files(file_paths).items():
+            project_name = os.path.basename(os.path.dirname(file_path))
+
+            for function in summary.function_names:
+                functions_dict[project_name].append({
+                    "file_path": file_path,
+                    "project_name": project_name,
+                    "func": function,
+                    "function_name": function,
+                })
 
     # Check if the provided service path is part of an iterative project
     if is_iterative_project(service_path):
@@ -1,9 +1,8 @@
 import json
 import os
 from iterative.service.service_management.service.json_encoder import CustomEncoder
+from iterative.service.project_management.service.project_utils import load_module_from_path
 from pydantic import BaseModel
-import importlib.util
-import sys
 
 import logging
 
@@ -24,18 +23,41 @@ def load_model_schema(model_path: str, model_name: str) -> str:
     Raises:
         ValueError: If the Pydantic model cannot be found or is not a valid BaseModel.
     """
-    module_name, class_name = model_name.rsplit('.', 1)  # split the module name and the class name
-    spec = importlib.util.spec_from_file_location(module_name, model_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[spec.name] = module
-    spec.loader.exec_module(module)
+    module = load_module_from_path(model_path)
+    schema = _model_schema(module, model_path, model_name)
+    if schema is None:
+        return "{}"
+    return json.dumps(schema, indent=4, cls=CustomEncoder)
+
 
+def _model_schema(module, model_path: str, model_name: str):
+    module_name, class_name = model_name.rsplit('.', 1)  # split the module name and the class name
     model_class = getattr(module, class_name, None)
     if model_class:
-        if issubclass(model_class, BaseModel):
-            return json.dumps(model_class.schema(), indent=4, cls=CustomEncoder)
+        if isinstance(model_class, type) and issubclass(model_class, BaseModel):
+            # `model_json_schema` on Pydantic 2, `schema` on Pydantic 1
+            return getattr(model_class, "model_json_schema", model_class.schema)()
         else:
             logger.debug(f"{model_class} is not a subclass of BaseModel")
     else:
         logger.warning(f"Class {class_name} not found in {model_path}.")
-    return "{}"
+    return None
+
+
+def get_model_schemas_from_path(model_path: str, model_names: list) -> dict:
+    """
+    Load the module once and return the schema of each of its Pydantic models.
+
+    Args:
+        model_path (str): The path to the Python module containing the Pydantic models.
+        model_names (list): The qualified names of the models, e.g. `user.User`.
+
+    Returns:
+        dict: The schema of each model by name, `{}` for the ones that can't be found.
+    """
+    module = load_module_from_path(model_path)
+    schemas = {}
+    for model_name in model_names:
+        schema = _model_schema(module, model_path, model_name)
+        schemas[model_name] = schema if schema is not None else {}
+    return schemas
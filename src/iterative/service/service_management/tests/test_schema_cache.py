@@ -0,0 +1,88 @@
+import json
+import os
+from starlette.requests import Request
+from iterative.service.service_management.api import schemas_api
+from iterative.service.service_management.service import schema_cache
+from iterative.service.service_management.service.schema_cache import ModelSchemaCache
+
+
+def _touch(root, relative_path, content=""):
+    path = root / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return str(path)
+
+
+def _request(headers=None):
+    raw_headers = [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/model_schemas", "headers": raw_headers, "query_string": b""})
+
+
+def test_schemas_are_rebuilt_only_for_changed_files(tmp_path):
+    _touch(tmp_path, ".iterative/config.yaml")
+    user_file = _touch(tmp_path, "service/users/models/user.py", "from pydantic import BaseModel\n\nclass User(BaseModel):\n    name: str\n")
+    _touch(tmp_path, "service/billing/models/invoice.py", "from pydantic import BaseModel\n\nclass Invoice(BaseModel):\n    total: int\n")
+    cache = ModelSchemaCache()
+
+    first = cache.get(str(tmp_path))
+    schemas = json.loads(first.body)
+    assert set(schemas) == {"users", "billing"}
+    assert schemas["users"]["user.User"]["properties"] == {"name": {"title": "Name", "type": "string"}}
+    assert cache.rebuilt_files == 2
+
+    assert cache.get(str(tmp_path)) is first
+    assert json.loads(cache.get(str(tmp_path), "billing").body).keys() == {"billing"}
+    assert json.loads(cache.get(str(tmp_path), "missing").body) == {}
+
+    with open(user_file, "a") as f:
+        f.write("    email: str = ''\n")
+    stat = os.stat(user_file)
+    os.utime(user_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = cache.get(str(tmp_path))
+    assert cache.rebuilt_files == 3
+    assert second.etag != first.etag
+    assert "email" in json.loads(second.body)["users"]["user.User"]["properties"]
+
+
+def _edit(path, content):
+    with open(path, "w") as f:
+        f.write(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_base_model_edit_rebuilds_subclass_schemas(tmp_path, monkeypatch):
+    _touch(tmp_path, ".iterative/config.yaml")
+    base_file = _touch(tmp_path, "service/users/models/schema_cache_base.py", "from pydantic import BaseModel\n\nclass Base(BaseModel):\n    id: int\n")
+    _touch(tmp_path, "service/users/models/account.py", "from schema_cache_base import Base\n\nclass Account(Base):\n    name: str\n")
+    searches = []
+    find_models = schema_cache.find_pydantic_models_in_models_folders
+    monkeypatch.setattr(schema_cache, "find_pydantic_models_in_models_folders", lambda root: searches.append(root) or find_models(root))
+    cache = ModelSchemaCache()
+
+    first = cache.get(str(tmp_path))
+    assert set(json.loads(first.body)["users"]["account.Account"]["properties"]) == {"id", "name"}
+    assert cache.get(str(tmp_path)) is first
+    assert len(searches) == 1
+
+    _edit(base_file, "from pydantic import BaseModel\n\nclass Base(BaseModel):\n    id: int\n    created: str = ''\n")
+    second = cache.get(str(tmp_path))
+    assert second.etag != first.etag
+    assert set(json.loads(second.body)["users"]["account.Account"]["properties"]) == {"id", "name", "created"}
+    assert len(searches) == 2
+
+
+def test_endpoint_returns_304_for_matching_etag(tmp_path, monkeypatch):
+    _touch(tmp_path, ".iterative/config.yaml")
+    _touch(tmp_path, "service/users/models/user.py", "from pydantic import BaseModel\n\nclass User(BaseModel):\n    name: str\n")
+    monkeypatch.setattr(schemas_api, "get_project_root", lambda: str(tmp_path))
+    monkeypatch.setattr(schemas_api, "get_model_schema_cache", lambda cache=ModelSchemaCache(): cache)
+
+    response = schemas_api.get_model_schemas(_request(), service="users")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    not_modified = schemas_api.get_model_schemas(_request({"If-None-Match": etag}), service="users")
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+    assert schemas_api.get_model_schemas(_request({"If-None-Match": '"stale"'}), service="users").status_code == 200
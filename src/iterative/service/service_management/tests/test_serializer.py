@@ -0,0 +1,180 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel
+from iterative.service.service_management.service import serializer
+from iterative.service.service_management.service.json_encoder import CustomEncoder
+from fastapi import FastAPI
+from iterative.service.action_management.models.action import Action
+from iterative.service.service_management.service.serializer import (
+    IterativeJSONResponse,
+    StreamingJSONResponse,
+    create_json_response,
+    dumps,
+    iter_json,
+    register_encoder,
+)
+from iterative.web_app_integration import integrate_actions_into_web_app, serialize_action_result
+
+
+class Color(Enum):
+    RED = "red"
+
+
+class Point(BaseModel):
+    x: int
+    color: Color
+    seen_at: datetime
+    labels: List[str] = []
+
+
+def _points(count):
+    return [Point(x=i, color=Color.RED, seen_at=datetime(2024, 1, 1, tzinfo=timezone.utc)) for i in range(count)]
+
+
+def test_dumps_matches_custom_encoder():
+    payload = {"color": Color.RED, "tags": {"a"}, "when": datetime(2024, 1, 1, tzinfo=timezone.utc)}
+    assert json.loads(dumps(payload)) == json.loads(json.dumps(payload, cls=CustomEncoder))
+    assert json.loads(dumps(_points(2))) == [point.model_dump(mode="json") for point in _points(2)]
+
+
+def test_iter_json_streams_lists_in_chunks():
+    points = _points(50)
+    chunks = list(iter_json(points, chunk_size=256))
+    assert len(chunks) > 1
+    assert json.loads(b"".join(chunks)) == json.loads(dumps(points))
+    assert b"".join(iter_json(iter([]))) == b"[]"
+
+
+def test_encoders_are_resolved_per_type_and_registrable():
+    class Meters(float):
+        pass
+
+    class Distance:
+        def __init__(self, value):
+            self.value = value
+
+    assert serializer.get_encoder(Color) is serializer.get_encoder(Enum)
+    register_encoder(Distance, lambda obj: {"meters": obj.value})
+    try:
+        assert json.loads(dumps([Distance(Meters(2.5))])) == [{"meters": 2.5}]
+        assert serializer.get_encoder(type(Distance(1))) is not None
+    finally:
+        del serializer._encoders[Distance]
+        serializer._resolved.clear()
+
+
+def test_response_class_renders_with_serializer():
+    response = IterativeJSONResponse({"color": Color.RED})
+    assert json.loads(response.body) == {"color": "red"}
+
+
+class Track(BaseModel):
+    points: List[Point]
+
+
+class SecretPoint(Point):
+    secret: str = "hidden"
+
+
+def list_points() -> List[Point]:
+    return _points(2)
+
+
+def get_track() -> Track:
+    return Track(points=[SecretPoint(**point.model_dump()) for point in _points(1)])
+
+
+def _get(web_app, path):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+             "headers": [], "scheme": "http", "server": ("test", 80), "root_path": "", "http_version": "1.1"}
+    asyncio.run(web_app(scope, receive, send))
+    return messages[0]["status"], json.loads(b"".join(message.get("body", b"") for message in messages[1:]))
+
+
+def test_action_routes_render_results_with_serializer(monkeypatch):
+    import fastapi.routing
+
+    rendered = []
+
+    def fail(*args, **kwargs):
+        raise AssertionError("jsonable_encoder was called")
+
+    def spy(obj):
+        rendered.append(obj)
+        return dumps(obj)
+
+    monkeypatch.setattr(fastapi.routing, "jsonable_encoder", fail)
+    monkeypatch.setattr(serializer, "dumps", spy)
+    web_app = FastAPI(default_response_class=IterativeJSONResponse)
+    integrate_actions_into_web_app([
+        Action(name=name, function=function, file_path=__file__, category="Project Actions")
+        for name, function in (("list_points", list_points), ("get_track", get_track))
+    ], web_app)
+
+    assert _get(web_app, "/list_points") == (200, [point.model_dump(mode="json") for point in _points(2)])
+    assert all(isinstance(point, Point) for point in rendered[0])
+    # The response model still filters out the fields of subclasses
+    status, track = _get(web_app, "/get_track")
+    assert status == 200 and "secret" not in track["points"][0]
+
+
+def test_large_lists_are_streamed():
+    assert isinstance(create_json_response(list(range(serializer.STREAM_MIN_ITEMS + 1))), StreamingJSONResponse)
+    assert isinstance(create_json_response([1]), IterativeJSONResponse)
+
+
+class Contact(BaseModel):
+    name: str
+    email: Optional[str] = None
+    seen_at: Optional[datetime] = None
+
+
+def get_contact() -> Contact:
+    return Contact(name="a")
+
+
+def test_responses_keep_fastapis_wire_format():
+    web_app = FastAPI(default_response_class=IterativeJSONResponse)
+    integrate_actions_into_web_app([Action(name="get_contact", function=get_contact, file_path=__file__, category="Project Actions")], web_app)
+    assert _get(web_app, "/get_contact") == (200, {"name": "a", "email": None, "seen_at": None})
+
+    # Naive datetimes are written the same way inside and outside models, by either backend
+    naive = datetime(2024, 1, 1, 12, 30)
+    payload = {"when": naive, "contact": Contact(name="a", seen_at=naive), "contacts": [Contact(name="b", seen_at=naive)]}
+    expected = {
+        "when": "2024-01-01T12:30:00",
+        "contact": {"name": "a", "email": None, "seen_at": "2024-01-01T12:30:00"},
+        "contacts": [{"name": "b", "email": None, "seen_at": "2024-01-01T12:30:00"}],
+    }
+    assert json.loads(dumps(payload)) == expected
+    assert json.loads(json.dumps(payload, default=serializer.encode_default)) == expected
+
+
+def test_results_are_validated_by_pydantic_1_fields(monkeypatch):
+    import pytest
+    from fastapi.exceptions import ResponseValidationError
+    from iterative import web_app_integration
+
+    class Pydantic1Field:
+        # Pydantic 1 fields validate like Pydantic 2 ones, report a lone error unwrapped and can't serialize
+        def validate(self, value, values, loc=()):
+            if value == "bad":
+                return None, {"loc": loc, "msg": "not valid"}
+            return {"validated": value}, None
+
+    monkeypatch.setattr(web_app_integration, "PYDANTIC_V2", False)
+    assert serialize_action_result("good", Pydantic1Field()) == {"validated": "good"}
+    with pytest.raises(ResponseValidationError) as error:
+        serialize_action_result("bad", Pydantic1Field())
+    assert error.value.errors() == [{"loc": ("response",), "msg": "not valid"}]
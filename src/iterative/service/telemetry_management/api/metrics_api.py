@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Response
+from iterative.service.telemetry_management.service.metrics_utils import PROMETHEUS_CONTENT_TYPE, get_metrics_registry
+
+router = APIRouter()
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """
+    Returns request counts, errors, in-flight requests and latency histograms in the Prometheus text format.
+    """
+    return Response(content=get_metrics_registry().render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
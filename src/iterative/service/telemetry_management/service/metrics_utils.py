@@ -0,0 +1,308 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+# Upper bounds in seconds, the Prometheus client defaults
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRICS_FILE_PREFIX = "metrics-"
+
+Labels = Tuple[str, str]  # (action, category)
+
+
+class RequestSeries:
+    """
+    Counters, in-flight gauge and latency histogram of one action or route.
+
+    Updated from the event loop thread only, so plain attribute updates are enough.
+    """
+
+    __slots__ = ("requests", "errors", "in_flight", "bucket_counts", "latency_sum")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        # One count per bucket plus the +Inf bucket, not cumulative
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+
+    def observe(self, seconds: float, error: bool):
+        self.requests += 1
+        if error:
+            self.errors += 1
+        self.bucket_counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.latency_sum += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def merge(self, data: Dict[str, Any], live: bool = True):
+        self.requests += data["requests"]
+        self.errors += data["errors"]
+        if live:
+            self.in_flight += data["in_flight"]
+        self.bucket_counts = [count + other for count, other in zip(self.bucket_counts, data["bucket_counts"])]
+        self.latency_sum += data["latency_sum"]
+
+
+class MetricsRegistry:
+    """
+    Request metrics of every instrumented action and route, labeled by action name and category.
+
+    With a multiprocess directory, each worker also writes its metrics there, at most once per flush
+    interval, and `/metrics` adds up the files of all workers. Counters of workers that exited are kept,
+    their in-flight gauges are not. Requests flush when they finish, `start_flushing` also flushes from
+    a timer so the last requests of a worker that went idle show up too.
+    """
+
+    def __init__(self, multiprocess_dir: str = None, flush_interval: float = 1.0):
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._series: Dict[Labels, RequestSeries] = {}
+        self._last_flush = 0.0
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flushing = threading.Event()
+
+    def series(self, action: str, category: str) -> RequestSeries:
+        labels = (action, category)
+        series = self._series.get(labels)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(labels, RequestSeries())
+        return series
+
+    def snapshot(self) -> Dict[Labels, Dict[str, Any]]:
+        with self._lock:
+            return {labels: series.to_dict() for labels, series in self._series.items()}
+
+    # Multiprocess aggregation
+
+    def _file_path(self, pid: int = None) -> str:
+        return os.path.join(self.multiprocess_dir, f"{METRICS_FILE_PREFIX}{pid or os.getpid()}.json")
+
+    def maybe_flush(self, now: float = None):
+        if self.multiprocess_dir and (now or time.monotonic()) - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def start_flushing(self):
+        """
+        Flush every flush interval from a background thread, until `stop_flushing`. Does nothing without
+        a multiprocess directory.
+        """
+        if not self.multiprocess_dir or self._flusher is not None:
+            return
+        self._stop_flushing.clear()
+        self._flusher = threading.Thread(target=self._flush_periodically, name="iterative-metrics-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_periodically(self):
+        while not self._stop_flushing.wait(self.flush_interval):
+            self.maybe_flush()
+
+    def stop_flushing(self):
+        self._stop_flushing.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+
+    def flush(self):
+        """
+        Write this process's metrics to the multiprocess directory, atomically.
+        """
+        if not self.multiprocess_dir:
+            return
+        self._last_flush = time.monotonic()
+        data = {"pid": os.getpid(), "series": [[list(labels), values] for labels, values in self.snapshot().items()]}
+        try:
+            os.makedirs(self.multiprocess_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.multiprocess_dir, prefix=".tmp-")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._file_path())
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {self.multiprocess_dir}: {e}")
+
+    def _read_other_processes(self) -> Iterable[Tuple[Dict[str, Any], bool]]:
+        try:
+            names = os.listdir(self.multiprocess_dir)
+        except OSError:
+            return
+        own_file = os.path.basename(self._file_path())
+        for name in names:
+            if not name.startswith(METRICS_FILE_PREFIX) or name == own_file:
+                continue
+            try:
+                with open(os.path.join(self.multiprocess_dir, name)) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            yield data, _is_alive(data.get("pid"))
+
+    def collect(self) -> Dict[Labels, RequestSeries]:
+        """
+        Returns this process's series, plus those of the other workers when running with several.
+        """
+        collected: Dict[Labels, RequestSeries] = {}
+        for labels, values in self.snapshot().items():
+            collected.setdefault(labels, RequestSeries()).merge(values)
+        if self.multiprocess_dir:
+            for data, live in self._read_other_processes():
+                for labels, values in data.get("series", []):
+                    collected.setdefault(tuple(labels), RequestSeries()).merge(values, live=live)
+        return collected
+
+    def render_prometheus(self) -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        collected = sorted(self.collect().items())
+        lines = []
+
+        def family(name: str, kind: str, help_text: str, samples: Callable[[str, RequestSeries], List[str]]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (action, category), series in collected:
+                lines.extend(samples(_format_labels(action=action, category=category), series))
+
+        family("iterative_requests_total", "counter", "Requests handled.",
+               lambda labels, series: [f"iterative_requests_total{{{labels}}} {series.requests}"])
+        family("iterative_request_errors_total", "counter", "Requests that raised or returned a 5xx status.",
+               lambda labels, series: [f"iterative_request_errors_total{{{labels}}} {series.errors}"])
+        family("iterative_requests_in_flight", "gauge", "Requests being handled.",
+               lambda labels, series: [f"iterative_requests_in_flight{{{labels}}} {series.in_flight}"])
+        family("iterative_request_duration_seconds", "histogram", "Time to handle a request, response body included.",
+               _histogram_samples)
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_samples(labels: str, series: RequestSeries) -> List[str]:
+    samples = []
+    cumulative = 0
+    for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), series.bucket_counts):
+        cumulative += count
+        le = "+Inf" if bound == float("inf") else repr(bound)
+        samples.append(f'iterative_request_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+    samples.append(f"iterative_request_duration_seconds_sum{{{labels}}} {series.latency_sum}")
+    samples.append(f"iterative_request_duration_seconds_count{{{labels}}} {series.requests}")
+    return samples
+
+
+def _escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels.items())
+
+
+def _is_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def instrument_asgi_app(app: Callable, action: str, category: str, registry: "MetricsRegistry" = None) -> Callable:
+    """
+    Wraps the ASGI app of a route so every request to it is counted and timed, until its response body
+    is fully sent. Requests that raise, other than 4xx HTTPExceptions, or answer with a 5xx status
+    count as errors.
+    """
+    registry = registry or get_metrics_registry()
+    series = registry.series(action, category)
+
+    async def instrumented_app(scope, receive, send):
+        if scope["type"] != "http":
+            return await app(scope, receive, send)
+
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        series.in_flight += 1
+        start = time.perf_counter()
+        error = True
+        try:
+            await app(scope, receive, send_with_status)
+            error = status[0] >= 500
+        except Exception as e:
+            # HTTPExceptions are turned into responses further out, count them by their status
+            error = getattr(e, "status_code", 500) >= 500
+            raise
+        finally:
+            end = time.perf_counter()
+            series.in_flight -= 1
+            series.observe(end - start, error)
+            registry.maybe_flush()
+
+    instrumented_app.__iterative_instrumented__ = True
+    return instrumented_app
+
+
+def instrument_routes(routes: Iterable, category: str, action: str = None):
+    """
+    Instrument the given routes in place, labeling each with its name, or `action`, and `category`.
+    Routes that are already instrumented are left as they are.
+    """
+    for route in routes:
+        app = getattr(route, "app", None)
+        if app is None or not hasattr(route, "endpoint") or getattr(app, "__iterative_instrumented__", False):
+            continue
+        route.app = instrument_asgi_app(app, action or route.name, category)
+
+
+def reset_multiprocess_dir(multiprocess_dir: str):
+    """
+    Remove the metrics files of earlier runs. Call it once before starting the workers.
+    """
+    if not os.path.isdir(multiprocess_dir):
+        return
+    for name in os.listdir(multiprocess_dir):
+        if name.startswith(METRICS_FILE_PREFIX) or name.startswith(".tmp-"):
+            try:
+                os.remove(os.path.join(multiprocess_dir, name))
+            except OSError:
+                pass
+
+
+def is_metrics_enabled() -> bool:
+    from iterative.config import get_config
+
+    return bool(get_config().get("metrics_enabled", True))
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Returns the process wide registry, configured from `metrics_multiprocess_dir` and `metrics_flush_interval`.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                from iterative.config import get_config
+
+                config = get_config()
+                multiprocess_dir = config.get("metrics_multiprocess_dir") or os.environ.get("ITERATIVE_METRICS_DIR")
+                _registry = MetricsRegistry(multiprocess_dir, config.get("metrics_flush_interval") or 1.0)
+    return _registry
@@ -0,0 +1,427 @@
+"""
+Startup profiler for `prep_app()`.
+
+This module only imports the standard library at the top, so it can be loaded and started before
+`import iterative` when profiling a cold start in a fresh interpreter.
+"""
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+PROFILE_FILE = "startup_profile.json"
+SPEEDSCOPE_FILE = "startup_profile.speedscope.json"
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+class PhaseTiming:
+    __slots__ = ("name", "depth", "start", "wall", "cpu", "open_seq", "close_seq")
+
+    def __init__(self, name: str, depth: int, start: float, open_seq: int):
+        self.name = name
+        self.depth = depth
+        self.start = start
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.open_seq = open_seq
+        self.close_seq = open_seq
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class ImportTiming:
+    __slots__ = ("name", "path", "phase", "is_user", "depth", "start", "wall", "self_wall", "cpu", "open_seq", "close_seq")
+
+    def __init__(self, name: str, path: Optional[str], phase: Optional[str], is_user: bool, depth: int,
+                 start: float, open_seq: int):
+        self.name = name
+        self.path = path
+        self.phase = phase
+        self.is_user = is_user
+        self.depth = depth
+        self.start = start
+        self.wall = 0.0
+        self.self_wall = 0.0
+        self.cpu = 0.0
+        self.open_seq = open_seq
+        self.close_seq = open_seq
+
+    @property
+    def dependencies_wall(self) -> float:
+        """
+        Seconds spent importing other modules while this one was executing.
+        """
+        return self.wall - self.self_wall
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+def _from_dict(cls, data: Dict[str, Any]):
+    timing = cls.__new__(cls)
+    for slot in cls.__slots__:
+        setattr(timing, slot, data.get(slot))
+    return timing
+
+
+class StartupProfile:
+    """
+    Wall and CPU time of every startup phase and every module imported while profiling.
+
+    Phases and imports are listed in the order they started. Import times are inclusive, `self_wall`
+    excludes the modules a module imported in turn.
+    """
+
+    def __init__(self, phases: List[PhaseTiming], imports: List[ImportTiming], wall: float, cpu: float):
+        self.phases = phases
+        self.imports = imports
+        self.wall = wall
+        self.cpu = cpu
+
+    def get_phase(self, name: str) -> Optional[PhaseTiming]:
+        for phase in self.phases:
+            if phase.name == name:
+                return phase
+        return None
+
+    def user_modules(self) -> List[ImportTiming]:
+        return sorted((timing for timing in self.imports if timing.is_user), key=lambda timing: timing.wall, reverse=True)
+
+    def slowest_imports(self, limit: int = 20) -> List[ImportTiming]:
+        return sorted(self.imports, key=lambda timing: timing.wall, reverse=True)[:limit]
+
+    def exceeds(self, budget_seconds: float) -> bool:
+        return self.wall > budget_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "phases": [phase.to_dict() for phase in self.phases],
+            "imports": [timing.to_dict() for timing in self.imports],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StartupProfile":
+        return cls(
+            phases=[_from_dict(PhaseTiming, phase) for phase in data["phases"]],
+            imports=[_from_dict(ImportTiming, timing) for timing in data["imports"]],
+            wall=data["wall"],
+            cpu=data["cpu"],
+        )
+
+    def to_speedscope(self) -> Dict[str, Any]:
+        """
+        Returns the profile in speedscope's evented format, phases and imports as nested frames.
+        """
+        frames = []
+        frame_indexes: Dict[str, int] = {}
+        events = []
+        for kind, timings in (("phase", self.phases), ("import", self.imports)):
+            for timing in timings:
+                frame_name = f"{kind}: {timing.name}"
+                if frame_name not in frame_indexes:
+                    frame_indexes[frame_name] = len(frames)
+                    frame = {"name": frame_name}
+                    if getattr(timing, "path", None):
+                        frame["file"] = timing.path
+                    frames.append(frame)
+                frame_index = frame_indexes[frame_name]
+                events.append((timing.open_seq, {"type": "O", "frame": frame_index, "at": timing.start}))
+                events.append((timing.close_seq, {"type": "C", "frame": frame_index, "at": timing.start + timing.wall}))
+        # Sequence numbers were taken as phases and imports opened and closed, so they nest correctly
+        events.sort(key=lambda event: event[0])
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "evented",
+                "name": "iterative startup",
+                "unit": "seconds",
+                "startValue": 0.0,
+                "endValue": self.wall,
+                "events": [event for _, event in events],
+            }],
+            "name": "iterative startup",
+            "exporter": "iterative profile-startup",
+        }
+
+    def format_table(self, limit: int = 20) -> str:
+        lines = [f"Startup: {self.wall:.3f}s wall, {self.cpu:.3f}s cpu", ""]
+        lines.append(f"{'Phase':<56}{'Wall (s)':>10}{'CPU (s)':>10}")
+        for phase in self.phases:
+            name = "  " * phase.depth + phase.name
+            lines.append(f"{name[:56]:<56}{phase.wall:>10.3f}{phase.cpu:>10.3f}")
+
+        user_modules = self.user_modules()
+        if user_modules:
+            lines.append("")
+            lines.append(f"{'User module':<56}{'Wall (s)':>10}{'Self (s)':>10}{'Deps (s)':>10}")
+            for timing in user_modules[:limit]:
+                name = os.path.relpath(timing.path) if timing.path else timing.name
+                lines.append(f"{name[-56:]:<56}{timing.wall:>10.3f}{timing.self_wall:>10.3f}{timing.dependencies_wall:>10.3f}")
+
+        lines.append("")
+        lines.append(f"{'Slowest imports (inclusive)':<56}{'Wall (s)':>10}{'Self (s)':>10}{'CPU (s)':>10}")
+        for timing in self.slowest_imports(limit):
+            lines.append(f"{timing.name[:56]:<56}{timing.wall:>10.3f}{timing.self_wall:>10.3f}{timing.cpu:>10.3f}")
+        return "\n".join(lines)
+
+
+class _TimedLoader:
+    """
+    Wraps a module's loader to time its execution. The real loader is put back once the module ran.
+    """
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        create_module = getattr(self._loader, "create_module", None)
+        return create_module(spec) if create_module else None
+
+    def exec_module(self, module):
+        spec = module.__spec__
+        try:
+            with self._profiler.module_import(spec.name, spec.origin if spec.has_location else None):
+                self._loader.exec_module(module)
+        finally:
+            spec.loader = self._loader
+            if getattr(module, "__loader__", None) is self:
+                module.__loader__ = self._loader
+
+
+class _ImportTimingFinder:
+    """
+    First entry of `sys.meta_path` while profiling. Finds specs through the other finders and wraps their loaders.
+    """
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        if threading.get_ident() != self._profiler.thread_id:
+            return None
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    """
+    Records wall and CPU time of startup phases and of every module imported on the profiling thread.
+    """
+
+    def __init__(self):
+        self.thread_id = threading.get_ident()
+        self._phases: List[PhaseTiming] = []
+        self._imports: List[ImportTiming] = []
+        self._phase_stack: List[PhaseTiming] = []
+        # Each entry holds the timing and the wall time spent in the modules it imported
+        self._import_stack: List[list] = []
+        self._seq = itertools.count()
+        self._finder = _ImportTimingFinder(self)
+        self._start_wall = 0.0
+        self._start_cpu = 0.0
+        self._stop_wall = None
+        self._stop_cpu = None
+
+    def start(self):
+        global _active_profiler
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        sys.meta_path.insert(0, self._finder)
+        _active_profiler = self
+
+    def stop(self) -> StartupProfile:
+        global _active_profiler
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        if _active_profiler is self:
+            _active_profiler = None
+        self._stop_wall = time.perf_counter()
+        self._stop_cpu = time.process_time()
+        return self.profile()
+
+    def profile(self) -> StartupProfile:
+        wall = (self._stop_wall or time.perf_counter()) - self._start_wall
+        cpu = (self._stop_cpu or time.process_time()) - self._start_cpu
+        return StartupProfile(list(self._phases), list(self._imports), wall, cpu)
+
+    @contextmanager
+    def phase(self, name: str):
+        timing = PhaseTiming(name, len(self._phase_stack), time.perf_counter() - self._start_wall, next(self._seq))
+        self._phases.append(timing)
+        self._phase_stack.append(timing)
+        start_cpu = time.process_time()
+        try:
+            yield timing
+        finally:
+            timing.wall = time.perf_counter() - self._start_wall - timing.start
+            timing.cpu = time.process_time() - start_cpu
+            timing.close_seq = next(self._seq)
+            self._phase_stack.pop()
+
+    @contextmanager
+    def module_import(self, name: str, path: Optional[str] = None, is_user: bool = False):
+        if threading.get_ident() != self.thread_id:
+            yield None
+            return
+        phase = self._phase_stack[-1].name if self._phase_stack else None
+        timing = ImportTiming(name, path, phase, is_user, len(self._import_stack),
+                              time.perf_counter() - self._start_wall, next(self._seq))
+        self._imports.append(timing)
+        entry = [timing, 0.0]
+        self._import_stack.append(entry)
+        start_cpu = time.process_time()
+        try:
+            yield timing
+        finally:
+            timing.wall = time.perf_counter() - self._start_wall - timing.start
+            timing.cpu = time.process_time() - start_cpu
+            timing.self_wall = timing.wall - entry[1]
+            timing.close_seq = next(self._seq)
+            self._import_stack.pop()
+            if self._import_stack:
+                self._import_stack[-1][1] += timing.wall
+
+
+_active_profiler: Optional[StartupProfiler] = None
+
+
+def get_active_profiler() -> Optional[StartupProfiler]:
+    return _active_profiler
+
+
+@contextmanager
+def startup_phase(name: str):
+    """
+    Time a block of startup work as a named phase, and trace it as a span when startup is traced.
+    Does nothing unless a profiler is running or a trace is being recorded.
+    """
+    # Imported here so this module can still be loaded before the iterative package
+    from iterative.service.telemetry_management.service.trace_utils import trace_span
+
+    profiler = _active_profiler
+    with trace_span(name):
+        if profiler is None or threading.get_ident() != profiler.thread_id:
+            yield
+            return
+        with profiler.phase(name):
+            yield
+
+
+@contextmanager
+def module_import(name: str, path: Optional[str] = None, is_user: bool = False):
+    """
+    Time the execution of a module that is loaded without going through the import system.
+    Does nothing unless a profiler is running.
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        yield
+        return
+    with profiler.module_import(name, path, is_user):
+        yield
+
+
+def profile_startup(prepare: Callable = None) -> StartupProfile:
+    """
+    Profile `import iterative` and `prep_app()` in this process.
+
+    Only a fresh interpreter gives cold start numbers, modules imported before the call are not timed.
+    Use `profile_startup_in_subprocess` for that.
+
+    Args:
+        prepare (Callable, optional): The startup to profile instead of `iterative.prep_app`.
+    """
+    profiler = StartupProfiler()
+    profiler.start()
+    try:
+        with profiler.phase("import iterative"):
+            import iterative
+        with profiler.phase("prep_app"):
+            (prepare or iterative.prep_app)()
+    finally:
+        profile = profiler.stop()
+    return profile
+
+
+# Loads this file under its own module name before anything imports the iterative package
+_BOOTSTRAP = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location({name!r}, {path!r})
+module = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = module
+spec.loader.exec_module(module)
+module.main(sys.argv[1:])
+"""
+
+
+def profile_startup_in_subprocess(cwd: str = None, timeout: float = None) -> StartupProfile:
+    """
+    Profile a cold start of the app in a fresh interpreter.
+
+    Raises:
+        RuntimeError: If the profiled startup fails.
+    """
+    bootstrap = _BOOTSTRAP.format(name=__name__, path=os.path.abspath(__file__))
+    fd, output_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        result = subprocess.run(
+            [sys.executable, "-c", bootstrap, output_path],
+            cwd=cwd, capture_output=True, text=True, timeout=timeout,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Profiled startup failed with exit code {result.returncode}:\n{result.stderr[-4000:]}")
+        with open(output_path, "r", encoding="utf-8") as f:
+            return StartupProfile.from_dict(json.load(f))
+    finally:
+        os.remove(output_path)
+
+
+def write_profile(profile: StartupProfile, directory: str, trace_format: str = "json") -> str:
+    """
+    Write the profile to the directory, as the profile's own JSON or as a speedscope trace.
+
+    Returns:
+        str: The path of the written file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    if trace_format == "speedscope":
+        path, data = os.path.join(directory, SPEEDSCOPE_FILE), profile.to_speedscope()
+    else:
+        path, data = os.path.join(directory, PROFILE_FILE), profile.to_dict()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    return path
+
+
+def main(argv: List[str]):
+    profile = profile_startup()
+    with open(argv[0], "w", encoding="utf-8") as f:
+        json.dump(profile.to_dict(), f)
@@ -0,0 +1,418 @@
+"""
+Request and startup tracing.
+
+Spans nest through a context variable, so they follow a request across awaits and into the action
+thread pool. A trace is sampled when its root span starts, its children are only recorded if it was.
+Finished traces are written by a background thread to `logs_path`, in the Chrome trace format or as
+OTLP JSON lines.
+
+This module only imports the standard library, like `profile_utils`, which opens a span per startup phase.
+"""
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+CHROME = "chrome"
+OTLP = "otlp"
+TRACE_FORMATS = (CHROME, OTLP)
+
+
+class Span:
+    __slots__ = ("name", "trace", "span_id", "parent_id", "start_ns", "end_ns", "thread_id", "attributes", "error")
+
+    def __init__(self, name: str, trace: "Trace", parent_id: Optional[str], start_ns: int = None):
+        self.name = name
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns = None
+        self.thread_id = threading.get_ident()
+        self.attributes: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+
+    def set_attribute(self, name: str, value: Any):
+        self.attributes[name] = value
+
+    @property
+    def duration(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def to_chrome_event(self, pid: int) -> Dict[str, Any]:
+        args = {"trace_id": self.trace.trace_id, "span_id": self.span_id, "parent_id": self.parent_id, **self.attributes}
+        if self.error:
+            args["error"] = self.error
+        return {
+            "name": self.name, "cat": self.trace.root_name, "ph": "X", "pid": pid, "tid": self.thread_id,
+            "ts": self.start_ns / 1000, "dur": (self.end_ns - self.start_ns) / 1000, "args": args,
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            # Server for the root span of a request, internal otherwise
+            "kind": 2 if self.parent_id is None and "http.method" in self.attributes else 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Trace:
+    """
+    The spans of one request or startup. Exported as a whole once every span of it has ended.
+    """
+
+    __slots__ = ("trace_id", "root_name", "spans", "open_spans", "_lock")
+
+    def __init__(self, root_name: str):
+        self.trace_id = os.urandom(16).hex()
+        self.root_name = root_name
+        self.spans: List[Span] = []
+        self.open_spans = 0
+        self._lock = threading.Lock()
+
+    def open(self, span: Span):
+        with self._lock:
+            self.open_spans += 1
+
+    def close(self, span: Span) -> bool:
+        """
+        Record a finished span, returns True once the last open span of the trace ended.
+        """
+        with self._lock:
+            self.spans.append(span)
+            self.open_spans -= 1
+            return self.open_spans == 0
+
+
+# The current span, or False inside a trace that wasn't sampled
+_current_span: ContextVar = ContextVar("iterative_current_span", default=None)
+
+
+class TraceExporter:
+    """
+    Appends finished traces to a file in `directory`, from a background thread so requests never wait on disk.
+
+    Chrome traces are a JSON array left open, which chrome://tracing and Perfetto accept, written to
+    `traces-<pid>.json`. OTLP traces are one `{"resourceSpans": ...}` object per line in `traces-<pid>.otlp.jsonl`.
+    """
+
+    def __init__(self, directory: str, trace_format: str = CHROME, service_name: str = "iterative"):
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format {trace_format!r}, expected one of {', '.join(TRACE_FORMATS)}")
+        self.directory = directory
+        self.trace_format = trace_format
+        self.service_name = service_name
+        self.pid = os.getpid()
+        extension = "json" if trace_format == CHROME else "otlp.jsonl"
+        self.path = os.path.join(directory, f"traces-{self.pid}.{extension}")
+        self._queue: "queue.SimpleQueue[Optional[Trace]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.exported = 0
+
+    def export(self, trace: Trace):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="iterative-trace-exporter", daemon=True)
+                    self._thread.start()
+        self._queue.put(trace)
+
+    def _run(self):
+        while True:
+            traces = [self._queue.get()]
+            # Write whatever else is already waiting in the same go
+            while not self._queue.empty():
+                traces.append(self._queue.get())
+            stop = None in traces
+            traces = [trace for trace in traces if trace is not None]
+            if traces:
+                try:
+                    self.write(traces)
+                except OSError as e:
+                    logger.warning(f"Could not write traces to {self.path}: {e}")
+            if stop:
+                return
+
+    def write(self, traces: List[Trace]):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            if self.trace_format == CHROME:
+                if f.tell() == 0:
+                    f.write("[\n")
+                for trace in traces:
+                    for span in trace.spans:
+                        f.write(json.dumps(span.to_chrome_event(self.pid), default=str) + ",\n")
+            else:
+                for trace in traces:
+                    f.write(json.dumps(self.to_otlp(trace), default=str) + "\n")
+        self.exported += len(traces)
+
+    def to_otlp(self, trace: Trace) -> Dict[str, Any]:
+        resource = {"attributes": [
+            {"key": "service.name", "value": {"stringValue": self.service_name}},
+            {"key": "process.pid", "value": {"intValue": str(self.pid)}},
+        ]}
+        return {"resourceSpans": [{
+            "resource": resource,
+            "scopeSpans": [{"scope": {"name": "iterative"}, "spans": [span.to_otlp() for span in trace.spans]}],
+        }]}
+
+    def shutdown(self, timeout: float = 5.0):
+        """
+        Write the traces still queued and stop the background thread.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+
+class Tracer:
+    """
+    Starts traces, samples them and hands the finished ones to the exporter.
+
+    Args:
+        exporter (TraceExporter, optional): Where finished traces go, created from the config on first use if None.
+        sample_rate (float, optional): Share of traces recorded, read from `trace_sample_rate` if None.
+        enabled (bool, optional): Whether to trace at all, read from `trace_enabled` if None.
+    """
+
+    def __init__(self, exporter: TraceExporter = None, sample_rate: float = None, enabled: bool = None):
+        self._exporter = exporter
+        self.sample_rate = sample_rate
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    def is_enabled(self) -> bool:
+        if self.enabled is not None:
+            return self.enabled
+        from iterative.config import get_config
+
+        return bool(get_config().get("trace_enabled"))
+
+    def get_sample_rate(self) -> float:
+        if self.sample_rate is not None:
+            return self.sample_rate
+        from iterative.config import get_config
+
+        sample_rate = get_config().get("trace_sample_rate")
+        return 1.0 if sample_rate is None else float(sample_rate)
+
+    def should_sample(self) -> bool:
+        sample_rate = self.get_sample_rate()
+        return sample_rate >= 1.0 or random.random() < sample_rate
+
+    def get_exporter(self) -> TraceExporter:
+        if self._exporter is None:
+            with self._lock:
+                if self._exporter is None:
+                    from iterative.config import get_config
+                    from iterative.service.project_management.service.project_utils import resolve_project_folder_path
+
+                    config = get_config()
+                    directory = resolve_project_folder_path(config.get("logs_path") or "logs")
+                    self._exporter = TraceExporter(directory, config.get("trace_format") or CHROME,
+                                                   config.get("app_name") or "iterative")
+        return self._exporter
+
+    def finish(self, trace: Trace):
+        self.get_exporter().export(trace)
+
+    def shutdown(self):
+        """
+        Flush the exporter. A new one is created from the current config on the next trace.
+        """
+        with self._lock:
+            exporter, self._exporter = self._exporter, None
+        if exporter is not None:
+            exporter.shutdown()
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """
+    Replace the process wide tracer, returns the previous one.
+    """
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+def get_current_span() -> Optional[Span]:
+    return _current_span.get() or None
+
+
+@contextmanager
+def trace_span(name: str, root: bool = False, start_ns: int = None, **attributes):
+    """
+    Record a block as a span, a child of the current one.
+
+    Without a current span, a root span starting a new trace is only created if `root` is true and tracing
+    is enabled, and only recorded if the trace is sampled. Otherwise this does nothing and yields None.
+
+    Args:
+        name (str): The span name.
+        root (bool, optional): Start a trace if there is none. Defaults to False.
+        start_ns (int, optional): When the span started, in epoch nanoseconds. Defaults to now.
+        **attributes: Attributes of the span.
+    """
+    parent = _current_span.get()
+    if parent is False:
+        yield None
+        return
+    if parent is None:
+        if not root:
+            yield None
+            return
+        tracer = _tracer
+        if not tracer.is_enabled():
+            yield None
+            return
+        if not tracer.should_sample():
+            token = _current_span.set(False)
+            try:
+                yield None
+            finally:
+                _current_span.reset(token)
+            return
+        trace, parent_id = Trace(name), None
+    else:
+        trace, parent_id = parent.trace, parent.span_id
+
+    span = Span(name, trace, parent_id, start_ns)
+    span.attributes.update(attributes)
+    trace.open(span)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end_ns = time.time_ns()
+        if trace.close(span):
+            _tracer.finish(trace)
+
+
+def add_span(name: str, start_ns: int, end_ns: int, **attributes):
+    """
+    Record a block that already ran as a child of the current span, if there is one.
+    """
+    parent = _current_span.get()
+    if not parent:
+        return
+    span = Span(name, parent.trace, parent.span_id, start_ns)
+    span.attributes.update(attributes)
+    span.end_ns = end_ns
+    parent.trace.open(span)
+    parent.trace.close(span)
+
+
+def add_elapsed_span(name: str, **attributes):
+    """
+    Record the time since the current span started as a child of it, for work that ran before our code
+    got control, like FastAPI validating a request's arguments.
+    """
+    parent = _current_span.get()
+    if parent:
+        add_span(name, parent.start_ns, time.time_ns(), **attributes)
+
+
+def trace_asgi_app(app, name: str, **attributes):
+    """
+    Wraps the ASGI app of a route so each request to it in a sampled trace gets a span.
+    """
+    async def traced_app(scope, receive, send):
+        if not _current_span.get():
+            return await app(scope, receive, send)
+        with trace_span(name, **attributes):
+            await app(scope, receive, send)
+
+    traced_app.__iterative_traced__ = True
+    return traced_app
+
+
+def trace_routes(routes, category: str, action: str = None):
+    """
+    Trace the given routes in place, routes that are already traced are left as they are.
+    """
+    for route in routes:
+        app = getattr(route, "app", None)
+        if app is None or not hasattr(route, "endpoint") or getattr(app, "__iterative_traced__", False):
+            continue
+        name = action or route.name
+        route.app = trace_asgi_app(app, f"route {name}", **{"iterative.action": name, "iterative.category": category})
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware starting a trace per HTTP request, labeled with the action the request was routed to.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _current_span.get() is not None:
+            return await self.app(scope, receive, send)
+
+        with trace_span(f"{scope['method']} {scope['path']}", root=True) as span:
+            if span is None:
+                return await self.app(scope, receive, send)
+
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            span.set_attribute("http.method", scope["method"])
+            span.set_attribute("http.target", scope["path"])
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # The router fills in the endpoint while handling the request
+                action = getattr(scope.get("endpoint"), "__iterative_action_name__", None)
+                if action:
+                    span.set_attribute("iterative.action", action)
+
+
+@atexit.register
+def _flush_traces():
+    _tracer.shutdown()
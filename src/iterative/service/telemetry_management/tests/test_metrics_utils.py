@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import time
+from fastapi import APIRouter, FastAPI, HTTPException
+from iterative.service.telemetry_management.service.metrics_utils import (
+    LATENCY_BUCKETS,
+    MetricsRegistry,
+    instrument_asgi_app,
+    instrument_routes,
+)
+
+
+def call_route(route, path: str) -> int:
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": [], "path_params": {}, "app": FastAPI(),
+    }
+    try:
+        asyncio.run(route.handle(scope, receive, send))
+    except HTTPException as e:
+        return e.status_code
+    return messages[0]["status"]
+
+
+def make_routes():
+    router = APIRouter()
+
+    @router.get("/ok")
+    def ok():
+        return {"ok": True}
+
+    @router.get("/missing")
+    def missing():
+        raise HTTPException(status_code=404, detail="not found")
+
+    @router.get("/broken")
+    def broken():
+        raise HTTPException(status_code=503, detail="down")
+
+    return {route.path: route for route in router.routes}
+
+
+def test_instrumented_routes_count_requests_and_errors():
+    registry = MetricsRegistry()
+    routes = make_routes()
+    for route in routes.values():
+        route.app = instrument_asgi_app(route.app, route.name, "Tests", registry)
+
+    assert call_route(routes["/ok"], "/ok") == 200
+    assert call_route(routes["/ok"], "/ok") == 200
+    assert call_route(routes["/missing"], "/missing") == 404
+    assert call_route(routes["/broken"], "/broken") == 503
+
+    snapshot = registry.snapshot()
+    assert snapshot[("ok", "Tests")]["requests"] == 2
+    assert snapshot[("ok", "Tests")]["errors"] == 0
+    assert snapshot[("missing", "Tests")]["errors"] == 0
+    assert snapshot[("broken", "Tests")]["errors"] == 1
+    assert snapshot[("ok", "Tests")]["in_flight"] == 0
+
+
+def test_instrument_routes_wraps_each_route_once():
+    routes = list(make_routes().values())
+    instrument_routes(routes, "Tests", action="shared")
+    apps = [route.app for route in routes]
+    instrument_routes(routes, "Tests")
+    assert [route.app for route in routes] == apps
+
+
+def test_prometheus_histogram_is_cumulative():
+    registry = MetricsRegistry()
+    series = registry.series("get_user", "Users")
+    series.observe(0.001, error=False)
+    series.observe(0.3, error=False)
+    series.observe(60, error=True)
+
+    text = registry.render_prometheus()
+    assert "# TYPE iterative_request_duration_seconds histogram" in text
+    assert 'iterative_requests_total{action="get_user",category="Users"} 3' in text
+    assert 'iterative_request_errors_total{action="get_user",category="Users"} 1' in text
+    assert 'iterative_request_duration_seconds_bucket{action="get_user",category="Users",le="0.005"} 1' in text
+    assert 'iterative_request_duration_seconds_bucket{action="get_user",category="Users",le="0.5"} 2' in text
+    assert 'iterative_request_duration_seconds_bucket{action="get_user",category="Users",le="+Inf"} 3' in text
+    assert 'iterative_request_duration_seconds_count{action="get_user",category="Users"} 3' in text
+
+
+def test_multiprocess_metrics_are_added_up(tmp_path):
+    registry = MetricsRegistry(str(tmp_path))
+    registry.series("get_user", "Users").observe(0.01, error=False)
+    registry.series("get_user", "Users").in_flight = 1
+
+    # A worker that exited, its counters stay but its in-flight requests don't
+    other = {"requests": 4, "errors": 1, "in_flight": 2, "bucket_counts": [0] * len(LATENCY_BUCKETS) + [4],
+             "latency_sum": 80.0}
+    with open(os.path.join(tmp_path, "metrics-999999999.json"), "w") as f:
+        json.dump({"pid": 999999999, "series": [[["get_user", "Users"], other]]}, f)
+
+    series = registry.collect()[("get_user", "Users")]
+    assert series.requests == 5
+    assert series.errors == 1
+    assert series.in_flight == 1
+    assert series.bucket_counts[-1] == 4
+
+    registry.flush()
+    assert os.path.exists(os.path.join(tmp_path, f"metrics-{os.getpid()}.json"))
+    # Its own file isn't counted twice
+    assert registry.collect()[("get_user", "Users")].requests == 5
+
+
+def test_idle_worker_metrics_are_flushed_by_the_timer(tmp_path):
+    registry = MetricsRegistry(str(tmp_path), flush_interval=0.05)
+    registry.start_flushing()
+    try:
+        # No request finishes after this one, nothing on the request path flushes it
+        registry.series("get_user", "Users").observe(0.01, error=False)
+        path = os.path.join(tmp_path, f"metrics-{os.getpid()}.json")
+        for _ in range(100):
+            if os.path.exists(path):
+                break
+            time.sleep(0.02)
+        with open(path) as f:
+            assert json.load(f)["series"][0][1]["requests"] == 1
+    finally:
+        registry.stop_flushing()
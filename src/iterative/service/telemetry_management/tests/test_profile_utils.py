@@ -0,0 +1,50 @@
+import sys
+from iterative.service.telemetry_management.service.profile_utils import StartupProfile, StartupProfiler, startup_phase
+
+
+def test_profiler_times_phases_and_nested_imports(tmp_path, monkeypatch):
+    (tmp_path / "profiled_outer.py").write_text("import profiled_inner\n")
+    (tmp_path / "profiled_inner.py").write_text("import time\ntime.sleep(0.01)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = StartupProfiler()
+    profiler.start()
+    try:
+        with startup_phase("discovery"):
+            with startup_phase("imports"):
+                import profiled_outer  # noqa: F401
+    finally:
+        profile = profiler.stop()
+        sys.modules.pop("profiled_outer", None)
+        sys.modules.pop("profiled_inner", None)
+
+    assert [(phase.name, phase.depth) for phase in profile.phases] == [("discovery", 0), ("imports", 1)]
+    outer, inner = profile.imports
+    assert (outer.name, inner.name) == ("profiled_outer", "profiled_inner")
+    assert inner.phase == "imports"
+    assert inner.wall >= 0.01
+    assert outer.wall >= inner.wall
+    assert abs(outer.self_wall - (outer.wall - inner.wall)) < 1e-9
+    # The real loader is handed back once the module ran
+    assert type(profiled_outer.__loader__).__name__ == "SourceFileLoader"
+
+    # Startup phases are free when no profiler is running
+    with startup_phase("not recorded"):
+        pass
+    assert len(profile.phases) == 2
+
+
+def test_profile_round_trips_and_exports_nested_speedscope_events():
+    profiler = StartupProfiler()
+    profiler.start()
+    with startup_phase("outer"):
+        with profiler.module_import("user_module", "/project/user_module.py", is_user=True):
+            pass
+    profile = StartupProfile.from_dict(profiler.stop().to_dict())
+
+    assert [timing.name for timing in profile.user_modules()] == ["user_module"]
+    assert not profile.exceeds(60)
+    events = profile.to_speedscope()["profiles"][0]["events"]
+    assert [event["type"] for event in events] == ["O", "O", "C", "C"]
+    assert events[0]["frame"] == events[3]["frame"]
+    assert "outer" in profile.format_table()
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import pytest
+from iterative.service.action_management.service.invoke_utils import ActionInvoker
+from iterative.service.telemetry_management.service.trace_utils import (
+    TraceExporter,
+    Tracer,
+    TracingMiddleware,
+    get_current_span,
+    set_tracer,
+    trace_span,
+)
+
+
+class RecordingTracer(Tracer):
+    def __init__(self, sample_rate: float = 1.0):
+        super().__init__(sample_rate=sample_rate, enabled=True)
+        self.traces = []
+
+    def finish(self, trace):
+        self.traces.append(trace)
+
+
+@pytest.fixture
+def tracer():
+    tracer = RecordingTracer()
+    previous = set_tracer(tracer)
+    yield tracer
+    set_tracer(previous)
+
+
+def nested_lookup(key: str) -> str:
+    with trace_span("lookup", key=key):
+        return key.upper()
+
+
+def test_spans_nest_into_one_trace(tracer):
+    with trace_span("request", root=True):
+        with trace_span("validate arguments"):
+            pass
+        nested_lookup("a")
+
+    assert len(tracer.traces) == 1
+    spans = {span.name: span for span in tracer.traces[0].spans}
+    assert spans["request"].parent_id is None
+    assert spans["validate arguments"].parent_id == spans["request"].span_id
+    assert spans["lookup"].attributes == {"key": "a"}
+    assert get_current_span() is None
+
+
+def test_children_without_a_trace_are_not_recorded(tracer):
+    with trace_span("lookup") as span:
+        assert span is None
+    assert tracer.traces == []
+
+
+def test_unsampled_traces_record_nothing():
+    tracer = RecordingTracer(sample_rate=0.0)
+    previous = set_tracer(tracer)
+    try:
+        with trace_span("request", root=True) as span:
+            assert span is None
+            nested_lookup("a")
+    finally:
+        set_tracer(previous)
+    assert tracer.traces == []
+
+
+def test_spans_follow_actions_into_the_thread_pool(tracer):
+    invoker = ActionInvoker(threads=2)
+
+    async def handle():
+        with trace_span("request", root=True):
+            return await invoker.invoke(nested_lookup, "b")
+
+    try:
+        assert asyncio.run(handle()) == "B"
+    finally:
+        invoker.shutdown()
+
+    spans = {span.name: span for span in tracer.traces[0].spans}
+    assert spans["execute nested_lookup"].parent_id == spans["request"].span_id
+    assert spans["lookup"].parent_id == spans["execute nested_lookup"].span_id
+
+
+def test_errors_are_recorded(tracer):
+    with pytest.raises(KeyError):
+        with trace_span("request", root=True):
+            raise KeyError("missing")
+    assert tracer.traces[0].spans[0].error == "KeyError: 'missing'"
+
+
+def test_middleware_traces_requests(tracer):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/hello"}
+    asyncio.run(TracingMiddleware(app)(scope, None, send))
+
+    span = tracer.traces[0].spans[0]
+    assert span.name == "GET /hello"
+    assert span.attributes["http.status_code"] == 200
+
+
+@pytest.mark.parametrize("trace_format", ["chrome", "otlp"])
+def test_exporter_writes_traces(tmp_path, trace_format):
+    exporter = TraceExporter(str(tmp_path), trace_format)
+    previous = set_tracer(Tracer(exporter, sample_rate=1.0, enabled=True))
+    try:
+        with trace_span("request", root=True):
+            nested_lookup("c")
+    finally:
+        set_tracer(previous)
+    exporter.shutdown()
+
+    with open(exporter.path) as f:
+        content = f.read()
+    if trace_format == "chrome":
+        events = json.loads(content.rstrip().rstrip(",") + "]")
+        assert sorted(event["name"] for event in events) == ["lookup", "request"]
+        assert all(event["ph"] == "X" for event in events)
+    else:
+        spans = json.loads(content)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert sorted(span["name"] for span in spans) == ["lookup", "request"]
+        assert len({span["traceId"] for span in spans}) == 1
@@ -1,16 +1,11 @@
-import importlib
 import os
-import sys
 
-from iterative.service.project_management.service.project_utils import get_project_root
+from iterative.service.project_management.service.project_utils import get_project_root, load_module_from_path
+from iterative.service.project_management.service.scan_utils import files_within, get_project_index
 
 
 def import_main_from_script(file_path):
-    module_name = os.path.splitext(os.path.basename(file_path))[0]
-    spec = importlib.util.spec_from_file_location(module_name, file_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[spec.name] = module
-    spec.loader.exec_module(module)
+    module = load_module_from_path(file_path)
 
     return getattr(module, 'main', None)
 
@@ -22,13 +17,11 @@ def find_streamlit_scripts(in_current_project=True):
     streamlit_scripts = {}
     streamlit_path = os.path.join(root_path, 'streamlits')
 
-    for root, dirs, files in os.walk(streamlit_path):
-        for file in files:
-            if file.endswith('.py') and not file.startswith('__'):
-                file_path = os.path.join(root, file)
-                main_function = import_main_from_script(file_path)
-                if main_function:
-                    script_name = os.path.splitext(file)[0].replace('_', ' ').title()
-                    streamlit_scripts[script_name] = main_function
+    for file_path in files_within(get_project_index(root_path).streamlits, streamlit_path):
+        file = os.path.basename(file_path)
+        main_function = import_main_from_script(file_path)
+        if main_function:
+            script_name = os.path.splitext(file)[0].replace('_', ' ').title()
+            streamlit_scripts[script_name] = main_function
     return streamlit_scripts
 
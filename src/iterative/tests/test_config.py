@@ -0,0 +1,68 @@
+import threading
+import pytest
+from pydantic import ValidationError
+from iterative.config import Config
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return Config()
+
+
+def test_snapshot_is_frozen_and_read_as_attributes(config):
+    snapshot = config.snapshot
+    assert snapshot.fastapi_host == config.get("fastapi_host")
+    assert isinstance(snapshot.scan_ignore, tuple)
+    with pytest.raises(AttributeError):
+        snapshot.fastapi_host = "127.0.0.1"
+    with pytest.raises(TypeError):
+        snapshot.metadata["key"] = "value"
+
+
+def test_transaction_publishes_all_changes_at_once(config):
+    before = config.snapshot
+    with config.transaction() as transaction:
+        transaction.set("fastapi_host", "127.0.0.1")
+        transaction.set("fastapi_port", 9000)
+        # Nothing is visible until the block exits
+        assert config.get("fastapi_port") == before.fastapi_port
+        assert transaction.get("fastapi_port") == 9000
+
+    assert (config.get("fastapi_host"), config.get("fastapi_port")) == ("127.0.0.1", 9000)
+    assert before.fastapi_host != "127.0.0.1"
+    assert config.version == before._version + 1
+
+
+def test_failed_transaction_applies_nothing(config):
+    before = config.snapshot
+    with pytest.raises(ValidationError):
+        with config.transaction() as transaction:
+            transaction.set("fastapi_host", "127.0.0.1")
+            transaction.set("fastapi_port", "not a port")
+    with pytest.raises(KeyError):
+        config.set("not_a_config_key", 1)
+    assert config.snapshot is before
+
+
+def test_readers_never_see_half_applied_updates(config):
+    config.set("fastapi_port", 1)
+    config.set("actions_cap", 1)
+    stop = threading.Event()
+    torn_reads = []
+
+    def read():
+        while not stop.is_set():
+            snapshot = config.snapshot
+            if snapshot.fastapi_port != snapshot.actions_cap:
+                torn_reads.append((snapshot.fastapi_port, snapshot.actions_cap))
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for value in range(2, 200):
+        with config.transaction() as transaction:
+            transaction.set("fastapi_port", value)
+            transaction.set("actions_cap", value)
+    stop.set()
+    reader.join()
+    assert torn_reads == []
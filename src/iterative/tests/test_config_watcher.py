@@ -0,0 +1,90 @@
+import os
+import pytest
+from fastapi import FastAPI
+from iterative import config_watcher
+from iterative.config import Config
+from iterative.config_watcher import ConfigWatcher, register_config_refresher
+from iterative.web_app_integration import integrate_actions_into_web_app, is_action_route, replace_actions_in_web_app
+from iterative.service.action_management.models.action import Action
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / ".iterative").mkdir()
+    config_path = tmp_path / ".iterative" / "config.yaml"
+    config_path.write_text("logging_level: INFO\nfastapi_port: 8000\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config_watcher, "_refreshers", [])
+    return config_path
+
+
+def _rewrite(config_path, content):
+    stat = os.stat(config_path)
+    config_path.write_text(content)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+def test_watcher_applies_live_change_and_refreshes_affected_subsystem(project):
+    config = Config()
+    refreshed = []
+    register_config_refresher("logging", {"logging_level"}, lambda diff: refreshed.append(diff))
+    register_config_refresher("web actions", {"expose_project_actions_to_ai"}, lambda diff: refreshed.append("web"))
+    watcher = ConfigWatcher(config)
+    assert watcher.check() is None
+
+    _rewrite(project, "logging_level: DEBUG\nfastapi_port: 8000\nactions_cap: 5\n")
+    result = watcher.check()
+
+    assert result.applied
+    assert result.diff == {"actions_cap": (128, 5), "logging_level": ("INFO", "DEBUG")}
+    assert result.refreshed == ("logging",)
+    assert refreshed == [result.diff]
+    assert (config.get("logging_level"), config.get("actions_cap")) == ("DEBUG", 5)
+
+
+def test_change_needing_restart_is_rejected_as_a_whole(project):
+    config = Config()
+    _rewrite(project, "logging_level: DEBUG\nfastapi_port: 9000\n")
+
+    result = config_watcher.reload_config_file(config)
+
+    assert not result.applied
+    assert "fastapi_port" in result.message
+    assert (config.get("logging_level"), config.get("fastapi_port")) == ("INFO", 8000)
+
+
+def test_invalid_file_and_failed_refresh_change_nothing(project):
+    config = Config()
+    _rewrite(project, "logging_level: INFO\nfastapi_port: not-a-port\n")
+    assert not config_watcher.reload_config_file(config).applied
+
+    def fail(diff):
+        raise RuntimeError("boom")
+
+    register_config_refresher("logging", {"logging_level"}, fail)
+    _rewrite(project, "logging_level: DEBUG\nfastapi_port: 8000\n")
+    result = config_watcher.reload_config_file(config)
+    assert not result.applied
+    assert "boom" in result.message
+    assert config.get("logging_level") == "INFO"
+
+
+def _action(name):
+    def func(x: int = 1) -> int:
+        return x
+    return Action(name=name, function=func, file_path="hello_actions.py", category="Project Actions")
+
+
+def test_replace_actions_swaps_only_action_routes():
+    web_app = FastAPI()
+
+    @web_app.get("/health")
+    def health():
+        return "ok"
+
+    integrate_actions_into_web_app([_action("hello"), _action("bye")], web_app)
+    replace_actions_in_web_app([_action("hello")], web_app)
+
+    paths = [route.path for route in web_app.routes]
+    assert "/health" in paths and "/hello" in paths and "/bye" not in paths
+    assert sum(1 for route in web_app.routes if is_action_route(route)) == 1
@@ -0,0 +1,140 @@
+import os
+import sys
+import pytest
+from fastapi import FastAPI
+from typer import Typer
+from iterative import config as config_module
+from iterative.cli_app_integration import integrate_actions_into_cli_app
+from iterative.config import Config
+from iterative.hot_reload import HotReloader
+from iterative.web_app_integration import add_routers_to_web_app, integrate_actions_into_web_app
+from iterative.service.action_management.service.action_registry import get_action_registry
+from iterative.service.action_management.service.action_utils import get_configured_actions
+from iterative.service.project_management.service.module_registry import get_module_registry
+from iterative.service.project_management.service.scan_utils import invalidate_project_index
+
+
+def _write(path, content):
+    path.write_text(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+    return str(path)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    (tmp_path / ".iterative").mkdir()
+    (tmp_path / ".iterative" / "config.yaml").write_text("reload: true\nexpose_default_actions_to_ai: false\nexpose_default_actions_to_cli: false\n")
+    (tmp_path / "actions").mkdir()
+    (tmp_path / "api").mkdir()
+    _write(tmp_path / "actions" / "hot_greeting.py", "GREETING = 'Hello'\n")
+    _write(tmp_path / "actions" / "greet_actions.py",
+           "from hot_greeting import GREETING\n\ndef greet(name: str) -> str:\n    return f'{GREETING} {name}'\n")
+    _write(tmp_path / "actions" / "count_actions.py", "def count() -> int:\n    return 1\n")
+    _write(tmp_path / "api" / "items_api.py",
+           "from fastapi import APIRouter\n\nrouter = APIRouter()\n\n@router.get('/items')\ndef list_items():\n    return [1]\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config_module, "_shared_config", Config())
+    invalidate_project_index()
+    get_action_registry().invalidate()
+
+    web_app, cli_app = FastAPI(), Typer()
+    web_actions, cli_actions = get_configured_actions()
+    integrate_actions_into_web_app(web_actions.values(), web_app)
+    add_routers_to_web_app(web_app)
+    integrate_actions_into_cli_app(cli_actions.values(), cli_app)
+    yield tmp_path, web_app, cli_app, HotReloader(web_app, cli_app, roots=[str(tmp_path)])
+
+    get_module_registry().invalidate_all()
+    get_action_registry().invalidate()
+    invalidate_project_index()
+    sys.modules.pop("hot_greeting", None)
+    sys.path[:] = [entry for entry in sys.path if not entry.startswith(str(tmp_path))]
+
+
+def _route(web_app, path):
+    return next(route for route in web_app.router.routes if getattr(route, "path", None) == path)
+
+
+def _command(cli_app, name):
+    return next(command for command in cli_app.registered_commands if command.name == name)
+
+
+def test_change_replaces_only_affected_routes_and_commands(app):
+    project, web_app, cli_app, reloader = app
+    count_route = _route(web_app, "/count")
+    items_route = _route(web_app, "/items")
+    web_app.openapi()
+
+    result = reloader.reload([_write(project / "actions" / "hot_greeting.py", "GREETING = 'Hi'\n")])
+
+    assert result.applied
+    assert result.reloaded == (str(project / "actions" / "greet_actions.py"),)
+    assert result.actions == ("greet",)
+    assert _route(web_app, "/greet").endpoint.__iterative_action_function__("Ada") == "Hi Ada"
+    assert _command(cli_app, "greet").callback("Ada") == "Hi Ada"
+    assert _route(web_app, "/count") is count_route
+    assert _route(web_app, "/items") is items_route
+    assert web_app.openapi_schema is None
+
+
+def test_api_files_are_included_again(app):
+    project, web_app, _, reloader = app
+    result = reloader.reload([_write(project / "api" / "items_api.py",
+                                     "from fastapi import APIRouter\n\nrouter = APIRouter()\n\n"
+                                     "@router.get('/items')\ndef list_items():\n    return [2]\n\n"
+                                     "@router.get('/items/count')\ndef count_items():\n    return 1\n")])
+
+    assert result.routers == (str(project / "api" / "items_api.py"),)
+    assert [route.path for route in web_app.router.routes].count("/items") == 1
+    assert _route(web_app, "/items").endpoint() == [2]
+    assert _route(web_app, "/items/count").endpoint() == 1
+
+
+def test_added_and_removed_action_files(app):
+    project, web_app, cli_app, reloader = app
+    new_file = _write(project / "actions" / "fresh_actions.py", "def fresh() -> int:\n    return 7\n")
+    assert reloader.reload([new_file]).actions == ("fresh",)
+    assert _route(web_app, "/fresh").endpoint.__iterative_action_function__() == 7
+
+    os.remove(new_file)
+    assert reloader.reload([new_file]).actions == ("fresh",)
+    assert not [route for route in web_app.router.routes if getattr(route, "path", None) == "/fresh"]
+    assert not [command for command in cli_app.registered_commands if command.name == "fresh"]
+
+
+def test_broken_file_keeps_the_app_and_is_retried(app):
+    project, web_app, _, reloader = app
+    greet_route = _route(web_app, "/greet")
+    greet_file = project / "actions" / "greet_actions.py"
+
+    result = reloader.reload([_write(greet_file, "def greet(name: str) -> str:\n    return (\n")])
+    assert not result.applied
+    assert _route(web_app, "/greet") is greet_route
+
+    # The next change of any file reloads the broken one too once it is fixed
+    _write(greet_file, "def greet(name: str) -> str:\n    return 'Yo ' + name\n")
+    result = reloader.reload([_write(project / "actions" / "count_actions.py", "def count() -> int:\n    return 2\n")])
+    assert result.applied
+    assert set(result.actions) == {"count", "greet"}
+    assert _route(web_app, "/greet").endpoint.__iterative_action_function__("Ada") == "Yo Ada"
+
+
+def test_hot_reload_is_opt_in_and_single_worker(tmp_path, monkeypatch):
+    from iterative.hot_reload import get_hot_reloader, start_hot_reload
+    from iterative.server_management import should_hot_reload
+
+    (tmp_path / ".iterative").mkdir()
+    (tmp_path / ".iterative" / "config.yaml").write_text("fastapi_port: 8000\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config_module, "_shared_config", Config())
+
+    assert start_hot_reload(FastAPI()) is None and get_hot_reloader() is None
+    assert not should_hot_reload(None, 1)
+    assert should_hot_reload(True, 1)
+    assert not should_hot_reload(True, 4)
+
+    (tmp_path / ".iterative" / "config.yaml").write_text("reload: true\nreload_in_workers: true\n")
+    monkeypatch.setattr(config_module, "_shared_config", Config())
+    assert should_hot_reload(None, 4)
+    assert not should_hot_reload(False, 1)
@@ -0,0 +1,39 @@
+import json
+import subprocess
+import sys
+
+# Measured at ~0.03s with lazy imports, ~0.47s when `import iterative` loaded the whole package
+IMPORT_BUDGET_SECONDS = 0.25
+
+HEAVY_MODULES = ["fastapi", "starlette", "typer", "uvicorn", "omegaconf", "iterative.config", "iterative.web"]
+
+MEASURE_IMPORT = f"""
+import json, sys, time
+start = time.perf_counter()
+import iterative
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def _measure_import():
+    result = subprocess.run([sys.executable, "-c", MEASURE_IMPORT], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_iterative_does_not_load_heavy_dependencies():
+    assert _measure_import()["loaded"] == []
+
+
+def test_import_iterative_stays_under_budget():
+    # Best of three fresh interpreters, to keep a busy machine from failing the test
+    elapsed = min(_measure_import()["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"import iterative took {elapsed:.3f}s, budget is {IMPORT_BUDGET_SECONDS}s"
+
+
+def test_public_names_resolve_lazily():
+    import iterative
+
+    assert iterative.get_config().get("fastapi_host") is not None
+    assert iterative.IterativeModel.__name__ == "IterativeModel"
+    assert "web_app" in dir(iterative)
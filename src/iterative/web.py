@@ -8,10 +8,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from logging import getLogger
 from fastapi.staticfiles import StaticFiles
+from iterative.service.action_management.api.batch_api import router as batch_router
+from iterative.service.action_management.api.cache_api import router as cache_router
+from iterative.service.service_management.service.serializer import IterativeJSONResponse
+from iterative.service.telemetry_management.api.metrics_api import router as metrics_router
+from iterative.service.server_management.api.health_api import router as health_router
+from iterative.service.telemetry_management.service.trace_utils import TracingMiddleware
 
 logger = getLogger(__name__)
 
-iterative_user_web_app = FastAPI()
+iterative_user_web_app = FastAPI(default_response_class=IterativeJSONResponse)
 
 
 def get_swagger_ui_path():
@@ -22,7 +28,7 @@ def get_swagger_ui_path():
         str: The path to the custom Swagger UI, or None if the default UI should be used.
     """
     project_root = get_project_root()
-    extra_ui_path = get_config().get("swagger_ui_nested_path")
+    extra_ui_path = get_config().snapshot.swagger_ui_nested_path
     if extra_ui_path:
         return os.path.join(project_root, "service", "swagger_ui", "service", extra_ui_path)
     else:
@@ -72,9 +78,9 @@ def custom_openapi():
     if iterative_user_web_app.openapi_schema:
         return iterative_user_web_app.openapi_schema
 
-    app_name = get_config().config.get("app_name", "Iterative App")
-    version = get_config().config.get("version", "v0.1.0")
-    description = get_config().config.get(
+    app_name = get_config().get("app_name", "Iterative App")
+    version = get_config().get("version", "v0.1.0")
+    description = get_config().get(
         "description", "Initial Iterative APP Backend."
     )
 
@@ -100,6 +106,11 @@ def custom_openapi():
 
 iterative_user_web_app.openapi = custom_openapi
 
+iterative_user_web_app.include_router(batch_router, tags=["Iterative Default"])
+iterative_user_web_app.include_router(cache_router, tags=["Iterative Default"])
+iterative_user_web_app.include_router(metrics_router)
+iterative_user_web_app.include_router(health_router)
+
 # Add CORS middleware
 origins = [
     "*"
@@ -114,3 +125,6 @@ iterative_user_web_app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+
+# Added last so it is the outermost middleware and the request span covers the others
+iterative_user_web_app.add_middleware(TracingMiddleware)
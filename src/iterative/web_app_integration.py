@@ -1,15 +1,28 @@
 from functools import wraps
 import os
-from fastapi import APIRouter, FastAPI, HTTPException
-from typing import Callable, List, get_type_hints
+from fastapi import APIRouter, FastAPI, HTTPException, Request, Response
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import Any, Callable, List, get_args, get_origin, get_type_hints
 import inspect
 from iterative.service.action_management.models.action import Action
+from iterative.service.action_management.service.cache_utils import get_action_cache, get_cache_policy
+from iterative.service.action_management.service.coalesce_utils import invoke_action
+from iterative.service.action_management.service.invoke_utils import get_action_invoker
+from iterative.service.action_management.service.stream_utils import choose_media_type, encode_stream, is_streaming_action, iter_action_items
 from iterative.service.api_management.service.api_utils import find_api_routers_in_parent_project
 from iterative.service.project_management.service.project_utils import load_module_from_path, snake_case
+from iterative.service.service_management.service.serializer import PYDANTIC_V2, create_json_response
+from iterative.service.telemetry_management.service.metrics_utils import instrument_routes, is_metrics_enabled
+from iterative.service.telemetry_management.service.trace_utils import add_elapsed_span, trace_routes
 from logging import getLogger
 
 logger = getLogger(__name__)
 
+# Name of the parameter cached and streaming action endpoints get the request through
+ENDPOINT_REQUEST_PARAMETER = "_iterative_request"
+
 def create_endpoint(func: Callable, name: str):
     router = APIRouter()
 
@@ -24,28 +37,150 @@ def create_endpoint(func: Callable, name: str):
     sig = inspect.signature(original_func)
     params = sig.parameters
 
-    @wraps(original_func)
-    async def endpoint(*args, **kwargs):
-        try:
-            result = original_func(*args, **kwargs)
-            return result
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+    # Async actions are awaited, sync ones run in the action thread pool so they never block the event loop
+    invoker = get_action_invoker()
 
-    # Set the dynamically constructed signature to the endpoint function
-    endpoint.__signature__ = sig.replace(return_annotation=response_model)
+    if is_streaming_action(func):
+        # The items are streamed, there is no single response to describe
+        response_model = None
+        endpoint = create_streaming_endpoint(func, sig.replace(return_annotation=inspect.Signature.empty))
+    elif get_cache_policy(func) is None:
+        @wraps(original_func)
+        async def endpoint(**kwargs):
+            add_elapsed_span("validate arguments")
+            try:
+                result = await invoke_action(name, func, kwargs, invoker)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+            if isinstance(result, Response):
+                return result
+            return create_json_response(serialize_action_result(result, endpoint.__iterative_response_field__))
+
+        # Set the dynamically constructed signature to the endpoint function
+        endpoint.__signature__ = sig.replace(return_annotation=response_model)
+    else:
+        endpoint = create_cached_endpoint(func, name, sig.replace(return_annotation=response_model))
 
     # Add docstring and annotations as route description and response model
     endpoint.__doc__ = original_func.__doc__
+    # Marks the route as an action route so it can be swapped out when the exposed actions change
+    endpoint.__iterative_action__ = True
+    # Lets the batch endpoint call the action the route serves
+    endpoint.__iterative_action_name__ = name
+    endpoint.__iterative_action_function__ = func
     router.add_api_route(
         f"/{name}", 
         endpoint, 
         methods=["GET"],  # Adjust based on your function's method
         response_model=response_model
     )
+    # Endpoints return their response themselves, validated and filtered through the route's response model.
+    # FastAPI validates against a clone of the field, which only differs from it with Pydantic 1.
+    endpoint.__iterative_response_field__ = getattr(router.routes[-1], "secure_cloned_response_field", None)
 
     return router
 
+
+def _is_declared_model(value, annotation) -> bool:
+    # An instance of exactly the declared model, or a list of them, has no fields the model filters out
+    if get_origin(annotation) in (list, List):
+        args = get_args(annotation)
+        return isinstance(value, list) and len(args) == 1 and all(_is_declared_model(item, args[0]) for item in value)
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel) and type(value) is annotation
+
+
+def serialize_action_result(result, response_field=None) -> Any:
+    """
+    Validates an action's result against the route's response model and filters it down to the model's
+    fields, like FastAPI does before rendering. Instances of exactly the declared model, or lists of them,
+    have nothing to filter and are left for the serializer to write straight to JSON.
+
+    Raises:
+        ResponseValidationError: If the result doesn't match the response model.
+    """
+    if response_field is None:
+        return result
+    value, errors = response_field.validate(result, {}, loc=("response",))
+    if errors:
+        # Pydantic 1 reports a single error unwrapped
+        raise ResponseValidationError(errors=errors if isinstance(errors, list) else [errors], body=result)
+    if not PYDANTIC_V2:
+        # Validating against FastAPI's cloned field already rebuilt subclass instances as the declared model
+        return value
+    if _is_declared_model(value, response_field.field_info.annotation):
+        return value
+    # FastAPI's own serialization, so the values are written exactly as its responses write them
+    return response_field.serialize(value, mode="json", by_alias=True)
+
+
+def create_cached_endpoint(func: Callable, name: str, sig: inspect.Signature) -> Callable:
+    """
+    Creates the endpoint of a `cached_action`. Results are served from the action cache with an ETag and
+    a Cache-Control header, a request whose If-None-Match matches gets a 304. Results are validated and
+    filtered through the route's response model before they are stored.
+    """
+    original_func = getattr(func, "__wrapped__", func)
+    cache = get_action_cache()
+
+    @wraps(original_func)
+    async def endpoint(**kwargs):
+        request: Request = kwargs.pop(ENDPOINT_REQUEST_PARAMETER)
+        add_elapsed_span("validate arguments")
+        try:
+            entry, _ = await cache.invoke(name, func, kwargs, serialize=serialize)
+        except ResponseValidationError:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+        remaining_ttl = entry.remaining_ttl()
+        headers = {
+            "ETag": entry.etag,
+            "Cache-Control": f"max-age={int(remaining_ttl)}" if remaining_ttl is not None else "no-cache",
+        }
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and entry.etag in [etag.strip() for etag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def serialize(result):
+        return serialize_action_result(result, endpoint.__iterative_response_field__)
+
+    endpoint.__signature__ = add_request_parameter(sig)
+    return endpoint
+
+
+def create_streaming_endpoint(func: Callable, sig: inspect.Signature) -> Callable:
+    """
+    Creates the endpoint of a generator action. Items are sent as NDJSON, or as Server-Sent Events if the
+    request accepts `text/event-stream`, one at a time as the client reads them. The generator is closed
+    when the client disconnects.
+    """
+    original_func = getattr(func, "__wrapped__", func)
+
+    @wraps(original_func)
+    async def endpoint(**kwargs):
+        request: Request = kwargs.pop(ENDPOINT_REQUEST_PARAMETER)
+        add_elapsed_span("validate arguments")
+        media_type = choose_media_type(request.headers.get("accept"))
+        items = iter_action_items(func, kwargs)
+        return StreamingResponse(encode_stream(items, media_type), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+    endpoint.__signature__ = add_request_parameter(sig)
+    return endpoint
+
+
+def add_request_parameter(sig: inspect.Signature) -> inspect.Signature:
+    """
+    Returns the signature with a keyword-only parameter FastAPI passes the request to. FastAPI leaves it
+    out of the OpenAPI schema.
+    """
+    parameters = list(sig.parameters.values())
+    request_parameter = inspect.Parameter(ENDPOINT_REQUEST_PARAMETER, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+    insert_at = len(parameters) - (1 if parameters and parameters[-1].kind is inspect.Parameter.VAR_KEYWORD else 0)
+    return sig.replace(parameters=parameters[:insert_at] + [request_parameter] + parameters[insert_at:])
+
+
 def load_routers_from_directory(directory, web_app):
     # Skip if the directory doesn't exist
     if not os.path.exists(directory):
@@ -73,7 +208,109 @@ def integrate_actions_into_web_app(actions: List[Action], web_app: FastAPI):
         # Determine tags based on script source
         tag = [f"{category}: {file.replace('.py', '')}"] if category != "Iterative Default" else ["Iterative Default"]
 
+        routes_before = len(web_app.routes)
         web_app.include_router(router, tags=tag)
+        instrument_new_routes(web_app.routes[routes_before:], category, action=snake_name)
+
+
+def instrument_new_routes(routes, category: str, action: str = None):
+    """
+    Trace the routes and, if metrics are enabled, count and time their requests.
+    """
+    # Metrics wrap the route first, so the route's span covers the time they take
+    if is_metrics_enabled():
+        instrument_routes(routes, category, action=action)
+    trace_routes(routes, category, action=action)
+
+
+def is_action_route(route) -> bool:
+    return getattr(getattr(route, "endpoint", None), "__iterative_action__", False)
+
+
+def replace_actions_in_web_app(actions: List[Action], web_app: FastAPI):
+    """
+    Replace the action routes of a running web app with routes for the given actions.
+
+    The new routes are built on a separate router and swapped in with a single assignment, so requests
+    are served by either the old or the new set of actions.
+    """
+    staging_router = APIRouter()
+    integrate_actions_into_web_app(actions, staging_router)
+
+    routes = list(web_app.router.routes)
+    kept_routes = [route for route in routes if not is_action_route(route)]
+    # The new action routes take the place of the old ones
+    action_positions = [position for position, route in enumerate(routes) if is_action_route(route)]
+    insert_at = action_positions[0] if action_positions else len(kept_routes)
+    web_app.router.routes = kept_routes[:insert_at] + list(staging_router.routes) + kept_routes[insert_at:]
+    # Regenerate the OpenAPI schema on its next request
+    web_app.openapi_schema = None
+
+
+def update_actions_in_web_app(actions: List[Action], names, web_app: FastAPI):
+    """
+    Replace the routes of the named actions only, leaving every other route as it is. Named actions missing
+    from `actions` lose their route, new ones get a route after the other action routes.
+    """
+    names = set(names)
+    staging_router = APIRouter()
+    integrate_actions_into_web_app([action for action in actions if action.get_name() in names], staging_router)
+    new_routes = {}
+    for route in staging_router.routes:
+        new_routes.setdefault(route.endpoint.__iterative_action_name__, []).append(route)
+
+    replaced_names = {snake_case(name) for name in names}
+    routes = []
+    last_action_position = None
+    for route in web_app.router.routes:
+        if is_action_route(route):
+            name = route.endpoint.__iterative_action_name__
+            if name in replaced_names:
+                routes.extend(new_routes.pop(name, ()))
+                last_action_position = len(routes)
+                continue
+            last_action_position = len(routes) + 1
+        routes.append(route)
+    added_routes = [route for name_routes in new_routes.values() for route in name_routes]
+    insert_at = len(routes) if last_action_position is None else last_action_position
+    web_app.router.routes = routes[:insert_at] + added_routes + routes[insert_at:]
+    web_app.openapi_schema = None
+
+
+def include_project_routers(routers, web_app, file_paths=None):
+    """
+    Include the routers found by `find_api_routers_in_parent_project`, or only those of the given files,
+    tagged with their project and marked with their file so they can be replaced when it changes.
+    """
+    for project_name, router_list in routers.items():
+        for router_dict in router_list:
+            if file_paths is not None and router_dict["file_path"] not in file_paths:
+                continue
+            router = router_dict["router"]
+            # Set the tags parameter to a unique value for each router
+            routes_before = len(web_app.routes)
+            web_app.include_router(router, tags=[f"{project_name}"])
+            new_routes = web_app.routes[routes_before:]
+            for route in new_routes:
+                route.__iterative_router_file__ = router_dict["file_path"]
+            instrument_new_routes(new_routes, project_name)
+
+
+def replace_routers_in_web_app(file_paths, web_app: FastAPI):
+    """
+    Replace the routes included from the routers of the given API files with the routers they define now.
+    """
+    file_paths = set(file_paths)
+    staging_router = APIRouter()
+    include_project_routers(find_api_routers_in_parent_project(), staging_router, file_paths)
+
+    routes = list(web_app.router.routes)
+    replaced = [getattr(route, "__iterative_router_file__", None) in file_paths for route in routes]
+    kept_routes = [route for route, is_replaced in zip(routes, replaced) if not is_replaced]
+    # The new routes take the place of the first old one, the routes before it are all kept
+    insert_at = replaced.index(True) if any(replaced) else len(kept_routes)
+    web_app.router.routes = kept_routes[:insert_at] + list(staging_router.routes) + kept_routes[insert_at:]
+    web_app.openapi_schema = None
 
 
 def add_routers_to_web_app(web_app: FastAPI):
@@ -85,8 +322,4 @@ def add_routers_to_web_app(web_app: FastAPI):
     """
     routers = find_api_routers_in_parent_project()
     logger.info(f"Adding router to web app")
-    for project_name, router_list in routers.items():
-        for router_dict in router_list:
-            router = router_dict["router"]
-            # Set the tags parameter to a unique value for each router
-            web_app.include_router(router, tags=[f"{project_name}"])
\ No newline at end of file
+    include_project_routers(routers, web_app)
\ No newline at end of file